@@ -3,6 +3,7 @@ from datetime import datetime, timezone
 from typing import Any
 
 from fastapi import Request
+from sqlalchemy import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.types import ASGIApp
@@ -49,3 +50,28 @@ async def audit(
     db.add(entry)
     await db.flush()
     return entry
+
+
+async def audit_many(
+    db: AsyncSession,
+    *,
+    tenant_id: uuid.UUID | None,
+    user_id: uuid.UUID | None,
+    events: list[dict[str, Any]],
+) -> None:
+    """
+    Many audit rows in one multi-row INSERT (bulk operations). Each event has
+    action, resource_type and optionally resource_id and detail.
+    """
+    if not events:
+        return
+    now = datetime.now(timezone.utc)
+    await db.execute(insert(AuditLog), [
+        {
+            "tenant_id": tenant_id, "user_id": user_id,
+            "action": e["action"], "resource_type": e["resource_type"],
+            "resource_id": e.get("resource_id"), "detail": e.get("detail"),
+            "created_at": now,
+        }
+        for e in events
+    ])
@@ -0,0 +1,164 @@
+"""
+Cross-run checklist analytics.
+
+Submitted answers are shredded into checklist_run_answers (one row per run and
+field). Distributions and NC rates are then plain GROUP BYs over the
+(tenant, checklist, field, submitted_at) index, with no JSON parsing per run.
+"""
+import json
+import uuid
+from datetime import datetime
+from sqlalchemy import select, delete, insert, func, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.checklists.models import ChecklistRun, ChecklistRunAnswer
+
+SUBMITTED_RUN_STATUSES = ("submitted", "approved")
+TOP_VALUES_PER_FIELD = 10
+
+
+def _value_text(value) -> str | None:
+    if value is None or value == "":
+        return None
+    if isinstance(value, str):
+        return value
+    return json.dumps(value, ensure_ascii=False)
+
+
+def shred_answers(answers: dict) -> list[dict]:
+    """answers_json → [{field_id, value_text, value_norm, file_count}]"""
+    rows = []
+    for field_id, answer in answers.items():
+        if not isinstance(answer, dict):
+            answer = {"value": answer}
+        text = _value_text(answer.get("value"))
+        rows.append({
+            "field_id": str(field_id)[:255],
+            "value_text": text,
+            "value_norm": text.strip().lower()[:255] if text is not None else None,
+            "file_count": len(answer.get("file_ids") or []),
+        })
+    return rows
+
+
+async def clear_run_answers(db: AsyncSession, run: ChecklistRun) -> None:
+    await db.execute(delete(ChecklistRunAnswer).where(ChecklistRunAnswer.run_id == run.id))
+
+
+async def store_run_answers(db: AsyncSession, run: ChecklistRun, answers: dict) -> None:
+    """Replace the shredded answers of a run (called at submit)."""
+    await clear_run_answers(db, run)
+    await insert_run_answers(db, [(run, answers)])
+
+
+async def insert_run_answers(db: AsyncSession, submitted: list[tuple[ChecklistRun, dict]]) -> None:
+    """Shred the answers of newly submitted runs in one executemany insert."""
+    rows = [
+        {
+            "tenant_id": run.tenant_id,
+            "run_id": run.id,
+            "project_id": run.project_id,
+            "checklist_id": run.checklist_id,
+            "submitted_at": run.submitted_at,
+            **r,
+        }
+        for run, answers in submitted
+        for r in shred_answers(answers)
+    ]
+    if rows:
+        await db.execute(insert(ChecklistRunAnswer), rows)
+
+
+async def checklist_analytics(
+    db: AsyncSession,
+    tenant_id: uuid.UUID,
+    checklist_id: uuid.UUID,
+    fields: list[dict],
+    date_from: datetime | None = None,
+    date_to: datetime | None = None,
+) -> dict:
+    """
+    Per-field answer distribution (top values), 'no' count and NC rate for
+    submitted runs of a project checklist in [date_from, date_to).
+    """
+    from app.core.nonconformance.models import Nonconformance
+
+    window = [ChecklistRunAnswer.tenant_id == tenant_id, ChecklistRunAnswer.checklist_id == checklist_id]
+    run_window = [
+        ChecklistRun.tenant_id == tenant_id,
+        ChecklistRun.checklist_id == checklist_id,
+        ChecklistRun.status.in_(SUBMITTED_RUN_STATUSES),
+        ChecklistRun.is_deleted == False,
+    ]
+    if date_from is not None:
+        window.append(ChecklistRunAnswer.submitted_at >= date_from)
+        run_window.append(ChecklistRun.submitted_at >= date_from)
+    if date_to is not None:
+        window.append(ChecklistRunAnswer.submitted_at < date_to)
+        run_window.append(ChecklistRun.submitted_at < date_to)
+
+    run_count = (await db.execute(select(func.count(ChecklistRun.id)).where(*run_window))).scalar_one()
+
+    # Value counts per field, ranked so only the top values are returned
+    counts = (
+        select(
+            ChecklistRunAnswer.field_id,
+            ChecklistRunAnswer.value_norm,
+            func.count().label("n"),
+        )
+        .where(*window, ChecklistRunAnswer.value_norm.is_not(None))
+        .group_by(ChecklistRunAnswer.field_id, ChecklistRunAnswer.value_norm)
+        .subquery()
+    )
+    ranked = select(
+        counts.c.field_id, counts.c.value_norm, counts.c.n,
+        func.row_number().over(
+            partition_by=counts.c.field_id, order_by=counts.c.n.desc()
+        ).label("rank"),
+    ).subquery()
+    dist_rows = (await db.execute(
+        select(ranked.c.field_id, ranked.c.value_norm, ranked.c.n)
+        .where(ranked.c.rank <= TOP_VALUES_PER_FIELD)
+    )).all()
+
+    totals_rows = (await db.execute(
+        select(
+            ChecklistRunAnswer.field_id,
+            func.count().filter(ChecklistRunAnswer.value_norm.is_not(None)).label("answered"),
+            func.count().filter(ChecklistRunAnswer.value_norm == "no").label("no_count"),
+        )
+        .where(*window)
+        .group_by(ChecklistRunAnswer.field_id)
+    )).all()
+
+    nc_rows = (await db.execute(
+        select(Nonconformance.source_key, func.count(Nonconformance.id))
+        .join(ChecklistRun, and_(
+            ChecklistRun.id == Nonconformance.source_id,
+            Nonconformance.source_type == "checklist",
+        ))
+        .where(*run_window, Nonconformance.tenant_id == tenant_id, Nonconformance.is_deleted == False)
+        .group_by(Nonconformance.source_key)
+    )).all()
+
+    distribution: dict[str, dict[str, int]] = {}
+    for field_id, value, n in dist_rows:
+        distribution.setdefault(field_id, {})[value] = n
+    totals = {r.field_id: (r.answered, r.no_count) for r in totals_rows}
+    ncs = dict(nc_rows)
+
+    result_fields = []
+    for f in fields:
+        answered, no_count = totals.get(f["id"], (0, 0))
+        nc_count = ncs.get(f["id"], 0)
+        result_fields.append({
+            "field_id": f["id"],
+            "label": f["label"],
+            "field_type": f["field_type"],
+            "answered": answered,
+            "no_count": no_count,
+            "nc_count": nc_count,
+            "nc_rate": round(nc_count / run_count, 4) if run_count else 0.0,
+            "distribution": distribution.get(f["id"], {}),
+        })
+    return {"checklist_id": checklist_id, "run_count": run_count, "fields": result_fields}
@@ -1,9 +1,9 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import DateTime, String, Text, ForeignKey, Integer, UniqueConstraint
+from sqlalchemy import DateTime, String, Text, ForeignKey, Integer, UniqueConstraint, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from app.db.base import Base, TimestampMixin, SoftDeleteMixin, TenantScopedMixin
+from app.db.base import Base, TimestampMixin, SoftDeleteMixin, TenantScopedMixin, VersionedMixin
 
 
 # ── Library ───────────────────────────────────────────────────────────────────
@@ -72,10 +72,18 @@ class ProjectChecklistTemplate(Base, TimestampMixin, SoftDeleteMixin, TenantScop
     title: Mapped[str] = mapped_column(String(500), nullable=False)
     category: Mapped[str] = mapped_column(String(50), nullable=False, default="ANNET")
     status: Mapped[str] = mapped_column(String(50), nullable=False, default="active")
+    # Recurring runs (see scheduler.py): every recurrence_interval days/weeks from next_run_at
+    recurrence: Mapped[str | None] = mapped_column(String(20), nullable=True)  # daily | weekly
+    recurrence_interval: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
+    next_run_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     versions: Mapped[list["ProjectChecklistTemplateVersion"]] = relationship(back_populates="checklist", lazy="noload")
     runs: Mapped[list["ChecklistRun"]] = relationship(back_populates="checklist", lazy="noload")
     __table_args__ = (
         UniqueConstraint("tenant_id", "project_id", "checklist_no", name="uq_project_checklist_no"),
+        Index(
+            "ix_project_checklists_next_run", "next_run_at",
+            postgresql_where=text("recurrence IS NOT NULL AND is_deleted = false"),
+        ),
     )
 
 
@@ -98,7 +106,7 @@ class ProjectChecklistTemplateVersion(Base, TimestampMixin, SoftDeleteMixin, Ten
 
 # ── Execution ─────────────────────────────────────────────────────────────────
 
-class ChecklistRun(Base, TimestampMixin, SoftDeleteMixin, TenantScopedMixin):
+class ChecklistRun(Base, TimestampMixin, SoftDeleteMixin, TenantScopedMixin, VersionedMixin):
     """
     A filled-in execution of a project checklist template version.
     status: open -> submitted -> approved | rejected
@@ -120,6 +128,11 @@ class ChecklistRun(Base, TimestampMixin, SoftDeleteMixin, TenantScopedMixin):
     status: Mapped[str] = mapped_column(String(50), nullable=False, default="open")
     answers_json: Mapped[str | None] = mapped_column(Text, nullable=True)
     run_by: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    submitted_by: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    # Idempotency key generated by the offline client (batch sync)
+    client_key: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    # Slot of a scheduled run (recurring checklists); NULL for manual runs
+    scheduled_for: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     submitted_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     approved_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     approved_by: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
@@ -128,3 +141,36 @@ class ChecklistRun(Base, TimestampMixin, SoftDeleteMixin, TenantScopedMixin):
     rejection_reason: Mapped[str | None] = mapped_column(Text, nullable=True)
     checklist: Mapped["ProjectChecklistTemplate"] = relationship(back_populates="runs")
     template_version: Mapped["ProjectChecklistTemplateVersion"] = relationship(back_populates="runs")
+    __table_args__ = (
+        Index("ix_checklist_runs_checklist_submitted", "tenant_id", "checklist_id", "submitted_at"),
+        Index(
+            "uq_checklist_runs_client_key", "tenant_id", "client_key",
+            unique=True, postgresql_where=text("client_key IS NOT NULL"),
+        ),
+        Index(
+            "uq_checklist_runs_scheduled_slot", "checklist_id", "scheduled_for",
+            unique=True, postgresql_where=text("scheduled_for IS NOT NULL"),
+        ),
+    )
+
+
+class ChecklistRunAnswer(Base, TenantScopedMixin):
+    """
+    Shredded answers of a submitted run – one row per field, for analytics.
+    Written at submit (replaced on re-submit after rejection); answers_json on
+    the run stays the source of truth.
+    value_norm: lower-cased, trimmed value (max 255) used for distributions.
+    """
+    __tablename__ = "checklist_run_answers"
+    run_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("checklist_runs.id", ondelete="CASCADE"), primary_key=True)
+    field_id: Mapped[str] = mapped_column(String(255), primary_key=True)
+    project_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
+    checklist_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("project_checklist_templates.id", ondelete="CASCADE"), nullable=False)
+    value_text: Mapped[str | None] = mapped_column(Text, nullable=True)
+    value_norm: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    file_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    submitted_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    __table_args__ = (
+        Index("ix_checklist_run_answers_checklist_field", "tenant_id", "checklist_id", "field_id", "submitted_at"),
+        Index("ix_checklist_run_answers_project_field", "tenant_id", "project_id", "field_id", "submitted_at"),
+    )
@@ -1,5 +1,6 @@
 import uuid
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import datetime
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -7,17 +8,25 @@ from app.core.checklists import service
 from app.core.checklists.schemas import (
     ChecklistTemplateCreate, ChecklistTemplateRead,
     ChecklistTemplateVersionCreate, ChecklistTemplateVersionRead,
-    ChecklistImportRequest,
+    ChecklistImportRequest, ChecklistBulkImportRequest, ChecklistBulkImportRead,
     ProjectChecklistTemplateRead, ProjectChecklistTemplateVersionRead,
     ChecklistRunCreate, ChecklistRunUpdate, ChecklistRunRead,
     ChecklistRunSubmit, ChecklistRunReject,
+    ChecklistAnalyticsRead,
+    ChecklistRunSyncRequest, ChecklistRunSyncResult,
+    ChecklistRecurrenceUpdate,
 )
 from app.core.checklists.models import (
-    ChecklistTemplateVersion, ProjectChecklistTemplateVersion,
+    ChecklistRun, ChecklistTemplateVersion, ProjectChecklistTemplate, ProjectChecklistTemplateVersion,
 )
+from app.core.checklists.validation import CACHEABLE_VERSION_STATUSES
 from app.core.files.schemas import FileCreate
 from app.core.files.service import create_file
+from app.db.fieldsets import FIELDS_QUERY, parse_fields, load_only_fields, sparse_model, sparse_rows
 from app.dependencies import get_db, get_current_user, CurrentUser
+from app.http_cache import (
+    check_if_match, immutable_model, not_modified_since, serve_immutable, serve_version_list, set_etag,
+)
 
 router = APIRouter(tags=["checklists"])
 
@@ -66,13 +75,73 @@ async def create_template_version(
     return await service.create_template_version(db, current.tenant_id, t, data)
 
 
-@router.get("/library/checklists/{template_id}/versions", response_model=list[ChecklistTemplateVersionRead])
+async def _load_template_versions(
+    db: AsyncSession, ids: list[uuid.UUID], fields: list[str] | None
+) -> list[ChecklistTemplateVersion]:
+    stmt = select(ChecklistTemplateVersion).where(ChecklistTemplateVersion.id.in_(ids))
+    if fields is not None:
+        stmt = stmt.options(load_only_fields(ChecklistTemplateVersion, fields))
+    return (await db.execute(stmt)).scalars().all()
+
+
+@router.get(
+    "/library/checklists/{template_id}/versions",
+    response_model=list[sparse_model(ChecklistTemplateVersionRead)],
+    response_model_exclude_unset=True,
+)
 async def list_template_versions(
     template_id: uuid.UUID,
+    request: Request,
+    fields: str | None = FIELDS_QUERY,
     db: AsyncSession = Depends(get_db),
-    _: CurrentUser = Depends(get_current_user),
+    current: CurrentUser = Depends(get_current_user),
+):
+    """Published versions come from the immutable cache; strong ETag, 304 on a match."""
+    selected = parse_fields(ChecklistTemplateVersionRead, fields, heavy={"schema_json"})
+    result = await db.execute(
+        select(ChecklistTemplateVersion.id, ChecklistTemplateVersion.status).where(
+            ChecklistTemplateVersion.template_id == template_id,
+            ChecklistTemplateVersion.is_deleted == False,
+        ).order_by(ChecklistTemplateVersion.version_no.desc())
+    )
+    return await serve_version_list(
+        request, current.tenant_id, "checklist_template_version", ChecklistTemplateVersionRead,
+        result.all(), service.IMMUTABLE_TEMPLATE_VERSION_STATUSES, selected,
+        lambda ids, cols: _load_template_versions(db, ids, cols),
+    )
+
+
+@router.get(
+    "/library/checklists/{template_id}/versions/{version_id}",
+    response_model=immutable_model(ChecklistTemplateVersionRead),
+)
+async def get_template_version(
+    template_id: uuid.UUID,
+    version_id: uuid.UUID,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current: CurrentUser = Depends(get_current_user),
 ):
-    return await service.list_template_versions(db, template_id)
+    """
+    A published (superseded, obsolete) version, which never changes: cached,
+    strong ETag, Cache-Control: immutable. status is omitted – see the list.
+    """
+    result = await db.execute(
+        select(ChecklistTemplateVersion.status).where(
+            ChecklistTemplateVersion.id == version_id,
+            ChecklistTemplateVersion.template_id == template_id,
+            ChecklistTemplateVersion.is_deleted == False,
+        )
+    )
+    if result.scalar_one_or_none() not in service.IMMUTABLE_TEMPLATE_VERSION_STATUSES:
+        raise HTTPException(404, "Version not found or not published")
+
+    async def load() -> ChecklistTemplateVersion | None:
+        return next(iter(await _load_template_versions(db, [version_id], None)), None)
+
+    return await serve_immutable(
+        request, current.tenant_id, "checklist_template_version", version_id, ChecklistTemplateVersionRead, load,
+    )
 
 
 @router.post("/library/checklist-versions/{version_id}/publish", response_model=ChecklistTemplateVersionRead)
@@ -102,6 +171,16 @@ async def import_checklist(
     return checklist
 
 
+@router.post("/library/checklists/import-to-projects", response_model=ChecklistBulkImportRead, status_code=201)
+async def import_checklist_to_projects(
+    data: ChecklistBulkImportRequest,
+    db: AsyncSession = Depends(get_db),
+    current: CurrentUser = Depends(get_current_user),
+):
+    """Roll a published library version out to many (or all active) projects."""
+    return await service.import_checklist_to_projects(db, current.tenant_id, data, current.user_id)
+
+
 @router.get("/projects/{project_id}/checklists", response_model=list[ProjectChecklistTemplateRead])
 async def list_project_checklists(
     project_id: uuid.UUID,
@@ -124,20 +203,115 @@ async def get_project_checklist(
     return c
 
 
-@router.get("/projects/{project_id}/checklists/{checklist_id}/versions", response_model=list[ProjectChecklistTemplateVersionRead])
-async def list_checklist_versions(
+@router.put("/projects/{project_id}/checklists/{checklist_id}/recurrence", response_model=ProjectChecklistTemplateRead)
+async def set_checklist_recurrence(
     project_id: uuid.UUID,
     checklist_id: uuid.UUID,
+    data: ChecklistRecurrenceUpdate,
     db: AsyncSession = Depends(get_db),
-    _: CurrentUser = Depends(get_current_user),
+    current: CurrentUser = Depends(get_current_user),
 ):
-    result = await db.execute(
-        select(ProjectChecklistTemplateVersion).where(
+    """Runs are then created by the scheduler at each slot (daily/weekly inspections)."""
+    c = await service.get_project_checklist(db, checklist_id)
+    if not c or c.project_id != project_id:
+        raise HTTPException(404, "Project checklist not found")
+    return await service.set_recurrence(db, current.tenant_id, c, data, current.user_id)
+
+
+def _project_versions(project_id: uuid.UUID, checklist_id: uuid.UUID, *columns):
+    """Versions of a checklist, only if the checklist belongs to project_id."""
+    return (
+        select(*columns)
+        .join(ProjectChecklistTemplate, ProjectChecklistTemplate.id == ProjectChecklistTemplateVersion.checklist_id)
+        .where(
             ProjectChecklistTemplateVersion.checklist_id == checklist_id,
             ProjectChecklistTemplateVersion.is_deleted == False,
+            ProjectChecklistTemplate.project_id == project_id,
+        )
+    )
+
+
+async def _load_checklist_versions(
+    db: AsyncSession, ids: list[uuid.UUID], fields: list[str] | None
+) -> list[ProjectChecklistTemplateVersion]:
+    stmt = select(ProjectChecklistTemplateVersion).where(ProjectChecklistTemplateVersion.id.in_(ids))
+    if fields is not None:
+        stmt = stmt.options(load_only_fields(ProjectChecklistTemplateVersion, fields))
+    return (await db.execute(stmt)).scalars().all()
+
+
+@router.get(
+    "/projects/{project_id}/checklists/{checklist_id}/versions",
+    response_model=list[sparse_model(ProjectChecklistTemplateVersionRead)],
+    response_model_exclude_unset=True,
+)
+async def list_checklist_versions(
+    project_id: uuid.UUID,
+    checklist_id: uuid.UUID,
+    request: Request,
+    fields: str | None = FIELDS_QUERY,
+    db: AsyncSession = Depends(get_db),
+    current: CurrentUser = Depends(get_current_user),
+):
+    """Active versions come from the immutable cache; strong ETag, 304 on a match."""
+    selected = parse_fields(ProjectChecklistTemplateVersionRead, fields, heavy={"schema_json"})
+    result = await db.execute(
+        _project_versions(
+            project_id, checklist_id, ProjectChecklistTemplateVersion.id, ProjectChecklistTemplateVersion.status,
         ).order_by(ProjectChecklistTemplateVersion.version_no.desc())
     )
-    return list(result.scalars().all())
+    return await serve_version_list(
+        request, current.tenant_id, "project_checklist_version", ProjectChecklistTemplateVersionRead,
+        result.all(), CACHEABLE_VERSION_STATUSES, selected,
+        lambda ids, cols: _load_checklist_versions(db, ids, cols),
+    )
+
+
+@router.get(
+    "/projects/{project_id}/checklists/{checklist_id}/versions/{version_id}",
+    response_model=immutable_model(ProjectChecklistTemplateVersionRead),
+)
+async def get_checklist_version(
+    project_id: uuid.UUID,
+    checklist_id: uuid.UUID,
+    version_id: uuid.UUID,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current: CurrentUser = Depends(get_current_user),
+):
+    """
+    An active version, which never changes: cached, strong ETag,
+    Cache-Control: immutable. status is omitted – see the list.
+    """
+    result = await db.execute(
+        _project_versions(project_id, checklist_id, ProjectChecklistTemplateVersion.status)
+        .where(ProjectChecklistTemplateVersion.id == version_id)
+    )
+    if result.scalar_one_or_none() not in CACHEABLE_VERSION_STATUSES:
+        raise HTTPException(404, "Version not found or not active")
+
+    async def load() -> ProjectChecklistTemplateVersion | None:
+        return next(iter(await _load_checklist_versions(db, [version_id], None)), None)
+
+    return await serve_immutable(
+        request, current.tenant_id, "project_checklist_version", version_id, ProjectChecklistTemplateVersionRead, load,
+    )
+
+
+@router.get("/projects/{project_id}/checklists/{checklist_id}/analytics", response_model=ChecklistAnalyticsRead)
+async def checklist_analytics(
+    project_id: uuid.UUID,
+    checklist_id: uuid.UUID,
+    date_from: datetime | None = Query(None),
+    date_to: datetime | None = Query(None),
+    db: AsyncSession = Depends(get_db),
+    current: CurrentUser = Depends(get_current_user),
+):
+    """Per-field answer distribution and NC rate over submitted runs in [date_from, date_to)."""
+    c = await service.get_project_checklist(db, checklist_id)
+    if not c or c.project_id != project_id:
+        raise HTTPException(404, "Project checklist not found")
+    return await service.get_checklist_analytics(db, current.tenant_id, c, date_from, date_to)
 
 
 # ── Runs ──────────────────────────────────────────────────────────────────────
@@ -152,24 +326,49 @@ async def create_run(
     return await service.create_run(db, current.tenant_id, project_id, data, current.user_id)
 
 
-@router.get("/projects/{project_id}/checklist-runs", response_model=list[ChecklistRunRead])
+@router.get(
+    "/projects/{project_id}/checklist-runs",
+    response_model=list[sparse_model(ChecklistRunRead)],
+    response_model_exclude_unset=True,
+)
 async def list_runs(
     project_id: uuid.UUID,
+    fields: str | None = FIELDS_QUERY,
     db: AsyncSession = Depends(get_db),
     current: CurrentUser = Depends(get_current_user),
 ):
-    return await service.list_runs(db, current.tenant_id, project_id)
+    selected = parse_fields(ChecklistRunRead, fields, heavy={"answers_json"})
+    return sparse_rows(await service.list_runs(db, current.tenant_id, project_id, selected), selected)
+
+
+@router.post("/projects/{project_id}/checklist-runs/sync", response_model=list[ChecklistRunSyncResult])
+async def sync_runs(
+    project_id: uuid.UUID,
+    data: ChecklistRunSyncRequest,
+    db: AsyncSession = Depends(get_db),
+    current: CurrentUser = Depends(get_current_user),
+):
+    """
+    Batch upload of runs completed offline – one transaction per batch.
+    Replaying a batch is safe: runs already applied come back as 'duplicate'.
+    """
+    return await service.sync_runs(db, current.tenant_id, project_id, data.runs, current.user_id)
 
 
 @router.get("/checklist-runs/{run_id}", response_model=ChecklistRunRead)
 async def get_run(
     run_id: uuid.UUID,
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db),
     _: CurrentUser = Depends(get_current_user),
 ):
+    if (unchanged := await not_modified_since(request, db, ChecklistRun, run_id)) is not None:
+        return unchanged
     run = await service.get_run(db, run_id)
     if not run:
         raise HTTPException(404, "Run not found")
+    set_etag(response, run)
     return run
 
 
@@ -177,13 +376,18 @@ async def get_run(
 async def update_run(
     run_id: uuid.UUID,
     data: ChecklistRunUpdate,
+    response: Response,
+    if_match: str | None = Header(None),
     db: AsyncSession = Depends(get_db),
     _: CurrentUser = Depends(get_current_user),
 ):
     run = await service.get_run(db, run_id)
     if not run:
         raise HTTPException(404, "Run not found")
-    return await service.update_run_answers(db, run, data)
+    check_if_match(if_match, run)
+    run = await service.update_run_answers(db, run, data)
+    set_etag(response, run)
+    return run
 
 
 @router.post("/checklist-runs/{run_id}/files", status_code=201)
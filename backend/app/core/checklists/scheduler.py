@@ -0,0 +1,139 @@
+"""
+Recurring checklist runs.
+
+A project checklist with a recurrence ("daily" | "weekly", every N) carries
+next_run_at. Each tick creates the open runs for every checklist that is due,
+across all tenants, in one INSERT ... SELECT, and moves next_run_at past now
+in the same statement.
+
+Safe with many workers and restarts:
+  - due checklists are claimed with FOR UPDATE SKIP LOCKED, so concurrent
+    ticks split the work instead of racing for it
+  - a run is keyed by (checklist_id, scheduled_for) under a unique partial
+    index, so re-running a slot is a no-op (ON CONFLICT DO NOTHING)
+  - the schedule lives in the DB, there is no in-process state to lose
+
+Slots are computed in local wall time (settings.LOCAL_TIMEZONE) so a 07:00
+daily inspection stays at 07:00 across DST. After downtime only the oldest
+missed slot gets a run; the schedule then jumps to the next slot in the future.
+next_slot() is the same rule in Python; tests hold the two together.
+"""
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.settings import local_tz
+
+logger = logging.getLogger(__name__)
+
+RECURRENCE_STEPS = {"daily": timedelta(days=1), "weekly": timedelta(days=7)}
+TICK_BATCH_SIZE = 1000
+
+_TICK_SQL = text("""
+WITH due AS (
+    SELECT c.id, c.tenant_id, c.project_id, c.next_run_at,
+           CASE c.recurrence WHEN 'weekly' THEN interval '7 days' ELSE interval '1 day' END
+               * c.recurrence_interval AS step
+    FROM project_checklist_templates c
+    WHERE c.recurrence IS NOT NULL
+      AND c.next_run_at <= :now
+      AND c.status = 'active'
+      AND c.is_deleted = false
+    ORDER BY c.next_run_at
+    LIMIT :batch_size
+    FOR UPDATE SKIP LOCKED
+),
+active_version AS (
+    SELECT DISTINCT ON (v.checklist_id) v.checklist_id, v.id
+    FROM project_checklist_template_versions v
+    JOIN due d ON d.id = v.checklist_id
+    WHERE v.status = 'active' AND v.is_deleted = false
+    ORDER BY v.checklist_id, v.version_no DESC
+),
+created AS (
+    INSERT INTO checklist_runs
+        (id, tenant_id, project_id, checklist_id, template_version_id,
+         status, scheduled_for, is_deleted, created_at, updated_at)
+    SELECT gen_random_uuid(), d.tenant_id, d.project_id, d.id, av.id,
+           'open', d.next_run_at, false, now(), now()
+    FROM due d
+    JOIN active_version av ON av.checklist_id = d.id
+    ON CONFLICT (checklist_id, scheduled_for) WHERE scheduled_for IS NOT NULL DO NOTHING
+    RETURNING id
+),
+advanced AS (
+    UPDATE project_checklist_templates c
+    SET next_run_at = (
+            (d.next_run_at AT TIME ZONE :tz)
+            + d.step * (floor(
+                extract(epoch FROM (CAST(:now AS timestamptz) AT TIME ZONE :tz)
+                                   - (d.next_run_at AT TIME ZONE :tz))
+                / extract(epoch FROM d.step)
+              ) + 1)
+        ) AT TIME ZONE :tz,
+        updated_at = now()
+    FROM due d
+    WHERE c.id = d.id
+    RETURNING c.id
+)
+SELECT (SELECT count(*) FROM created) AS created, (SELECT count(*) FROM advanced) AS advanced
+""")
+
+
+def next_slot(
+    next_run_at: datetime, recurrence: str, interval: int, now: datetime,
+    tz: ZoneInfo | None = None,
+) -> datetime:
+    """First slot after now, stepped in local wall time (the rule _TICK_SQL applies)."""
+    tz = tz or local_tz()
+    step = RECURRENCE_STEPS[recurrence] * interval
+    if next_run_at > now:
+        return next_run_at
+    local = next_run_at.astimezone(tz).replace(tzinfo=None)
+    local_now = now.astimezone(tz).replace(tzinfo=None)
+    k = (local_now - local) // step + 1
+    return (local + step * k).replace(tzinfo=tz).astimezone(timezone.utc)
+
+
+async def tick(db: AsyncSession, now: datetime | None = None) -> tuple[int, int]:
+    """Create due runs. Returns (runs created, checklists advanced)."""
+    result = await db.execute(_TICK_SQL, {
+        "now": now or datetime.now(timezone.utc),
+        "tz": local_tz().key,
+        "batch_size": TICK_BATCH_SIZE,
+    })
+    row = result.one()
+    return row.created, row.advanced
+
+
+async def run_due() -> int:
+    """Tick until no checklist is due (each batch in its own transaction)."""
+    from app.db.session import get_session
+    total = 0
+    while True:
+        async with get_session() as db:
+            created, advanced = await tick(db)
+        total += created
+        if advanced < TICK_BATCH_SIZE:
+            return total
+
+
+async def run_forever(interval_seconds: int) -> None:
+    while True:
+        try:
+            created = await run_due()
+            if created:
+                logger.info("Checklist scheduler created %d runs", created)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Checklist scheduler tick failed")
+        await asyncio.sleep(interval_seconds)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    print(asyncio.run(run_due()))
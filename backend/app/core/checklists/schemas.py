@@ -3,6 +3,8 @@ from datetime import datetime
 from pydantic import BaseModel, Field
 from typing import Literal, Any
 
+from app.core.files.schemas import FileCreate
+
 VALID_CATEGORIES = Literal["HMS", "MILJO", "KVALITET", "ANNET"]
 
 
@@ -53,6 +55,26 @@ class ChecklistImportRequest(BaseModel):
     checklist_template_version_id: uuid.UUID
 
 
+class ChecklistBulkImportRequest(BaseModel):
+    """Fan-out import into many projects; project_ids=None means all active projects."""
+    checklist_template_version_id: uuid.UUID
+    project_ids: list[uuid.UUID] | None = None
+    skip_existing: bool = True  # skip projects that already hold this library version
+
+
+class ChecklistBulkImportItem(BaseModel):
+    project_id: uuid.UUID
+    checklist_id: uuid.UUID
+    checklist_no: str
+
+
+class ChecklistBulkImportRead(BaseModel):
+    source_version_id: uuid.UUID
+    imported: list[ChecklistBulkImportItem]
+    skipped_project_ids: list[uuid.UUID]
+    missing_project_ids: list[uuid.UUID]
+
+
 class ProjectChecklistTemplateRead(BaseModel):
     model_config = {"from_attributes": True}
     id: uuid.UUID
@@ -63,9 +85,19 @@ class ProjectChecklistTemplateRead(BaseModel):
     title: str
     category: str
     status: str
+    recurrence: str | None
+    recurrence_interval: int
+    next_run_at: datetime | None
     created_at: datetime
 
 
+class ChecklistRecurrenceUpdate(BaseModel):
+    """recurrence=None stops the schedule."""
+    recurrence: Literal["daily", "weekly"] | None
+    interval: int = Field(1, ge=1, le=52)
+    starts_at: datetime | None = None  # first slot; required when recurrence is set
+
+
 class ProjectChecklistTemplateVersionRead(BaseModel):
     model_config = {"from_attributes": True}
     id: uuid.UUID
@@ -100,12 +132,16 @@ class ChecklistRunRead(BaseModel):
     status: str
     answers_json: str | None
     run_by: uuid.UUID | None
+    submitted_by: uuid.UUID | None
+    client_key: str | None
+    scheduled_for: datetime | None
     submitted_at: datetime | None
     approved_at: datetime | None
     approved_by: uuid.UUID | None
     rejected_at: datetime | None
     rejected_by: uuid.UUID | None
     rejection_reason: str | None
+    version: int
     created_at: datetime
 
 
@@ -115,3 +151,49 @@ class ChecklistRunReject(BaseModel):
 
 class ChecklistRunSubmit(BaseModel):
     answers_json: str  # Final answers at submit time
+
+
+# ── Offline sync ──────────────────────────────────────────────────────────────
+
+class ChecklistRunSyncFile(FileCreate):
+    """File captured offline; answers reference it by ref in file_ids."""
+    ref: str = Field(..., min_length=1, max_length=100)
+
+
+class ChecklistRunSyncItem(BaseModel):
+    client_key: str = Field(..., min_length=1, max_length=100)  # idempotency key
+    template_version_id: uuid.UUID
+    answers_json: str
+    files: list[ChecklistRunSyncFile] = []
+    submit: bool = True  # False keeps the run open (draft)
+
+
+class ChecklistRunSyncRequest(BaseModel):
+    runs: list[ChecklistRunSyncItem] = Field(..., min_length=1, max_length=200)
+
+
+class ChecklistRunSyncResult(BaseModel):
+    client_key: str
+    outcome: str  # created | duplicate | failed
+    run_id: uuid.UUID | None = None
+    run_status: str | None = None
+    errors: list[str] = []
+
+
+# ── Analytics ─────────────────────────────────────────────────────────────────
+
+class ChecklistFieldAnalytics(BaseModel):
+    field_id: str
+    label: str
+    field_type: str
+    answered: int
+    no_count: int
+    nc_count: int
+    nc_rate: float  # NCs per submitted run
+    distribution: dict[str, int]  # top normalised values → count
+
+
+class ChecklistAnalyticsRead(BaseModel):
+    checklist_id: uuid.UUID
+    run_count: int
+    fields: list[ChecklistFieldAnalytics]
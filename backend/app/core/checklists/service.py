@@ -1,7 +1,8 @@
 import json
 import uuid
 from datetime import datetime, timezone
-from sqlalchemy import select, func
+from sqlalchemy import select, func, insert, literal, case, cast, false, String, Text
+from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.checklists.models import (
@@ -9,10 +10,15 @@ from app.core.checklists.models import (
     ProjectChecklistTemplate, ProjectChecklistTemplateVersion,
     ChecklistRun,
 )
+from app.db.fieldsets import load_only_fields
+from app.core.checklists.validation import (
+    VALID_FIELD_TYPES, CompiledSchema, compile_schema, compiled_schemas,
+)
 from app.core.checklists.schemas import (
     ChecklistTemplateCreate, ChecklistTemplateVersionCreate,
-    ChecklistImportRequest, ChecklistRunCreate,
+    ChecklistImportRequest, ChecklistBulkImportRequest, ChecklistRunCreate,
     ChecklistRunUpdate, ChecklistRunReject, ChecklistRunSubmit,
+    ChecklistRunSyncItem, ChecklistRecurrenceUpdate,
 )
 
 PERMISSION_CHECKLIST_PUBLISH = "checklist_template:publish"
@@ -78,30 +84,56 @@ def _parse_schema(schema_json: str) -> list[dict]:
     for f in fields:
         if "id" not in f or "label" not in f or "field_type" not in f:
             raise HTTPException(400, f"Field missing required keys (id, label, field_type): {f}")
-        if f["field_type"] not in ("yes_no", "text", "number", "date", "photo"):
+        if f["field_type"] not in VALID_FIELD_TYPES:
             raise HTTPException(400, f"Invalid field_type '{f['field_type']}'")
     return fields
 
 
 def _validate_answers(
-    schema: list[dict],
+    schema: "list[dict] | CompiledSchema",
     answers: dict,
     file_ids_by_field: dict[str, list],
 ) -> list[str]:
-    errors = []
-    for field in schema:
-        fid = field["id"]
-        answer = answers.get(fid, {})
-        value = answer.get("value")
-        file_ids = answer.get("file_ids", [])
+    if not isinstance(schema, CompiledSchema):
+        schema = compile_schema(schema)
+    return schema.validate(answers)
 
-        if field.get("required") and (value is None or value == ""):
-            errors.append(f"Field '{field['label']}' is required")
 
-        if field.get("requires_image") and not file_ids:
-            errors.append(f"Field '{field['label']}' requires at least 1 image")
+def _normalize_file_id(file_id) -> str:
+    try:
+        return str(uuid.UUID(str(file_id)))
+    except ValueError:
+        return str(file_id)
+
+
+def _check_image_links(
+    image_fields: list[dict], answers: dict, linked_file_ids: set[str]
+) -> str | None:
+    """
+    First problem with the images of photo / requires_image fields, or None.
+    Every referenced file must be linked to the run; requires_image fields
+    must also reference at least one.
+    """
+    for field in image_fields:
+        answer = answers.get(field["id"]) or {}
+        file_ids = answer.get("file_ids") or []
+        if not file_ids and field.get("requires_image"):
+            return f"Field '{field['label']}' requires at least 1 image (file_id missing in answers_json)"
+        unlinked = [
+            str(f) for f in file_ids if _normalize_file_id(f) not in linked_file_ids
+        ]
+        if unlinked:
+            return (
+                f"Field '{field['label']}' references images not linked to this run "
+                f"via file_links: {', '.join(unlinked)}"
+            )
+    return None
 
-    return errors
+
+def _get_compiled_schema(version: ProjectChecklistTemplateVersion) -> CompiledSchema:
+    return compiled_schemas.get_or_compile(
+        version.id, version.status, version.schema_json, _parse_schema
+    )
 
 
 # ── NC default assignee ───────────────────────────────────────────────────────
@@ -223,14 +255,16 @@ async def get_template_version(
 
 
 async def list_template_versions(
-    db: AsyncSession, template_id: uuid.UUID
+    db: AsyncSession, template_id: uuid.UUID, fields: list[str] | None = None
 ) -> list[ChecklistTemplateVersion]:
-    result = await db.execute(
-        select(ChecklistTemplateVersion).where(
-            ChecklistTemplateVersion.template_id == template_id,
-            ChecklistTemplateVersion.is_deleted == False,
-        ).order_by(ChecklistTemplateVersion.version_no.desc())
-    )
+    """fields: load only these columns (see app.db.fieldsets)."""
+    stmt = select(ChecklistTemplateVersion).where(
+        ChecklistTemplateVersion.template_id == template_id,
+        ChecklistTemplateVersion.is_deleted == False,
+    ).order_by(ChecklistTemplateVersion.version_no.desc())
+    if fields is not None:
+        stmt = stmt.options(load_only_fields(ChecklistTemplateVersion, fields))
+    result = await db.execute(stmt)
     return list(result.scalars().all())
 
 
@@ -287,6 +321,7 @@ async def publish_template_version(
 async def generate_project_checklist_no(
     db: AsyncSession, tenant_id: uuid.UUID, project_id: uuid.UUID
 ) -> str:
+    await _lock_project_checklist_numbering(db, tenant_id)
     result = await db.execute(
         select(func.count(ProjectChecklistTemplate.id)).where(
             ProjectChecklistTemplate.tenant_id == tenant_id,
@@ -297,18 +332,22 @@ async def generate_project_checklist_no(
     return f"PCL-{count + 1:03d}"
 
 
-async def import_checklist_to_project(
-    db: AsyncSession,
-    tenant_id: uuid.UUID,
-    project_id: uuid.UUID,
-    data: ChecklistImportRequest,
-    imported_by: uuid.UUID,
-) -> tuple[ProjectChecklistTemplate, ProjectChecklistTemplateVersion]:
+async def _lock_project_checklist_numbering(db: AsyncSession, tenant_id: uuid.UUID) -> None:
+    """Single and bulk imports number from the same counts – serialise them."""
+    await db.execute(
+        select(func.pg_advisory_xact_lock(func.hashtext(f"project_checklist_no:{tenant_id}")))
+    )
+
+
+async def _get_import_source(
+    db: AsyncSession, tenant_id: uuid.UUID, version_id: uuid.UUID
+) -> tuple[ChecklistTemplateVersion, ChecklistTemplate]:
     from fastapi import HTTPException
 
     result = await db.execute(
         select(ChecklistTemplateVersion).where(
-            ChecklistTemplateVersion.id == data.checklist_template_version_id,
+            ChecklistTemplateVersion.id == version_id,
+            ChecklistTemplateVersion.tenant_id == tenant_id,
             ChecklistTemplateVersion.is_deleted == False,
         )
     )
@@ -319,11 +358,29 @@ async def import_checklist_to_project(
         raise HTTPException(400, "Can only import published checklist template versions")
 
     result = await db.execute(
-        select(ChecklistTemplate).where(ChecklistTemplate.id == source_version.template_id)
+        select(ChecklistTemplate).where(
+            ChecklistTemplate.id == source_version.template_id,
+            ChecklistTemplate.tenant_id == tenant_id,
+        )
     )
     source_template = result.scalar_one_or_none()
     if not source_template:
         raise HTTPException(404, "Checklist template not found")
+    return source_version, source_template
+
+
+def _import_change_summary(source_template: ChecklistTemplate, source_version: ChecklistTemplateVersion) -> str:
+    return f"Imported from library {source_template.checklist_no} v{source_version.version_no}"
+
+
+async def import_checklist_to_project(
+    db: AsyncSession,
+    tenant_id: uuid.UUID,
+    project_id: uuid.UUID,
+    data: ChecklistImportRequest,
+    imported_by: uuid.UUID,
+) -> tuple[ProjectChecklistTemplate, ProjectChecklistTemplateVersion]:
+    source_version, source_template = await _get_import_source(db, tenant_id, data.checklist_template_version_id)
 
     checklist_no = await generate_project_checklist_no(db, tenant_id, project_id)
 
@@ -345,7 +402,7 @@ async def import_checklist_to_project(
         checklist_id=checklist.id,
         version_no=1,
         schema_json=source_version.schema_json,  # deep freeze copy
-        change_summary=f"Imported from library {source_template.checklist_no} v{source_version.version_no}",
+        change_summary=_import_change_summary(source_template, source_version),
         status="active",
     )
     db.add(version)
@@ -370,6 +427,131 @@ async def import_checklist_to_project(
     return checklist, version
 
 
+async def import_checklist_to_projects(
+    db: AsyncSession,
+    tenant_id: uuid.UUID,
+    data: ChecklistBulkImportRequest,
+    imported_by: uuid.UUID,
+) -> dict:
+    """
+    Fan-out import of one published library version into many projects
+    (data.project_ids, or every active project) with two INSERT ... SELECT
+    statements. Numbers continue each project's PCL sequence.
+    """
+    from app.core.projects.models import Project
+    from app.core.audit.service import audit
+
+    source_version, source_template = await _get_import_source(db, tenant_id, data.checklist_template_version_id)
+    await _lock_project_checklist_numbering(db, tenant_id)
+
+    PCT = ProjectChecklistTemplate
+    already = (
+        select(PCT.id).where(
+            PCT.tenant_id == tenant_id,
+            PCT.project_id == Project.id,
+            PCT.source_checklist_template_version_id == source_version.id,
+            PCT.is_deleted == False,
+        ).exists()
+    )
+    targets = select(Project.id, already).where(
+        Project.tenant_id == tenant_id,
+        Project.is_deleted == False,
+    )
+    if data.project_ids is None:
+        targets = targets.where(Project.status == "active")
+    else:
+        targets = targets.where(Project.id.in_(data.project_ids))
+    rows = (await db.execute(targets)).all()
+
+    skipped = [pid for pid, has in rows if has and data.skip_existing]
+    chosen = [pid for pid, has in rows if not (has and data.skip_existing)]
+    found = {pid for pid, _ in rows}
+    missing = [pid for pid in dict.fromkeys(data.project_ids or []) if pid not in found]
+
+    imported: list[dict] = []
+    if chosen:
+        counts = (
+            select(PCT.project_id, func.count().label("n"))
+            .where(PCT.tenant_id == tenant_id, PCT.project_id.in_(chosen))
+            .group_by(PCT.project_id)
+            .subquery()
+        )
+        seq = func.coalesce(counts.c.n, 0) + 1
+        seq_text = cast(seq, String)
+        checklist_no = literal("PCL-") + case(
+            (seq < 1000, func.lpad(seq_text, 3, "0")), else_=seq_text
+        )
+        now = func.now()
+        result = await db.execute(
+            insert(PCT).from_select(
+                [
+                    "id", "tenant_id", "project_id", "source_checklist_template_version_id",
+                    "checklist_no", "title", "category", "status",
+                    "is_deleted", "created_at", "updated_at",
+                ],
+                select(
+                    func.gen_random_uuid(),
+                    Project.tenant_id,
+                    Project.id,
+                    literal(source_version.id, UUID(as_uuid=True)),
+                    checklist_no,
+                    literal(source_template.title),
+                    literal(source_template.category),
+                    literal("active"),
+                    false(), now, now,
+                )
+                .select_from(Project)
+                .outerjoin(counts, counts.c.project_id == Project.id)
+                .where(Project.tenant_id == tenant_id, Project.id.in_(chosen)),
+            ).returning(PCT.id, PCT.project_id, PCT.checklist_no)
+        )
+        imported = [
+            {"project_id": project_id, "checklist_id": checklist_id, "checklist_no": no}
+            for checklist_id, project_id, no in result.all()
+        ]
+
+        await db.execute(
+            insert(ProjectChecklistTemplateVersion).from_select(
+                [
+                    "id", "tenant_id", "checklist_id", "version_no", "schema_json",
+                    "change_summary", "status", "is_deleted", "created_at", "updated_at",
+                ],
+                select(
+                    func.gen_random_uuid(),
+                    PCT.tenant_id,
+                    PCT.id,
+                    literal(1),
+                    literal(source_version.schema_json, Text),  # deep freeze copy
+                    literal(_import_change_summary(source_template, source_version), Text),
+                    literal("active"),
+                    false(), now, now,
+                ).where(PCT.id.in_([i["checklist_id"] for i in imported])),
+            )
+        )
+
+    await audit(
+        db, tenant_id=tenant_id, user_id=imported_by,
+        action="checklist.bulk_imported_to_projects",
+        resource_type="checklist_template_version",
+        resource_id=str(source_version.id),
+        detail={
+            "imported_count": len(imported),
+            "imported": [
+                {"project_id": str(i["project_id"]), "checklist_id": str(i["checklist_id"]), "checklist_no": i["checklist_no"]}
+                for i in imported
+            ],
+            "skipped_project_ids": [str(pid) for pid in skipped],
+            "missing_project_ids": [str(pid) for pid in missing],
+        },
+    )
+    return {
+        "source_version_id": source_version.id,
+        "imported": imported,
+        "skipped_project_ids": skipped,
+        "missing_project_ids": missing,
+    }
+
+
 async def get_project_checklist(
     db: AsyncSession, checklist_id: uuid.UUID
 ) -> ProjectChecklistTemplate | None:
@@ -382,6 +564,43 @@ async def get_project_checklist(
     return result.scalar_one_or_none()
 
 
+async def set_recurrence(
+    db: AsyncSession,
+    tenant_id: uuid.UUID,
+    checklist: ProjectChecklistTemplate,
+    data: ChecklistRecurrenceUpdate,
+    changed_by: uuid.UUID,
+) -> ProjectChecklistTemplate:
+    from fastapi import HTTPException
+    if data.recurrence is None:
+        checklist.recurrence = None
+        checklist.recurrence_interval = 1
+        checklist.next_run_at = None
+    else:
+        if data.starts_at is None:
+            raise HTTPException(422, "starts_at is required for a recurring checklist")
+        if data.starts_at.tzinfo is None:
+            raise HTTPException(422, "starts_at must include a timezone")
+        checklist.recurrence = data.recurrence
+        checklist.recurrence_interval = data.interval
+        checklist.next_run_at = data.starts_at
+    await db.flush()
+    from app.core.audit.service import audit
+    await audit(
+        db, tenant_id=tenant_id, user_id=changed_by,
+        action="checklist.recurrence_set",
+        resource_type="project_checklist_template",
+        resource_id=str(checklist.id),
+        detail={
+            "recurrence": checklist.recurrence,
+            "interval": checklist.recurrence_interval,
+            "next_run_at": checklist.next_run_at.isoformat() if checklist.next_run_at else None,
+        },
+    )
+    await db.refresh(checklist)
+    return checklist
+
+
 async def list_project_checklists(
     db: AsyncSession, tenant_id: uuid.UUID, project_id: uuid.UUID
 ) -> list[ProjectChecklistTemplate]:
@@ -450,15 +669,17 @@ async def get_run(db: AsyncSession, run_id: uuid.UUID) -> ChecklistRun | None:
 
 
 async def list_runs(
-    db: AsyncSession, tenant_id: uuid.UUID, project_id: uuid.UUID
+    db: AsyncSession, tenant_id: uuid.UUID, project_id: uuid.UUID, fields: list[str] | None = None
 ) -> list[ChecklistRun]:
-    result = await db.execute(
-        select(ChecklistRun).where(
-            ChecklistRun.tenant_id == tenant_id,
-            ChecklistRun.project_id == project_id,
-            ChecklistRun.is_deleted == False,
-        ).order_by(ChecklistRun.created_at.desc())
-    )
+    """fields: load only these columns (see app.db.fieldsets)."""
+    stmt = select(ChecklistRun).where(
+        ChecklistRun.tenant_id == tenant_id,
+        ChecklistRun.project_id == project_id,
+        ChecklistRun.is_deleted == False,
+    ).order_by(ChecklistRun.created_at.desc())
+    if fields is not None:
+        stmt = stmt.options(load_only_fields(ChecklistRun, fields))
+    result = await db.execute(stmt)
     return list(result.scalars().all())
 
 
@@ -502,40 +723,35 @@ async def submit_run(
     if not version or not version.schema_json:
         raise HTTPException(400, "Checklist schema not found")
 
-    schema = _parse_schema(version.schema_json)
+    compiled = _get_compiled_schema(version)
 
     try:
         answers = json.loads(data.answers_json)
     except Exception:
         raise HTTPException(400, "answers_json must be valid JSON")
 
-    # Fix #5 – validate file_links for requires_image fields
-    from app.core.files.models import FileLink
-    for field in schema:
-        if field.get("requires_image"):
-            answer = answers.get(field["id"], {})
-            file_ids_in_answer = answer.get("file_ids", [])
-            if not file_ids_in_answer:
-                raise HTTPException(
-                    422,
-                    f"Field '{field['label']}' requires at least 1 image (file_id missing in answers_json)"
-                )
-            # Verify at least one is actually linked
-            result = await db.execute(
-                select(func.count(FileLink.id)).where(
-                    FileLink.resource_type == "checklist_run",
-                    FileLink.resource_id == run.id,
-                    FileLink.tenant_id == tenant_id,
-                )
+    # Fix #5 – validate file_links for photo and requires_image fields.
+    # One query for all links of the run, then every referenced file_id is
+    # checked in memory – constant cost regardless of the number of photo fields.
+    if compiled.image_fields:
+        from app.core.files.models import File, FileLink
+        result = await db.execute(
+            select(FileLink.file_id)
+            .join(File, File.id == FileLink.file_id)
+            .where(
+                FileLink.resource_type == "checklist_run",
+                FileLink.resource_id == run.id,
+                FileLink.tenant_id == tenant_id,
+                File.tenant_id == tenant_id,
+                File.is_deleted == False,
             )
-            linked_count = result.scalar_one() or 0
-            if linked_count == 0:
-                raise HTTPException(
-                    422,
-                    f"Field '{field['label']}' requires at least 1 image linked via file_links"
-                )
+        )
+        linked = {str(file_id) for file_id in result.scalars().all()}
+        problem = _check_image_links(compiled.image_fields, answers, linked)
+        if problem:
+            raise HTTPException(422, problem)
 
-    errors = _validate_answers(schema, answers, {})
+    errors = _validate_answers(compiled, answers, {})
     if errors:
         raise HTTPException(422, {"message": "Validation failed", "errors": errors})
 
@@ -546,8 +762,11 @@ async def submit_run(
     run.submitted_by = submitted_by
     await db.flush()
 
+    from app.core.checklists.analytics import store_run_answers
+    await store_run_answers(db, run, answers)
+
     # Fix #6 + #7 – idempotent auto-NC with audit
-    await _auto_create_ncs(db, tenant_id, run, schema, answers, submitted_by)
+    await _auto_create_ncs(db, tenant_id, run, compiled.nc_fields, answers, submitted_by)
 
     from app.core.audit.service import audit
     await audit(
@@ -561,21 +780,10 @@ async def submit_run(
     return run
 
 
-async def _auto_create_ncs(
-    db: AsyncSession,
-    tenant_id: uuid.UUID,
-    run: ChecklistRun,
-    schema: list[dict],
-    answers: dict,
-    submitted_by: uuid.UUID,
-) -> None:
-    from app.core.nonconformance.models import Nonconformance
-    from app.core.nonconformance.service import generate_nc_no
-    from app.core.audit.service import audit
-
-    owner_user_id = await _resolve_nc_assignee(db, tenant_id, run.project_id)
-    nc_created = []
+def _nc_sources_for_run(run: ChecklistRun, schema: list[dict], answers: dict) -> list:
+    from app.core.nonconformance.service import NCSource
 
+    sources = []
     for field in schema:
         if not field.get("creates_nc_on_no"):
             continue
@@ -584,51 +792,69 @@ async def _auto_create_ncs(
         value = answer.get("value")
         if str(value).strip().lower() != "no":
             continue
-
-        # Fix #6 – idempotency: check source_key uniqueness
-        source_key = fid
-        existing = await db.execute(
-            select(Nonconformance).where(
-                Nonconformance.tenant_id == tenant_id,
-                Nonconformance.source_type == "checklist",
-                Nonconformance.source_id == run.id,
-                Nonconformance.source_key == source_key,
-                Nonconformance.is_deleted == False,
-            )
-        )
-        if existing.scalar_one_or_none():
-            continue  # already created – skip
-
-        nc_no = await generate_nc_no(db, tenant_id, run.project_id)
-        nc = Nonconformance(
-            tenant_id=tenant_id,
-            project_id=run.project_id,
-            nc_no=nc_no,
-            title=f"Avvik: {field['label']}",
-            description=f"Automatisk opprettet fra sjekkliste. Felt: {field['label']}",
-            nc_type="nonconformance",
-            severity="low",
-            status="open",
+        # Fix #6 – idempotency: source_key = field id (unique index uq_nc_source_key)
+        sources.append(NCSource(
             source_type="checklist",
             source_id=run.id,
-            source_key=source_key,
-            owner_user_id=owner_user_id,
+            source_key=fid,
+            payload={
+                "title": f"Avvik: {field['label']}",
+                "description": f"Automatisk opprettet fra sjekkliste. Felt: {field['label']}",
+                "severity": "low",
+                "field_label": field["label"],
+            },
+        ))
+    return sources
+
+
+async def _create_auto_ncs(
+    db: AsyncSession,
+    tenant_id: uuid.UUID,
+    project_id: uuid.UUID,
+    sources: list,
+    submitted_by: uuid.UUID,
+) -> None:
+    """Create the auto-NCs of one or more runs in the same project, audited per run."""
+    from app.core.nonconformance.service import create_ncs_from_sources
+    from app.core.audit.service import audit
+
+    if not sources:
+        return
+    owner_user_id = await _resolve_nc_assignee(db, tenant_id, project_id)
+    for source in sources:
+        source.payload["owner_user_id"] = owner_user_id
+    created = await create_ncs_from_sources(db, tenant_id, project_id, sources)
+
+    per_run: dict[uuid.UUID, list[dict]] = {}
+    for s, nc_no in created:
+        per_run.setdefault(s.source_id, []).append(
+            {"nc_no": nc_no, "field_id": s.source_key, "field_label": s.payload["field_label"]}
         )
-        db.add(nc)
-        await db.flush()
-        nc_created.append({"nc_no": nc_no, "field_id": fid, "field_label": field["label"]})
 
     # Fix #7 – audit auto-NC creation
-    if nc_created:
+    for run_id, nc_created in per_run.items():
         await audit(
             db, tenant_id=tenant_id, user_id=submitted_by,
             action="checklist_run.auto_nc_created",
             resource_type="checklist_run",
-            resource_id=str(run.id),
+            resource_id=str(run_id),
             detail={"nc_count": len(nc_created), "ncs": nc_created},
         )
 
 
+async def _auto_create_ncs(
+    db: AsyncSession,
+    tenant_id: uuid.UUID,
+    run: ChecklistRun,
+    schema: list[dict],
+    answers: dict,
+    submitted_by: uuid.UUID,
+) -> None:
+    await _create_auto_ncs(
+        db, tenant_id, run.project_id, _nc_sources_for_run(run, schema, answers), submitted_by
+    )
+
+
 async def approve_run(
     db: AsyncSession,
     run: ChecklistRun,
@@ -671,6 +897,9 @@ async def reject_run(
     run.approved_at = None
     run.approved_by = None
     await db.flush()
+    # Back to open – drop out of analytics until re-submitted
+    from app.core.checklists.analytics import clear_run_answers
+    await clear_run_answers(db, run)
     from app.core.audit.service import audit
     await audit(
         db, tenant_id=tenant_id, user_id=rejected_by,
@@ -681,3 +910,225 @@ async def reject_run(
     )
     await db.refresh(run)
     return run
+
+
+# ── Offline sync ──────────────────────────────────────────────────────────────
+
+def _resolve_file_refs(
+    answers: dict, refs: dict[str, uuid.UUID], known: set[str]
+) -> tuple[list[uuid.UUID], list[str]]:
+    """
+    Rewrite file_ids in answers (in place): offline refs become the ids of the
+    files created by the sync, existing file ids are normalised.
+    Returns (file ids to link to the run, errors).
+    """
+    linked: list[uuid.UUID] = []
+    errors: list[str] = []
+    for field_id, answer in answers.items():
+        if not isinstance(answer, dict) or not answer.get("file_ids"):
+            continue
+        resolved = []
+        for file_id in answer["file_ids"]:
+            if isinstance(file_id, str) and file_id in refs:
+                resolved.append(str(refs[file_id]))
+            elif _normalize_file_id(file_id) in known:
+                resolved.append(_normalize_file_id(file_id))
+            else:
+                errors.append(f"Field '{field_id}' references unknown file '{file_id}'")
+                continue
+            if uuid.UUID(resolved[-1]) not in linked:
+                linked.append(uuid.UUID(resolved[-1]))
+        answer["file_ids"] = resolved
+    return linked, errors
+
+
+async def sync_runs(
+    db: AsyncSession,
+    tenant_id: uuid.UUID,
+    project_id: uuid.UUID,
+    items: list[ChecklistRunSyncItem],
+    user_id: uuid.UUID,
+) -> list[dict]:
+    """
+    Apply a batch of runs completed offline in the caller's transaction.
+    Each item is created (and submitted) once per client_key: replays report
+    'duplicate' with the existing run, invalid items report 'failed' and are
+    skipped without affecting the rest of the batch.
+    """
+    from app.core.files.models import File, FileLink
+    from app.core.checklists.analytics import insert_run_answers
+    from app.core.audit.service import audit
+
+    # Serialise syncs per tenant so the replay check cannot race;
+    # uq_checklist_runs_client_key is the backstop.
+    await db.execute(select(func.pg_advisory_xact_lock(func.hashtext(f"checklist_sync:{tenant_id}"))))
+
+    result = await db.execute(
+        select(ChecklistRun.client_key, ChecklistRun.id, ChecklistRun.status).where(
+            ChecklistRun.tenant_id == tenant_id,
+            ChecklistRun.client_key.in_({i.client_key for i in items}),
+        )
+    )
+    existing = {key: (run_id, status) for key, run_id, status in result.all()}
+
+    result = await db.execute(
+        select(ProjectChecklistTemplateVersion)
+        .join(ProjectChecklistTemplate, ProjectChecklistTemplate.id == ProjectChecklistTemplateVersion.checklist_id)
+        .where(
+            ProjectChecklistTemplateVersion.id.in_({i.template_version_id for i in items}),
+            ProjectChecklistTemplateVersion.tenant_id == tenant_id,
+            ProjectChecklistTemplateVersion.is_deleted == False,
+            ProjectChecklistTemplate.project_id == project_id,
+            ProjectChecklistTemplate.is_deleted == False,
+        )
+    )
+    versions = {v.id: v for v in result.scalars().all()}
+
+    parsed: dict[str, dict] = {}
+    referenced: set[uuid.UUID] = set()
+    for item in items:
+        try:
+            answers = json.loads(item.answers_json)
+        except ValueError:
+            continue
+        if not isinstance(answers, dict):
+            continue
+        parsed[item.client_key] = answers
+        refs = {f.ref for f in item.files}
+        for answer in answers.values():
+            if not isinstance(answer, dict):
+                continue
+            for file_id in answer.get("file_ids") or []:
+                if isinstance(file_id, str) and file_id in refs:
+                    continue
+                try:
+                    referenced.add(uuid.UUID(str(file_id)))
+                except ValueError:
+                    pass
+    known: set[str] = set()
+    if referenced:
+        result = await db.execute(
+            select(File.id).where(
+                File.id.in_(referenced),
+                File.tenant_id == tenant_id,
+                File.is_deleted == False,
+            )
+        )
+        known = {str(file_id) for file_id in result.scalars().all()}
+
+    now = datetime.now(timezone.utc)
+    results: list[dict] = []
+    runs: list[ChecklistRun] = []
+    files: list[File] = []
+    links: list[FileLink] = []
+    submitted: list[tuple[ChecklistRun, dict]] = []
+    nc_sources: list = []
+    for item in items:
+        if item.client_key in existing:
+            run_id, status = existing[item.client_key]
+            results.append({"client_key": item.client_key, "outcome": "duplicate", "run_id": run_id, "run_status": status})
+            continue
+
+        errors: list[str] = []
+        version = versions.get(item.template_version_id)
+        answers = parsed.get(item.client_key)
+        refs = {f.ref: uuid.uuid4() for f in item.files}
+        if not version:
+            errors.append("Checklist template version not found")
+        elif version.status != "active":
+            errors.append(f"Cannot run against version with status '{version.status}'")
+        if answers is None:
+            errors.append("answers_json must be a valid JSON object")
+        if len(refs) != len(item.files):
+            errors.append("File refs must be unique within a run")
+        linked: list[uuid.UUID] = []
+        if not errors:
+            linked, errors = _resolve_file_refs(answers, refs, known)
+        compiled = None
+        if not errors and item.submit:
+            if not version.schema_json:
+                errors.append("Checklist schema not found")
+            else:
+                compiled = _get_compiled_schema(version)
+                problem = _check_image_links(compiled.image_fields, answers, {str(i) for i in linked})
+                if problem:
+                    errors.append(problem)
+                errors.extend(_validate_answers(compiled, answers, {}))
+        if errors:
+            results.append({"client_key": item.client_key, "outcome": "failed", "errors": errors})
+            continue
+
+        run = ChecklistRun(
+            id=uuid.uuid4(),
+            tenant_id=tenant_id,
+            project_id=project_id,
+            checklist_id=version.checklist_id,
+            template_version_id=version.id,
+            status="submitted" if item.submit else "open",
+            answers_json=json.dumps(answers, ensure_ascii=False),
+            run_by=user_id,
+            client_key=item.client_key,
+        )
+        if item.submit:
+            run.submitted_at = now
+            run.submitted_by = user_id
+            submitted.append((run, answers))
+            nc_sources.extend(_nc_sources_for_run(run, compiled.nc_fields, answers))
+        runs.append(run)
+        files.extend(
+            File(id=refs[f.ref], tenant_id=tenant_id, uploaded_by=user_id, **f.model_dump(exclude={"ref"}))
+            for f in item.files
+        )
+        links.extend(
+            FileLink(tenant_id=tenant_id, file_id=file_id, resource_type="checklist_run", resource_id=run.id)
+            for file_id in linked
+        )
+        # A key repeated within the batch is a replay of this item
+        existing[item.client_key] = (run.id, run.status)
+        results.append({"client_key": item.client_key, "outcome": "created", "run_id": run.id, "run_status": run.status})
+
+    if runs:
+        db.add_all(runs)
+        db.add_all(files)
+        await db.flush()
+        db.add_all(links)
+        await db.flush()
+        await insert_run_answers(db, submitted)
+        await _create_auto_ncs(db, tenant_id, project_id, nc_sources, user_id)
+
+    await audit(
+        db, tenant_id=tenant_id, user_id=user_id,
+        action="checklist_run.batch_synced",
+        resource_type="project",
+        resource_id=str(project_id),
+        detail={
+            "created": [{"client_key": r.client_key, "run_id": str(r.id), "status": r.status} for r in runs],
+            "duplicates": sum(1 for r in results if r["outcome"] == "duplicate"),
+            "failed": sum(1 for r in results if r["outcome"] == "failed"),
+        },
+    )
+    return results
+
+
+# ── Analytics ─────────────────────────────────────────────────────────────────
+
+async def get_checklist_analytics(
+    db: AsyncSession,
+    tenant_id: uuid.UUID,
+    checklist: ProjectChecklistTemplate,
+    date_from: datetime | None,
+    date_to: datetime | None,
+) -> dict:
+    from fastapi import HTTPException
+    from app.core.checklists.analytics import checklist_analytics
+    result = await db.execute(
+        select(ProjectChecklistTemplateVersion).where(
+            ProjectChecklistTemplateVersion.checklist_id == checklist.id,
+            ProjectChecklistTemplateVersion.is_deleted == False,
+        ).order_by(ProjectChecklistTemplateVersion.version_no.desc()).limit(1)
+    )
+    version = result.scalar_one_or_none()
+    if not version or not version.schema_json:
+        raise HTTPException(400, "Checklist schema not found")
+    fields = _get_compiled_schema(version).fields
+    return await checklist_analytics(db, tenant_id, checklist.id, fields, date_from, date_to)
@@ -0,0 +1,173 @@
+"""
+Compiled checklist schemas.
+
+A schema is compiled once into a list of per-field check callables (chosen by
+field_type when the schema is compiled, not on every answer) plus the
+pre-computed image / auto-NC field lists that submit needs.
+
+Active project checklist versions are immutable, so the compiled form is kept
+in an LRU keyed by version id. Versions in any other status are compiled on
+every call and never cached. Anything that changes a cached version's schema
+or status must call compiled_schemas.evict(version_id).
+"""
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field as dc_field
+from datetime import date
+from threading import Lock
+from typing import Any, Callable
+
+VALID_FIELD_TYPES = ("yes_no", "text", "number", "date", "photo")
+CACHEABLE_VERSION_STATUSES = {"active", "approved"}
+
+YES_NO_VALUES = {"yes", "no", "n/a"}
+
+Check = Callable[[Any], str | None]
+
+
+# ── Per-type value checks ─────────────────────────────────────────────────────
+
+def _check_yes_no(value: Any) -> str | None:
+    if isinstance(value, bool) or str(value).strip().lower() in YES_NO_VALUES:
+        return None
+    return "must be Yes, No or N/A"
+
+
+def _check_number(value: Any) -> str | None:
+    if isinstance(value, bool):
+        return "must be a number"
+    if isinstance(value, (int, float)):
+        return None
+    try:
+        float(str(value).replace(",", "."))
+    except ValueError:
+        return "must be a number"
+    return None
+
+
+def _check_date(value: Any) -> str | None:
+    try:
+        date.fromisoformat(str(value))
+    except ValueError:
+        return "must be a date (YYYY-MM-DD)"
+    return None
+
+
+def _check_text(value: Any) -> str | None:
+    if isinstance(value, (str, int, float)):
+        return None
+    return "must be text"
+
+
+_VALUE_CHECKS: dict[str, Check | None] = {
+    "yes_no": _check_yes_no,
+    "number": _check_number,
+    "date": _check_date,
+    "text": _check_text,
+    "photo": None,  # the answer of a photo field is its file_ids
+}
+
+
+# ── Compilation ───────────────────────────────────────────────────────────────
+
+def _is_empty(value: Any) -> bool:
+    return value is None or value == ""
+
+
+def _compile_field(f: dict) -> Callable[[dict], list[str]]:
+    fid, label = f["id"], f["label"]
+    is_photo = f["field_type"] == "photo"
+    required = bool(f.get("required"))
+    requires_image = bool(f.get("requires_image"))
+    value_check = _VALUE_CHECKS[f["field_type"]]
+
+    def check(answers: dict) -> list[str]:
+        answer = answers.get(fid) or {}
+        value = answer.get("value")
+        file_ids = answer.get("file_ids") or []
+        errors = []
+        if required and (not file_ids if is_photo else _is_empty(value)):
+            errors.append(f"Field '{label}' is required")
+        if requires_image and not file_ids:
+            errors.append(f"Field '{label}' requires at least 1 image")
+        if value_check is not None and not _is_empty(value):
+            problem = value_check(value)
+            if problem:
+                errors.append(f"Field '{label}' {problem}")
+        return errors
+
+    return check
+
+
+@dataclass
+class CompiledSchema:
+    fields: list[dict]
+    checks: list[Callable[[dict], list[str]]] = dc_field(repr=False)
+    image_fields: list[dict]
+    nc_fields: list[dict]
+
+    def validate(self, answers: dict) -> list[str]:
+        errors: list[str] = []
+        for check in self.checks:
+            errors.extend(check(answers))
+        return errors
+
+
+def compile_schema(fields: list[dict]) -> CompiledSchema:
+    """Compile already-parsed fields (see service._parse_schema)."""
+    return CompiledSchema(
+        fields=fields,
+        checks=[_compile_field(f) for f in fields],
+        image_fields=[f for f in fields if f["field_type"] == "photo" or f.get("requires_image")],
+        nc_fields=[f for f in fields if f.get("creates_nc_on_no")],
+    )
+
+
+# ── LRU per version id ────────────────────────────────────────────────────────
+
+class CompiledSchemaCache:
+    def __init__(self, maxsize: int = 512) -> None:
+        self.maxsize = maxsize
+        self._items: OrderedDict[uuid.UUID, CompiledSchema] = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compile(
+        self,
+        version_id: uuid.UUID,
+        status: str,
+        schema_json: str,
+        parse: Callable[[str], list[dict]],
+    ) -> CompiledSchema:
+        if status not in CACHEABLE_VERSION_STATUSES:
+            return compile_schema(parse(schema_json))
+        with self._lock:
+            compiled = self._items.get(version_id)
+            if compiled is not None:
+                self._items.move_to_end(version_id)
+                self.hits += 1
+                return compiled
+        compiled = compile_schema(parse(schema_json))
+        with self._lock:
+            self.misses += 1
+            self._items[version_id] = compiled
+            self._items.move_to_end(version_id)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+        return compiled
+
+    def evict(self, version_id: uuid.UUID) -> None:
+        with self._lock:
+            self._items.pop(version_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self.hits = self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+compiled_schemas = CompiledSchemaCache()
@@ -0,0 +1,242 @@
+"""
+Content-addressed document text.
+
+Version text is not stored on the version rows. It is stored once per tenant
+in doc_content_blobs, keyed by its SHA-256, and versions only carry the hash.
+A library template frozen into 200 projects is therefore one blob. Blobs are
+insert-only and keyed by their hash, so the text of a published or issued
+version cannot change after the fact.
+
+A blob is either the zlib-compressed text ("zlib") or a compressed line
+delta against the previous version's blob ("delta"). A delta is only stored
+when it is clearly smaller, and chains are capped at MAX_DELTA_CHAIN so
+reconstruction stays bounded. Reconstructed text is kept in a process-wide
+LRU per (tenant, hash). Blobs never change, so cache entries are never
+invalidated.
+"""
+import difflib
+import hashlib
+import json
+import uuid
+import zlib
+from collections import OrderedDict
+from threading import Lock
+from typing import Iterable
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.documents.models import DocContentBlob
+from app.db.search import search_vector
+
+MAX_DELTA_CHAIN = 10
+DELTA_MAX_RATIO = 0.5  # store a delta only if ≤ half the size of the full blob
+COMPRESSION_LEVEL = 6
+INSERT_CHUNK_SIZE = 1000  # rows per multi-row INSERT (bind parameter limit)
+
+
+# ── Codec ─────────────────────────────────────────────────────────────────────
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def compress(text: str) -> bytes:
+    return zlib.compress(text.encode("utf-8"), COMPRESSION_LEVEL)
+
+
+def decompress(data: bytes) -> str:
+    return zlib.decompress(data).decode("utf-8")
+
+
+def make_delta(base: str, text: str) -> bytes:
+    """Line delta: ["c", i1, i2] copies base lines, ["i", "..."] inserts text."""
+    base_lines = base.splitlines(keepends=True)
+    lines = text.splitlines(keepends=True)
+    ops: list[list] = []
+    matcher = difflib.SequenceMatcher(None, base_lines, lines, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            ops.append(["c", i1, i2])
+        elif j2 > j1:
+            ops.append(["i", "".join(lines[j1:j2])])
+    return zlib.compress(json.dumps(ops, ensure_ascii=False).encode("utf-8"), COMPRESSION_LEVEL)
+
+
+def apply_delta(base: str, delta: bytes) -> str:
+    base_lines = base.splitlines(keepends=True)
+    parts = []
+    for op in json.loads(zlib.decompress(delta)):
+        if op[0] == "c":
+            parts.extend(base_lines[op[1]:op[2]])
+        else:
+            parts.append(op[1])
+    return "".join(parts)
+
+
+# ── Reconstruction cache ──────────────────────────────────────────────────────
+
+class ContentCache:
+    def __init__(self, maxsize: int = 256) -> None:
+        self.maxsize = maxsize
+        self._items: OrderedDict[tuple[uuid.UUID, str], str] = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, tenant_id: uuid.UUID, digest: str) -> str | None:
+        with self._lock:
+            text = self._items.get((tenant_id, digest))
+            if text is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end((tenant_id, digest))
+            self.hits += 1
+            return text
+
+    def put(self, tenant_id: uuid.UUID, digest: str, text: str) -> None:
+        with self._lock:
+            self._items[(tenant_id, digest)] = text
+            self._items.move_to_end((tenant_id, digest))
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self.hits = self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+contents = ContentCache()
+
+
+# ── Store ─────────────────────────────────────────────────────────────────────
+
+async def _fetch_chains(
+    db: AsyncSession, tenant_id: uuid.UUID, digests: set[str]
+) -> dict[str, DocContentBlob]:
+    """The blobs for digests plus every delta base they need, in one query."""
+    B = DocContentBlob
+    chain = (
+        select(B.content_hash, B.base_hash)
+        .where(B.tenant_id == tenant_id, B.content_hash.in_(digests))
+        .cte("chain", recursive=True)
+    )
+    chain = chain.union(
+        select(B.content_hash, B.base_hash).join(
+            chain, (B.content_hash == chain.c.base_hash) & (B.tenant_id == tenant_id)
+        )
+    )
+    result = await db.execute(
+        select(B).where(B.tenant_id == tenant_id, B.content_hash.in_(select(chain.c.content_hash)))
+    )
+    return {b.content_hash: b for b in result.scalars().all()}
+
+
+def _reconstruct(digest: str, blobs: dict[str, DocContentBlob], texts: dict[str, str]) -> str:
+    if digest in texts:
+        return texts[digest]
+    blob = blobs[digest]
+    if blob.encoding == "delta":
+        text = apply_delta(_reconstruct(blob.base_hash, blobs, texts), blob.data)
+    else:
+        text = decompress(blob.data)
+    texts[digest] = text
+    return text
+
+
+async def load(db: AsyncSession, tenant_id: uuid.UUID, digests: Iterable[str | None]) -> dict[str, str]:
+    """hash → text for every non-null digest (cache first, then one DB round trip)."""
+    texts: dict[str, str] = {}
+    missing: set[str] = set()
+    for digest in digests:
+        if digest is None or digest in texts:
+            continue
+        text = contents.get(tenant_id, digest)
+        if text is None:
+            missing.add(digest)
+        else:
+            texts[digest] = text
+    if missing:
+        blobs = await _fetch_chains(db, tenant_id, missing)
+        for digest in missing:
+            texts[digest] = _reconstruct(digest, blobs, texts)
+            contents.put(tenant_id, digest, texts[digest])
+    return texts
+
+
+async def put(
+    db: AsyncSession, tenant_id: uuid.UUID, text: str | None, base_hash: str | None = None
+) -> str | None:
+    """Store text (idempotent) and return its hash; None stays None."""
+    if text is None:
+        return None
+    return (await put_many(db, tenant_id, [text], base_hash))[0]
+
+
+async def put_many(
+    db: AsyncSession, tenant_id: uuid.UUID, texts: list[str], base_hash: str | None = None
+) -> list[str]:
+    """
+    Store many texts sharing one delta base (e.g. a template rendered into
+    many projects) with one lookup and one insert. Returns their hashes.
+    """
+    digests = [content_hash(t) for t in texts]
+    result = await db.execute(
+        select(DocContentBlob.content_hash, DocContentBlob.chain_depth).where(
+            DocContentBlob.tenant_id == tenant_id,
+            DocContentBlob.content_hash.in_(set(digests) | ({base_hash} - {None})),
+        )
+    )
+    depths = dict(result.all())
+    base_depth = depths.get(base_hash)
+    base_text = None
+    if base_depth is not None and base_depth < MAX_DELTA_CHAIN:
+        base_text = (await load(db, tenant_id, [base_hash]))[base_hash]
+
+    rows = {}
+    for digest, text in zip(digests, texts):
+        if digest in depths or digest in rows:
+            continue  # same text already stored (another version or project)
+        full = compress(text)
+        row = {
+            "tenant_id": tenant_id, "content_hash": digest, "encoding": "zlib",
+            "base_hash": None, "chain_depth": 0, "data": full,
+            "size_bytes": len(text.encode("utf-8")), "stored_bytes": len(full),
+            "search_vector": search_vector(text),
+        }
+        if base_text is not None:
+            delta = make_delta(base_text, text)
+            if len(delta) <= len(full) * DELTA_MAX_RATIO:
+                row.update(
+                    encoding="delta", base_hash=base_hash, chain_depth=base_depth + 1,
+                    data=delta, stored_bytes=len(delta),
+                )
+        rows[digest] = row
+
+    if rows:
+        values = list(rows.values())
+        for i in range(0, len(values), INSERT_CHUNK_SIZE):
+            await db.execute(
+                pg_insert(DocContentBlob).values(values[i:i + INSERT_CHUNK_SIZE])
+                .on_conflict_do_nothing(index_elements=["tenant_id", "content_hash"])
+            )
+        for digest, text in zip(digests, texts):
+            contents.put(tenant_id, digest, text)
+    return digests
+
+
+async def attach(db: AsyncSession, versions: Iterable) -> None:
+    """Set .content on doc/template versions from their content_hash."""
+    versions = list(versions)
+    by_tenant: dict[uuid.UUID, list] = {}
+    for v in versions:
+        by_tenant.setdefault(v.tenant_id, []).append(v)
+    for tenant_id, group in by_tenant.items():
+        texts = await load(db, tenant_id, [v.content_hash for v in group])
+        for v in group:
+            v.content = texts.get(v.content_hash) if v.content_hash else None
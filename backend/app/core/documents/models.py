@@ -1,9 +1,10 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import Boolean, DateTime, String, Text, ForeignKey, Integer, UniqueConstraint
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Boolean, DateTime, String, Text, ForeignKey, Integer, LargeBinary, PrimaryKeyConstraint, UniqueConstraint, text
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from app.db.base import Base, TimestampMixin, SoftDeleteMixin, TenantScopedMixin
+from app.db.base import Base, TimestampMixin, SoftDeleteMixin, TenantScopedMixin, VersionedMixin
+from app.db.search import search_index, search_vector_column
 
 
 class DocTemplate(Base, TimestampMixin, SoftDeleteMixin, TenantScopedMixin):
@@ -26,12 +27,15 @@ class DocTemplateVersion(Base, TimestampMixin, SoftDeleteMixin, TenantScopedMixi
     """
     Immutable once published.
     status: draft | published | superseded
+    Text lives in doc_content_blobs (content_store); .content is filled by
+    content_store.attach.
     """
     __tablename__ = "doc_template_versions"
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     template_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("doc_templates.id", ondelete="CASCADE"), nullable=False, index=True)
     version_no: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
-    content: Mapped[str | None] = mapped_column(Text, nullable=True)
+    content_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    content = None
     change_summary: Mapped[str | None] = mapped_column(Text, nullable=True)
     status: Mapped[str] = mapped_column(String(50), nullable=False, default="draft")
     published_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
@@ -56,22 +60,29 @@ class ProjectDoc(Base, TimestampMixin, SoftDeleteMixin, TenantScopedMixin):
     category: Mapped[str] = mapped_column(String(50), nullable=False, default="ANNET")
     status: Mapped[str] = mapped_column(String(50), nullable=False, default="draft")
     owner_user_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    search_vector = search_vector_column(("doc_no", "A"), ("title", "A"), ("doc_type", "C"), ("category", "C"))
     versions: Mapped[list["ProjectDocVersion"]] = relationship(back_populates="doc", lazy="noload")
     __table_args__ = (
         UniqueConstraint("tenant_id", "project_id", "doc_no", name="uq_project_doc_no"),
+        search_index("project_docs"),
     )
 
 
-class ProjectDocVersion(Base, TimestampMixin, SoftDeleteMixin, TenantScopedMixin):
+class ProjectDocVersion(Base, TimestampMixin, SoftDeleteMixin, TenantScopedMixin, VersionedMixin):
     """
     Immutable once issued.
     status: draft | under_review | approved | issued | superseded
+    ack_pending_count / ack_acknowledged_count: maintained on issue and
+    acknowledge so completion can be read without counting ack_requests.
+    Text lives in doc_content_blobs (content_store); .content is filled by
+    content_store.attach.
     """
     __tablename__ = "project_doc_versions"
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     doc_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("project_docs.id", ondelete="CASCADE"), nullable=False, index=True)
     version_no: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
-    content: Mapped[str | None] = mapped_column(Text, nullable=True)
+    content_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    content = None
     change_summary: Mapped[str | None] = mapped_column(Text, nullable=True)
     status: Mapped[str] = mapped_column(String(50), nullable=False, default="draft")
     requires_ack: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
@@ -79,6 +90,8 @@ class ProjectDocVersion(Base, TimestampMixin, SoftDeleteMixin, TenantScopedMixin
     approved_by: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
     issued_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     issued_by: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    ack_pending_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    ack_acknowledged_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
     doc: Mapped["ProjectDoc"] = relationship(back_populates="versions")
     ack_requests: Mapped[list["AckRequest"]] = relationship(back_populates="doc_version", lazy="noload")
 
@@ -92,6 +105,9 @@ class AckRequest(Base, TimestampMixin, TenantScopedMixin):
     status: Mapped[str] = mapped_column(String(50), nullable=False, default="pending")
     doc_version: Mapped["ProjectDocVersion"] = relationship(back_populates="ack_requests")
     response: Mapped["AckResponse | None"] = relationship(back_populates="request", lazy="noload")
+    __table_args__ = (
+        UniqueConstraint("doc_version_id", "user_id", name="uq_ack_requests_version_user"),
+    )
 
 
 class AckResponse(Base, TimestampMixin, TenantScopedMixin):
@@ -102,3 +118,28 @@ class AckResponse(Base, TimestampMixin, TenantScopedMixin):
     acknowledged_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
     comment: Mapped[str | None] = mapped_column(Text, nullable=True)
     request: Mapped["AckRequest"] = relationship(back_populates="response")
+
+
+class DocContentBlob(Base, TenantScopedMixin):
+    """
+    Content-addressed, compressed document text (see content_store.py).
+    Insert-only: the SHA-256 of the text is the key, so a blob never changes.
+    encoding: zlib (full text) | delta (line delta against base_hash)
+    chain_depth: number of deltas to walk back to a full blob.
+    search_vector: tsvector of the text, computed once per blob on insert
+    (the text is compressed, so it cannot be a generated column).
+    """
+    __tablename__ = "doc_content_blobs"
+    content_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    encoding: Mapped[str] = mapped_column(String(10), nullable=False, default="zlib")
+    base_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    chain_depth: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    data: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    size_bytes: Mapped[int] = mapped_column(Integer, nullable=False)
+    stored_bytes: Mapped[int] = mapped_column(Integer, nullable=False)
+    search_vector: Mapped[str | None] = mapped_column(TSVECTOR, nullable=True, deferred=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=text("now()"))
+    __table_args__ = (
+        PrimaryKeyConstraint("tenant_id", "content_hash", name="pk_doc_content_blobs"),
+        search_index("doc_content_blobs"),
+    )
@@ -1,19 +1,25 @@
 import uuid
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.documents import service
+from app.core.documents import service, content_store
 from app.core.documents.schemas import (
     DocTemplateCreate, DocTemplateRead,
     DocTemplateVersionCreate, DocTemplateVersionRead,
     ProjectDocCreate, ProjectDocRead,
-    ProjectDocVersionCreate, ProjectDocVersionRead,
+    ProjectDocVersionCreate, ProjectDocVersionRead, ProjectDocVersionUpdate,
     AckRequestRead, AckResponseCreate, AckResponseRead,
-    AckReportRow, IssueRequest,
+    AckReportRow, AckSummaryRead, IssueRequest,
+    AckAudience, AckFanOutRead,
+    DocTemplateRolloutRequest, DocTemplateRolloutRead,
 )
-from app.core.documents.models import DocTemplateVersion, ProjectDocVersion
+from app.core.documents.models import DocTemplateVersion, ProjectDoc, ProjectDocVersion
+from app.db.fieldsets import FIELDS_QUERY, parse_fields, load_only_fields, sparse_model, sparse_rows
 from app.dependencies import get_db, get_current_user, CurrentUser
+from app.http_cache import (
+    check_if_match, immutable_model, not_modified_since, serve_immutable, serve_version_list, set_etag,
+)
 
 router = APIRouter(tags=["documents"])
 
@@ -62,19 +68,76 @@ async def create_template_version(
     return await service.create_template_version(db, current.tenant_id, t, data)
 
 
-@router.get("/library/templates/{template_id}/versions", response_model=list[DocTemplateVersionRead])
+async def _load_template_versions(
+    db: AsyncSession, ids: list[uuid.UUID], fields: list[str] | None
+) -> list[DocTemplateVersion]:
+    stmt = select(DocTemplateVersion).where(DocTemplateVersion.id.in_(ids))
+    if fields is not None:
+        stmt = stmt.options(load_only_fields(DocTemplateVersion, [*fields, "tenant_id", "content_hash"]))
+    versions = (await db.execute(stmt)).scalars().all()
+    if fields is None or "content" in fields:
+        await content_store.attach(db, versions)
+    return versions
+
+
+@router.get(
+    "/library/templates/{template_id}/versions",
+    response_model=list[sparse_model(DocTemplateVersionRead)],
+    response_model_exclude_unset=True,
+)
 async def list_template_versions(
     template_id: uuid.UUID,
+    request: Request,
+    fields: str | None = FIELDS_QUERY,
     db: AsyncSession = Depends(get_db),
-    _: CurrentUser = Depends(get_current_user),
+    current: CurrentUser = Depends(get_current_user),
 ):
+    """Published versions come from the immutable cache; strong ETag, 304 on a match."""
+    selected = parse_fields(DocTemplateVersionRead, fields, heavy={"content"})
     result = await db.execute(
-        select(DocTemplateVersion).where(
+        select(DocTemplateVersion.id, DocTemplateVersion.status).where(
             DocTemplateVersion.template_id == template_id,
             DocTemplateVersion.is_deleted == False,
         ).order_by(DocTemplateVersion.version_no.desc())
     )
-    return list(result.scalars().all())
+    return await serve_version_list(
+        request, current.tenant_id, "doc_template_version", DocTemplateVersionRead,
+        result.all(), service.IMMUTABLE_TEMPLATE_VERSION_STATUSES, selected,
+        lambda ids, cols: _load_template_versions(db, ids, cols),
+    )
+
+
+@router.get(
+    "/library/templates/{template_id}/versions/{version_id}",
+    response_model=immutable_model(DocTemplateVersionRead),
+)
+async def get_template_version(
+    template_id: uuid.UUID,
+    version_id: uuid.UUID,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current: CurrentUser = Depends(get_current_user),
+):
+    """
+    A published (or superseded) version, which never changes: cached,
+    strong ETag, Cache-Control: immutable. status is omitted – see the list.
+    """
+    result = await db.execute(
+        select(DocTemplateVersion.status).where(
+            DocTemplateVersion.id == version_id,
+            DocTemplateVersion.template_id == template_id,
+            DocTemplateVersion.is_deleted == False,
+        )
+    )
+    if result.scalar_one_or_none() not in service.IMMUTABLE_TEMPLATE_VERSION_STATUSES:
+        raise HTTPException(404, "Version not found or not published")
+
+    async def load() -> DocTemplateVersion | None:
+        return next(iter(await _load_template_versions(db, [version_id], None)), None)
+
+    return await serve_immutable(
+        request, current.tenant_id, "doc_template_version", version_id, DocTemplateVersionRead, load,
+    )
 
 
 @router.post("/library/templates/{template_id}/versions/{version_id}/publish", response_model=DocTemplateVersionRead)
@@ -100,6 +163,16 @@ async def publish_template_version(
     return await service.publish_template_version(db, version, current.user_id, current.tenant_id)
 
 
+@router.post("/library/templates/rollout", response_model=DocTemplateRolloutRead, status_code=201)
+async def rollout_template_to_projects(
+    data: DocTemplateRolloutRequest,
+    db: AsyncSession = Depends(get_db),
+    current: CurrentUser = Depends(get_current_user),
+):
+    """Create a project doc from a published version in many (or all active) projects, placeholders filled in."""
+    return await service.rollout_template_to_projects(db, current.tenant_id, data, current.user_id)
+
+
 # ── Project docs ──────────────────────────────────────────────────────────────
 
 @router.post("/projects/{project_id}/docs", response_model=ProjectDocRead, status_code=201)
@@ -126,23 +199,34 @@ async def list_project_docs(
 async def get_project_doc(
     project_id: uuid.UUID,
     doc_id: uuid.UUID,
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db),
     _: CurrentUser = Depends(get_current_user),
 ):
+    if (unchanged := await not_modified_since(request, db, ProjectDoc, doc_id)) is not None:
+        return unchanged
     doc = await service.get_project_doc(db, doc_id)
     if not doc:
         raise HTTPException(404, "Document not found")
+    set_etag(response, doc)
     return doc
 
 
-@router.get("/projects/{project_id}/docs/{doc_id}/versions", response_model=list[ProjectDocVersionRead])
+@router.get(
+    "/projects/{project_id}/docs/{doc_id}/versions",
+    response_model=list[sparse_model(ProjectDocVersionRead)],
+    response_model_exclude_unset=True,
+)
 async def list_doc_versions(
     project_id: uuid.UUID,
     doc_id: uuid.UUID,
+    fields: str | None = FIELDS_QUERY,
     db: AsyncSession = Depends(get_db),
     _: CurrentUser = Depends(get_current_user),
 ):
-    return await service.list_doc_versions(db, doc_id)
+    selected = parse_fields(ProjectDocVersionRead, fields, heavy={"content"})
+    return sparse_rows(await service.list_doc_versions(db, doc_id, selected), selected)
 
 
 @router.post("/projects/{project_id}/docs/{doc_id}/versions", response_model=ProjectDocVersionRead, status_code=201)
@@ -159,35 +243,78 @@ async def create_doc_version(
     return await service.create_doc_version(db, current.tenant_id, doc, data)
 
 
+@router.patch("/doc-versions/{version_id}", response_model=ProjectDocVersionRead)
+async def update_doc_version(
+    version_id: uuid.UUID,
+    data: ProjectDocVersionUpdate,
+    response: Response,
+    if_match: str | None = Header(None),
+    db: AsyncSession = Depends(get_db),
+    _: CurrentUser = Depends(get_current_user),
+):
+    version = await service.get_doc_version(db, version_id)
+    if not version:
+        raise HTTPException(404, "Version not found")
+    check_if_match(if_match, version)
+    version = await service.update_doc_version(db, version, data)
+    set_etag(response, version)
+    return version
+
+
 # ── Approval + Issue ──────────────────────────────────────────────────────────
 
 @router.post("/doc-versions/{version_id}/approve", response_model=ProjectDocVersionRead)
 async def approve_doc_version(
     version_id: uuid.UUID,
+    response: Response,
+    if_match: str | None = Header(None),
     db: AsyncSession = Depends(get_db),
     current: CurrentUser = Depends(get_current_user),
 ):
     version = await service.get_doc_version(db, version_id)
     if not version:
         raise HTTPException(404, "Version not found")
-    return await service.approve_doc_version(db, version, current.user_id, current.tenant_id)
+    check_if_match(if_match, version)
+    version = await service.approve_doc_version(db, version, current.user_id, current.tenant_id)
+    set_etag(response, version)
+    return version
 
 
 @router.post("/doc-versions/{version_id}/issue", response_model=ProjectDocVersionRead)
 async def issue_doc_version(
     version_id: uuid.UUID,
     data: IssueRequest,
+    response: Response,
+    if_match: str | None = Header(None),
     db: AsyncSession = Depends(get_db),
     current: CurrentUser = Depends(get_current_user),
 ):
     version = await service.get_doc_version(db, version_id)
     if not version:
         raise HTTPException(404, "Version not found")
-    return await service.issue_doc_version(db, version, current.user_id, current.tenant_id, data)
+    check_if_match(if_match, version)
+    version = await service.issue_doc_version(db, version, current.user_id, current.tenant_id, data)
+    set_etag(response, version)
+    return version
 
 
 # ── Acknowledgements ──────────────────────────────────────────────────────────
 
+@router.post("/doc-versions/{version_id}/ack-requests", response_model=AckFanOutRead, status_code=201)
+async def request_acks(
+    version_id: uuid.UUID,
+    data: AckAudience,
+    db: AsyncSession = Depends(get_db),
+    current: CurrentUser = Depends(get_current_user),
+):
+    """Extend the audience of an issued version; users already asked are skipped."""
+    version = await service.get_doc_version(db, version_id)
+    if not version:
+        raise HTTPException(404, "Version not found")
+    created = await service.request_acks(db, current.tenant_id, version, data, current.user_id)
+    return {"doc_version_id": version.id, "created": created}
+
+
 @router.post("/ack-requests/{ack_request_id}/acknowledge", response_model=AckResponseRead)
 async def acknowledge(
     ack_request_id: uuid.UUID,
@@ -206,3 +333,15 @@ async def ack_report(
 ):
     rows = await service.get_ack_report(db, current.tenant_id, version_id)
     return [AckReportRow(**r) for r in rows]
+
+
+@router.get("/doc-versions/{version_id}/ack-summary", response_model=AckSummaryRead)
+async def ack_summary(
+    version_id: uuid.UUID,
+    db: AsyncSession = Depends(get_db),
+    current: CurrentUser = Depends(get_current_user),
+):
+    summary = await service.get_ack_summary(db, current.tenant_id, version_id)
+    if summary is None:
+        raise HTTPException(404, "Version not found")
+    return summary
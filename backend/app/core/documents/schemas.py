@@ -45,6 +45,7 @@ class DocTemplateVersionRead(BaseModel):
     tenant_id: uuid.UUID
     version_no: int
     content: str | None
+    content_hash: str | None
     change_summary: str | None
     status: str
     published_at: datetime | None
@@ -52,6 +53,28 @@ class DocTemplateVersionRead(BaseModel):
     created_at: datetime
 
 
+class DocTemplateRolloutRequest(BaseModel):
+    """Create a project doc from a published version in many projects; project_ids=None means all active projects."""
+    template_version_id: uuid.UUID
+    project_ids: list[uuid.UUID] | None = None
+    title: str | None = Field(None, max_length=500)  # default: the template's title
+    skip_existing: bool = True  # skip projects that already hold a doc from this version
+
+
+class DocTemplateRolloutItem(BaseModel):
+    project_id: uuid.UUID
+    doc_id: uuid.UUID
+    doc_version_id: uuid.UUID
+    doc_no: str
+
+
+class DocTemplateRolloutRead(BaseModel):
+    source_version_id: uuid.UUID
+    created: list[DocTemplateRolloutItem]
+    skipped_project_ids: list[uuid.UUID]
+    missing_project_ids: list[uuid.UUID]
+
+
 # ── Project docs ──────────────────────────────────────────────────────────────
 
 class ProjectDocCreate(BaseModel):
@@ -97,6 +120,7 @@ class ProjectDocVersionRead(BaseModel):
     tenant_id: uuid.UUID
     version_no: int
     content: str | None
+    content_hash: str | None
     change_summary: str | None
     status: str
     requires_ack: bool
@@ -104,6 +128,9 @@ class ProjectDocVersionRead(BaseModel):
     approved_by: uuid.UUID | None
     issued_at: datetime | None
     issued_by: uuid.UUID | None
+    ack_pending_count: int
+    ack_acknowledged_count: int
+    version: int
     created_at: datetime
 
 
@@ -139,5 +166,29 @@ class AckReportRow(BaseModel):
     acknowledged_at: datetime | None
 
 
-class IssueRequest(BaseModel):
+class AckSummaryRead(BaseModel):
+    doc_version_id: uuid.UUID
+    requested: int
+    acknowledged: int
+    pending: int
+    completion_rate: float  # acknowledged / requested (0 when nothing requested)
+
+
+class AckAudience(BaseModel):
+    """Who must acknowledge – resolved server-side, combined as a union."""
     ack_user_ids: list[uuid.UUID] = Field(default_factory=list)
+    ack_role_ids: list[uuid.UUID] = Field(default_factory=list)  # all holders of these roles
+    ack_project_workers: bool = False  # everyone with a timesheet on the project
+    ack_all_users: bool = False  # every active user in the tenant
+
+    def is_empty(self) -> bool:
+        return not (self.ack_user_ids or self.ack_role_ids or self.ack_project_workers or self.ack_all_users)
+
+
+class IssueRequest(AckAudience):
+    pass
+
+
+class AckFanOutRead(BaseModel):
+    doc_version_id: uuid.UUID
+    created: int  # new requests; users already asked are skipped
@@ -1,8 +1,11 @@
 import uuid
 from datetime import datetime, timezone
-from sqlalchemy import select, func
+from sqlalchemy import select, func, insert, update, literal, union
+from sqlalchemy.dialects.postgresql import ARRAY, UUID, insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.db.fieldsets import load_only_fields
+from app.core.documents import content_store, templating
 from app.core.documents.models import (
     DocTemplate, DocTemplateVersion,
     ProjectDoc, ProjectDocVersion,
@@ -12,8 +15,10 @@ from app.core.documents.schemas import (
     DocTemplateCreate, DocTemplateVersionCreate,
     ProjectDocCreate, ProjectDocVersionCreate,
     ProjectDocVersionUpdate, DocTemplateVersionUpdate,
-    AckResponseCreate, IssueRequest,
+    AckResponseCreate, AckAudience, IssueRequest,
+    DocTemplateRolloutRequest,
 )
+from app.core.rbac.models import User
 
 
 # ── Permission helpers ────────────────────────────────────────────────────────
@@ -47,6 +52,9 @@ async def _has_permission(
 
 # ── Immutability guards ───────────────────────────────────────────────────────
 
+IMMUTABLE_TEMPLATE_VERSION_STATUSES = {"published", "superseded"}
+
+
 def _assert_template_version_mutable(version: DocTemplateVersion) -> None:
     from fastapi import HTTPException
     if version.status == "published":
@@ -99,28 +107,47 @@ async def create_template_version(
         .where(DocTemplateVersion.template_id == template.id)
     )
     last = result.scalar_one_or_none() or 0
+    base_hash = await _latest_template_content_hash(db, template.id)
     v = DocTemplateVersion(
         tenant_id=tenant_id,
         template_id=template.id,
         version_no=last + 1,
-        content=data.content,
+        content_hash=await content_store.put(db, tenant_id, data.content, base_hash),
         change_summary=data.change_summary,
         status="draft",
     )
     db.add(v)
     await db.flush()
     await db.refresh(v)
+    v.content = data.content
     return v
 
 
+async def _latest_template_content_hash(db: AsyncSession, template_id: uuid.UUID) -> str | None:
+    """Delta base for the next version: the newest version's text."""
+    result = await db.execute(
+        select(DocTemplateVersion.content_hash)
+        .where(DocTemplateVersion.template_id == template_id, DocTemplateVersion.content_hash.is_not(None))
+        .order_by(DocTemplateVersion.version_no.desc())
+        .limit(1)
+    )
+    return result.scalar_one_or_none()
+
+
 async def update_template_version(
     db: AsyncSession, version: DocTemplateVersion, data: DocTemplateVersionUpdate
 ) -> DocTemplateVersion:
     _assert_template_version_mutable(version)
-    for field, value in data.model_dump(exclude_none=True).items():
+    changes = data.model_dump(exclude_none=True)
+    if "content" in changes:
+        version.content_hash = await content_store.put(
+            db, version.tenant_id, changes.pop("content"), version.content_hash
+        )
+    for field, value in changes.items():
         setattr(version, field, value)
     await db.flush()
     await db.refresh(version)
+    await content_store.attach(db, [version])
     return version
 
 
@@ -165,9 +192,10 @@ async def publish_template_version(
     await audit(db, tenant_id=tenant_id, user_id=published_by,
         action="doc_template.published", resource_type="doc_template_version",
         resource_id=str(version.id),
-        detail={"version_no": version.version_no},
+        detail={"version_no": version.version_no, "content_hash": version.content_hash},
     )
     await db.refresh(version)
+    await content_store.attach(db, [version])
     return version
 
 
@@ -180,15 +208,6 @@ async def generate_doc_no(
     Format: {PREFIX}-{YY}-{####}
     HMS-26-0001, MILJO-26-0001, KVAL-26-0001, DOC-26-0001
     """
-    year = datetime.now(timezone.utc).year
-    yy = str(year)[-2:]
-    prefix_map = {
-        "HMS": "HMS",
-        "MILJO": "MILJO",
-        "KVALITET": "KVAL",
-        "ANNET": "DOC",
-    }
-    prefix = prefix_map.get(category, "DOC")
     result = await db.execute(
         select(func.count(ProjectDoc.id)).where(
             ProjectDoc.tenant_id == tenant_id,
@@ -197,7 +216,27 @@ async def generate_doc_no(
         )
     )
     count = result.scalar_one() or 0
-    return f"{prefix}-{yy}-{count + 1:04d}"
+    return format_doc_no(category, count + 1)
+
+
+DOC_NO_PREFIXES = {
+    "HMS": "HMS",
+    "MILJO": "MILJO",
+    "KVALITET": "KVAL",
+    "ANNET": "DOC",
+}
+
+
+def format_doc_no(category: str, seq: int) -> str:
+    yy = str(datetime.now(timezone.utc).year)[-2:]
+    return f"{DOC_NO_PREFIXES.get(category, 'DOC')}-{yy}-{seq:04d}"
+
+
+async def _lock_project_doc_numbering(db: AsyncSession, tenant_id: uuid.UUID) -> None:
+    """Single and bulk creation number from the same counts – serialise them."""
+    await db.execute(
+        select(func.pg_advisory_xact_lock(func.hashtext(f"project_doc_no:{tenant_id}")))
+    )
 
 
 async def create_project_doc(
@@ -209,28 +248,38 @@ async def create_project_doc(
 ) -> tuple[ProjectDoc, ProjectDocVersion]:
     template_id = None
     source_template_version_id = None
-    content = data.content
+    tv = None
 
     # Freeze copy from library template version
     if data.template_version_id:
         result = await db.execute(
             select(DocTemplateVersion).where(
                 DocTemplateVersion.id == data.template_version_id,
+                DocTemplateVersion.tenant_id == tenant_id,  # blobs are per tenant
                 DocTemplateVersion.is_deleted == False,
             )
         )
         tv = result.scalar_one_or_none()
-        if tv:
-            if tv.status != "published":
-                from fastapi import HTTPException
-                raise HTTPException(400, "Can only import published template versions")
-            template_id = tv.template_id
-            source_template_version_id = tv.id
-            # Freeze copy: use template content if no override provided
-            if content is None:
-                content = tv.content
-
+        from fastapi import HTTPException
+        if tv is None:
+            raise HTTPException(404, "Template version not found")
+        if tv.status != "published":
+            raise HTTPException(400, "Can only import published template versions")
+        template_id = tv.template_id
+        source_template_version_id = tv.id
+
+    await _lock_project_doc_numbering(db, tenant_id)
     doc_no = await generate_doc_no(db, tenant_id, project_id, data.category)
+    if data.content is not None:
+        content_hash = await content_store.put(db, tenant_id, data.content)
+    elif tv is not None and tv.content_hash is not None:
+        # Freeze copy: the template rendered for this project
+        content_hash = (await _render_template_for_projects(
+            db, tenant_id, tv, {project_id: templating.doc_values(doc_no, data.title, data.category)},
+        ))[project_id]
+    else:
+        content_hash = None
+
     doc = ProjectDoc(
         tenant_id=tenant_id,
         project_id=project_id,
@@ -250,7 +299,7 @@ async def create_project_doc(
         tenant_id=tenant_id,
         doc_id=doc.id,
         version_no=1,
-        content=content,
+        content_hash=content_hash,
         status="draft",
         requires_ack=False,
     )
@@ -258,9 +307,157 @@ async def create_project_doc(
     await db.flush()
     await db.refresh(doc)
     await db.refresh(version)
+    await content_store.attach(db, [version])
     return doc, version
 
 
+async def _render_template_for_projects(
+    db: AsyncSession,
+    tenant_id: uuid.UUID,
+    tv: DocTemplateVersion,
+    docs: dict[uuid.UUID, dict[str, str]],
+) -> dict[uuid.UUID, str]:
+    """
+    Render a published template version for each project (docs: project id →
+    doc.* values) and store the texts as deltas against the template.
+    Returns project id → content hash. A template without placeholders is
+    shared as is.
+    """
+    text = (await content_store.load(db, tenant_id, [tv.content_hash]))[tv.content_hash]
+    template = templating.compiled(tv.content_hash, text)
+    if template.is_static:
+        return {project_id: tv.content_hash for project_id in docs}
+    project_ids = list(docs)
+    values = await templating.project_values(db, tenant_id, project_ids, template)
+    texts = [template.render({**values.get(pid, {}), **docs[pid]}) for pid in project_ids]
+    digests = await content_store.put_many(db, tenant_id, texts, tv.content_hash)
+    return dict(zip(project_ids, digests))
+
+
+async def rollout_template_to_projects(
+    db: AsyncSession,
+    tenant_id: uuid.UUID,
+    data: DocTemplateRolloutRequest,
+    created_by: uuid.UUID,
+) -> dict:
+    """
+    Create a project doc from one published template version in many
+    projects (data.project_ids, or every active project). The template is
+    compiled once and rendered per project in-process; docs, versions and
+    texts are written with one statement each.
+    """
+    from fastapi import HTTPException
+    from app.core.projects.models import Project
+    from app.core.audit.service import audit
+
+    result = await db.execute(
+        select(DocTemplateVersion, DocTemplate)
+        .join(DocTemplate, DocTemplate.id == DocTemplateVersion.template_id)
+        .where(
+            DocTemplateVersion.id == data.template_version_id,
+            DocTemplateVersion.tenant_id == tenant_id,  # blobs are per tenant
+            DocTemplateVersion.is_deleted == False,
+        )
+    )
+    row = result.one_or_none()
+    if row is None:
+        raise HTTPException(404, "Template version not found")
+    tv, template = row
+    if tv.status != "published":
+        raise HTTPException(400, "Can only import published template versions")
+
+    await _lock_project_doc_numbering(db, tenant_id)
+    already = (
+        select(ProjectDoc.id).where(
+            ProjectDoc.tenant_id == tenant_id,
+            ProjectDoc.project_id == Project.id,
+            ProjectDoc.source_template_version_id == tv.id,
+            ProjectDoc.is_deleted == False,
+        ).exists()
+    )
+    targets = select(Project.id, already).where(
+        Project.tenant_id == tenant_id,
+        Project.is_deleted == False,
+    )
+    if data.project_ids is None:
+        targets = targets.where(Project.status == "active")
+    else:
+        targets = targets.where(Project.id.in_(data.project_ids))
+    rows = (await db.execute(targets)).all()
+
+    skipped = [pid for pid, has in rows if has and data.skip_existing]
+    chosen = [pid for pid, has in rows if not (has and data.skip_existing)]
+    found = {pid for pid, _ in rows}
+    missing = [pid for pid in dict.fromkeys(data.project_ids or []) if pid not in found]
+
+    created: list[dict] = []
+    if chosen:
+        title = data.title or template.title
+        category = template.category
+        result = await db.execute(
+            select(ProjectDoc.project_id, func.count(ProjectDoc.id))
+            .where(
+                ProjectDoc.tenant_id == tenant_id,
+                ProjectDoc.project_id.in_(chosen),
+                ProjectDoc.category == category,
+            )
+            .group_by(ProjectDoc.project_id)
+        )
+        counts = dict(result.all())
+        doc_nos = {pid: format_doc_no(category, counts.get(pid, 0) + 1) for pid in chosen}
+        if tv.content_hash is None:
+            hashes = dict.fromkeys(chosen)
+        else:
+            hashes = await _render_template_for_projects(db, tenant_id, tv, {
+                pid: templating.doc_values(doc_nos[pid], title, category) for pid in chosen
+            })
+
+        for pid in chosen:
+            created.append({
+                "project_id": pid, "doc_id": uuid.uuid4(), "doc_version_id": uuid.uuid4(),
+                "doc_no": doc_nos[pid],
+            })
+        await db.execute(insert(ProjectDoc), [
+            {
+                "id": c["doc_id"], "tenant_id": tenant_id, "project_id": c["project_id"],
+                "template_id": template.id, "source_template_version_id": tv.id,
+                "title": title, "doc_no": c["doc_no"], "doc_type": template.doc_type,
+                "category": category, "status": "draft", "owner_user_id": created_by,
+            }
+            for c in created
+        ])
+        await db.execute(insert(ProjectDocVersion), [
+            {
+                "id": c["doc_version_id"], "tenant_id": tenant_id, "doc_id": c["doc_id"],
+                "version_no": 1, "content_hash": hashes[c["project_id"]],
+                "status": "draft", "requires_ack": False,
+            }
+            for c in created
+        ])
+
+    await audit(
+        db, tenant_id=tenant_id, user_id=created_by,
+        action="doc_template.rolled_out_to_projects",
+        resource_type="doc_template_version",
+        resource_id=str(tv.id),
+        detail={
+            "created_count": len(created),
+            "created": [
+                {"project_id": str(c["project_id"]), "doc_id": str(c["doc_id"]), "doc_no": c["doc_no"]}
+                for c in created
+            ],
+            "skipped_project_ids": [str(pid) for pid in skipped],
+            "missing_project_ids": [str(pid) for pid in missing],
+        },
+    )
+    return {
+        "source_version_id": tv.id,
+        "created": created,
+        "skipped_project_ids": skipped,
+        "missing_project_ids": missing,
+    }
+
+
 async def get_project_doc(db: AsyncSession, doc_id: uuid.UUID) -> ProjectDoc | None:
     result = await db.execute(
         select(ProjectDoc).where(ProjectDoc.id == doc_id, ProjectDoc.is_deleted == False)
@@ -297,11 +494,19 @@ async def create_doc_version(
     )
     last = result.scalar_one_or_none() or 0
 
+    result = await db.execute(
+        select(ProjectDocVersion.content_hash)
+        .where(ProjectDocVersion.doc_id == doc.id, ProjectDocVersion.content_hash.is_not(None))
+        .order_by(ProjectDocVersion.version_no.desc())
+        .limit(1)
+    )
+    base_hash = result.scalar_one_or_none()
+
     v = ProjectDocVersion(
         tenant_id=tenant_id,
         doc_id=doc.id,
         version_no=last + 1,
-        content=data.content,
+        content_hash=await content_store.put(db, tenant_id, data.content, base_hash),
         change_summary=data.change_summary,
         status="draft",
         requires_ack=data.requires_ack,
@@ -309,6 +514,7 @@ async def create_doc_version(
     db.add(v)
     await db.flush()
     await db.refresh(v)
+    v.content = data.content
     return v
 
 
@@ -316,10 +522,16 @@ async def update_doc_version(
     db: AsyncSession, version: ProjectDocVersion, data: ProjectDocVersionUpdate
 ) -> ProjectDocVersion:
     _assert_doc_version_mutable(version)
-    for field, value in data.model_dump(exclude_none=True).items():
+    changes = data.model_dump(exclude_none=True)
+    if "content" in changes:
+        version.content_hash = await content_store.put(
+            db, version.tenant_id, changes.pop("content"), version.content_hash
+        )
+    for field, value in changes.items():
         setattr(version, field, value)
     await db.flush()
     await db.refresh(version)
+    await content_store.attach(db, [version])
     return version
 
 
@@ -333,14 +545,21 @@ async def get_doc_version(db: AsyncSession, version_id: uuid.UUID) -> ProjectDoc
     return result.scalar_one_or_none()
 
 
-async def list_doc_versions(db: AsyncSession, doc_id: uuid.UUID) -> list[ProjectDocVersion]:
-    result = await db.execute(
-        select(ProjectDocVersion).where(
-            ProjectDocVersion.doc_id == doc_id,
-            ProjectDocVersion.is_deleted == False,
-        ).order_by(ProjectDocVersion.version_no.desc())
-    )
-    return list(result.scalars().all())
+async def list_doc_versions(
+    db: AsyncSession, doc_id: uuid.UUID, fields: list[str] | None = None
+) -> list[ProjectDocVersion]:
+    """fields: load only these columns (see app.db.fieldsets)."""
+    stmt = select(ProjectDocVersion).where(
+        ProjectDocVersion.doc_id == doc_id,
+        ProjectDocVersion.is_deleted == False,
+    ).order_by(ProjectDocVersion.version_no.desc())
+    if fields is not None:
+        stmt = stmt.options(load_only_fields(ProjectDocVersion, [*fields, "tenant_id", "content_hash"]))
+    result = await db.execute(stmt)
+    versions = list(result.scalars().all())
+    if fields is None or "content" in fields:
+        await content_store.attach(db, versions)
+    return versions
 
 
 async def approve_doc_version(
@@ -364,6 +583,7 @@ async def approve_doc_version(
         detail={"version_no": version.version_no},
     )
     await db.refresh(version)
+    await content_store.attach(db, [version])
     return version
 
 
@@ -402,30 +622,131 @@ async def issue_doc_version(
     if doc:
         doc.status = "issued"
 
+    await db.flush()
+
     # Auto-create ack requests
-    if version.requires_ack and data.ack_user_ids:
-        for user_id in data.ack_user_ids:
-            db.add(AckRequest(
-                tenant_id=tenant_id,
-                doc_version_id=version.id,
-                project_id=doc.project_id if doc else version.doc_id,
-                user_id=user_id,
-                status="pending",
-            ))
+    ack_count = 0
+    if version.requires_ack and doc and not data.is_empty():
+        ack_count = await fan_out_ack_requests(db, tenant_id, version, doc.project_id, data)
 
-    await db.flush()
     from app.core.audit.service import audit
     await audit(db, tenant_id=tenant_id, user_id=issued_by,
         action="project_doc.issued", resource_type="project_doc_version",
         resource_id=str(version.id),
-        detail={"version_no": version.version_no, "ack_count": len(data.ack_user_ids)},
+        detail={"version_no": version.version_no, "ack_count": ack_count},
     )
     await db.refresh(version)
+    await content_store.attach(db, [version])
     return version
 
 
 # ── Acknowledgements ──────────────────────────────────────────────────────────
 
+def _audience_user_ids(tenant_id: uuid.UUID, project_id: uuid.UUID, audience: AckAudience):
+    """Union of the audience parts as one SELECT of user ids."""
+    from app.core.rbac.models import UserRoleAssignment
+    from app.core.timesheets.models import Timesheet
+
+    parts = []
+    if audience.ack_all_users:
+        parts.append(select(User.id).where(User.tenant_id == tenant_id))
+    if audience.ack_user_ids:
+        ids = list(dict.fromkeys(audience.ack_user_ids))
+        parts.append(select(func.unnest(literal(ids, ARRAY(UUID(as_uuid=True))))))
+    if audience.ack_role_ids:
+        parts.append(
+            select(UserRoleAssignment.user_id).where(
+                UserRoleAssignment.tenant_id == tenant_id,
+                UserRoleAssignment.role_id.in_(audience.ack_role_ids),
+            )
+        )
+    if audience.ack_project_workers:
+        parts.append(
+            select(Timesheet.user_id).where(
+                Timesheet.tenant_id == tenant_id,
+                Timesheet.project_id == project_id,
+                Timesheet.is_deleted == False,
+            )
+        )
+    return union(*parts) if len(parts) > 1 else parts[0]
+
+
+async def fan_out_ack_requests(
+    db: AsyncSession,
+    tenant_id: uuid.UUID,
+    version: ProjectDocVersion,
+    project_id: uuid.UUID,
+    audience: AckAudience,
+) -> int:
+    """
+    Create pending ack requests for every active user in the audience with one
+    INSERT ... SELECT. Users already asked are skipped by the unique
+    (doc_version_id, user_id) index, so re-running is idempotent.
+    Returns the number of requests created.
+    """
+    audience_ids = _audience_user_ids(tenant_id, project_id, audience).subquery()
+    now = func.now()
+    stmt = (
+        pg_insert(AckRequest)
+        .from_select(
+            ["id", "tenant_id", "doc_version_id", "project_id", "user_id", "status", "created_at", "updated_at"],
+            select(
+                func.gen_random_uuid(),
+                User.tenant_id,
+                literal(version.id, UUID(as_uuid=True)),
+                literal(project_id, UUID(as_uuid=True)),
+                User.id,
+                literal("pending"),
+                now, now,
+            ).where(
+                User.id.in_(select(audience_ids.c[0])),
+                User.tenant_id == tenant_id,
+                User.is_deleted == False,
+                User.status == "active",
+            ),
+        )
+        .on_conflict_do_nothing(index_elements=["doc_version_id", "user_id"])
+        .returning(AckRequest.id)
+    )
+    result = await db.execute(stmt)
+    created = len(result.all())
+    if created:
+        await db.execute(
+            update(ProjectDocVersion)
+            .where(ProjectDocVersion.id == version.id)
+            .values(ack_pending_count=ProjectDocVersion.ack_pending_count + created)
+            .execution_options(synchronize_session=False)
+        )
+        await db.refresh(version)
+    return created
+
+
+async def request_acks(
+    db: AsyncSession,
+    tenant_id: uuid.UUID,
+    version: ProjectDocVersion,
+    audience: AckAudience,
+    requested_by: uuid.UUID,
+) -> int:
+    from fastapi import HTTPException
+    if version.status != "issued":
+        raise HTTPException(400, "Acknowledgements can only be requested for an issued version")
+    if not version.requires_ack:
+        raise HTTPException(400, "Version does not require acknowledgement")
+    if audience.is_empty():
+        raise HTTPException(422, "Audience is empty")
+    result = await db.execute(select(ProjectDoc.project_id).where(ProjectDoc.id == version.doc_id))
+    project_id = result.scalar_one()
+    created = await fan_out_ack_requests(db, tenant_id, version, project_id, audience)
+    from app.core.audit.service import audit
+    await audit(db, tenant_id=tenant_id, user_id=requested_by,
+        action="project_doc.ack_requested", resource_type="project_doc_version",
+        resource_id=str(version.id),
+        detail={"ack_count": created},
+    )
+    return created
+
+
 async def acknowledge(
     db: AsyncSession,
     tenant_id: uuid.UUID,
@@ -445,10 +766,28 @@ async def acknowledge(
         raise HTTPException(404, "Ack request not found")
     if req.user_id != user_id:
         raise HTTPException(403, "You can only acknowledge your own requests")
-    if req.status == "acknowledged":
-        raise HTTPException(400, "Already acknowledged")
 
+    # Conditional flip so a double submit cannot move the counters twice
+    result = await db.execute(
+        update(AckRequest)
+        .where(AckRequest.id == ack_request_id, AckRequest.status == "pending")
+        .values(status="acknowledged", updated_at=func.now())
+        .returning(AckRequest.id)
+        .execution_options(synchronize_session=False)
+    )
+    if result.scalar_one_or_none() is None:
+        raise HTTPException(400, "Already acknowledged")
+    await db.execute(
+        update(ProjectDocVersion)
+        .where(ProjectDocVersion.id == req.doc_version_id)
+        .values(
+            ack_pending_count=ProjectDocVersion.ack_pending_count - 1,
+            ack_acknowledged_count=ProjectDocVersion.ack_acknowledged_count + 1,
+        )
+        .execution_options(synchronize_session=False)
+    )
     req.status = "acknowledged"
+
     response = AckResponse(
         tenant_id=tenant_id,
         ack_request_id=ack_request_id,
@@ -468,20 +807,42 @@ async def get_ack_report(
     doc_version_id: uuid.UUID,
 ) -> list[dict]:
     result = await db.execute(
-        select(AckRequest).where(
+        select(AckRequest.user_id, AckRequest.status, AckResponse.acknowledged_at)
+        .outerjoin(AckResponse, AckResponse.ack_request_id == AckRequest.id)
+        .where(
             AckRequest.doc_version_id == doc_version_id,
             AckRequest.tenant_id == tenant_id,
         )
+        .order_by(AckRequest.status.desc(), AckResponse.acknowledged_at)
     )
-    rows = []
-    for req in result.scalars().all():
-        resp_result = await db.execute(
-            select(AckResponse).where(AckResponse.ack_request_id == req.id)
+    return [dict(r._mapping) for r in result.all()]
+
+
+async def get_ack_summary(
+    db: AsyncSession,
+    tenant_id: uuid.UUID,
+    doc_version_id: uuid.UUID,
+) -> dict | None:
+    """Completion from the counters on the version – no ack_requests scan."""
+    result = await db.execute(
+        select(ProjectDocVersion.ack_pending_count, ProjectDocVersion.ack_acknowledged_count).where(
+            ProjectDocVersion.id == doc_version_id,
+            ProjectDocVersion.tenant_id == tenant_id,
+            ProjectDocVersion.is_deleted == False,
         )
-        resp = resp_result.scalar_one_or_none()
-        rows.append({
-            "user_id": req.user_id,
-            "status": req.status,
-            "acknowledged_at": resp.acknowledged_at if resp else None,
-        })
-    return rows
+    )
+    row = result.one_or_none()
+    if row is None:
+        return None
+    return ack_summary(doc_version_id, row.ack_pending_count, row.ack_acknowledged_count)
+
+
+def ack_summary(doc_version_id: uuid.UUID, pending: int, acknowledged: int) -> dict:
+    requested = pending + acknowledged
+    return {
+        "doc_version_id": doc_version_id,
+        "requested": requested,
+        "acknowledged": acknowledged,
+        "pending": pending,
+        "completion_rate": round(acknowledged / requested, 4) if requested else 0.0,
+    }
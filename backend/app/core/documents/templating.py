@@ -0,0 +1,147 @@
+"""
+Placeholders in library document templates.
+
+The text of a template version may contain {{ key }} placeholders. They are
+filled in when the template is copied into a project:
+
+  {{ project.no }}  {{ project.name }}  {{ project.description }}
+  {{ company.name }}
+  {{ doc.no }}  {{ doc.title }}  {{ doc.category }}
+  {{ date.today }}        dd.mm.yyyy in local time (settings.LOCAL_TIMEZONE)
+  {{ role.<role> }}       names of the users holding that role, e.g.
+                          {{ role.hms_leder }} for the role "HMS-leder"
+
+Unknown keys and keys without a value are left as written, so they stand
+out in the draft.
+
+A template is compiled once into literal and key parts, then cached by its
+content hash. Published versions never change and a hash always names the
+same text, so cache entries never need invalidating. Rendering is a single
+join over the parts.
+"""
+import re
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from threading import Lock
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.settings import local_tz
+
+PLACEHOLDER = re.compile(r"\{\{\s*([A-Za-z0-9_.\-]+)\s*\}\}")
+COMPILED_CACHE_SIZE = 512
+
+
+def role_key(name: str) -> str:
+    """Role name → placeholder key: "HMS-leder" → "role.hms_leder"."""
+    return "role." + re.sub(r"[^0-9a-zæøå]+", "_", name.lower()).strip("_")
+
+
+def _normalize(key: str) -> str:
+    if key.startswith("role."):
+        return role_key(key[5:])
+    return key
+
+
+@dataclass(frozen=True)
+class CompiledTemplate:
+    literals: tuple[str, ...]      # len(keys) + 1 text pieces around the placeholders
+    keys: tuple[str, ...]
+    raw: tuple[str, ...]           # placeholders as written, used when a key has no value
+
+    @property
+    def is_static(self) -> bool:
+        return not self.keys
+
+    def render(self, values: dict[str, str]) -> str:
+        if not self.keys:
+            return self.literals[0]
+        out = [self.literals[0]]
+        for i, key in enumerate(self.keys):
+            value = values.get(key)
+            out.append(self.raw[i] if value is None or value == "" else value)
+            out.append(self.literals[i + 1])
+        return "".join(out)
+
+
+def compile_template(text: str) -> CompiledTemplate:
+    literals, keys, raw = [], [], []
+    pos = 0
+    for m in PLACEHOLDER.finditer(text):
+        literals.append(text[pos:m.start()])
+        keys.append(_normalize(m.group(1)))
+        raw.append(m.group(0))
+        pos = m.end()
+    literals.append(text[pos:])
+    return CompiledTemplate(tuple(literals), tuple(keys), tuple(raw))
+
+
+_compiled: OrderedDict[str, CompiledTemplate] = OrderedDict()
+_compiled_lock = Lock()
+
+
+def compiled(content_hash: str, text: str) -> CompiledTemplate:
+    """Compiled form of a template text, cached by its content hash."""
+    with _compiled_lock:
+        template = _compiled.get(content_hash)
+        if template is not None:
+            _compiled.move_to_end(content_hash)
+            return template
+    template = compile_template(text)
+    with _compiled_lock:
+        _compiled[content_hash] = template
+        while len(_compiled) > COMPILED_CACHE_SIZE:
+            _compiled.popitem(last=False)
+    return template
+
+
+def doc_values(doc_no: str, title: str, category: str) -> dict[str, str]:
+    return {"doc.no": doc_no, "doc.title": title, "doc.category": category}
+
+
+async def project_values(
+    db: AsyncSession,
+    tenant_id: uuid.UUID,
+    project_ids: list[uuid.UUID],
+    template: CompiledTemplate,
+) -> dict[uuid.UUID, dict[str, str]]:
+    """Placeholder values per project; at most three queries for any number of projects."""
+    from app.core.projects.models import Project
+    from app.core.rbac.models import Role, User, UserRoleAssignment
+    from app.core.tenants.models import Tenant
+
+    shared = {"date.today": datetime.now(local_tz()).strftime("%d.%m.%Y")}
+    keys = set(template.keys)
+    if "company.name" in keys:
+        shared["company.name"] = (await db.execute(
+            select(Tenant.name).where(Tenant.id == tenant_id)
+        )).scalar_one_or_none() or ""
+    if any(k.startswith("role.") for k in keys):
+        result = await db.execute(
+            select(Role.name, User.full_name, User.email)
+            .join(UserRoleAssignment, UserRoleAssignment.role_id == Role.id)
+            .join(User, User.id == UserRoleAssignment.user_id)
+            .where(
+                Role.tenant_id == tenant_id,
+                Role.is_deleted == False,
+                User.is_deleted == False,
+                User.status == "active",
+            )
+            .order_by(Role.name, User.full_name, User.email)
+        )
+        holders: dict[str, list[str]] = {}
+        for role_name, full_name, email in result.all():
+            holders.setdefault(role_key(role_name), []).append(full_name or email)
+        shared.update({key: ", ".join(names) for key, names in holders.items()})
+
+    result = await db.execute(
+        select(Project.id, Project.project_no, Project.name, Project.description)
+        .where(Project.tenant_id == tenant_id, Project.id.in_(project_ids))
+    )
+    return {
+        pid: {**shared, "project.no": no, "project.name": name, "project.description": description or ""}
+        for pid, no, name, description in result.all()
+    }
@@ -0,0 +1,122 @@
+"""
+The current drawing set of a project as one ZIP download.
+
+Members are the active revisions, named <discipline>/<drawing_no> rev
+<revision><ext>, streamed from storage one after another (see
+app.core.files.archive). manifest.csv comes last, so it can list the size
+and SHA-256 of every file as it was written, and drawings whose bytes are
+missing from storage. Only the tenant's own content keys are read (the
+exact-match check in app.core.files.storage.tenant_owns, shared with the
+download route); any other path, "../" included, counts as missing.
+
+The drawing rows are read before the response starts; the body itself only
+touches storage, since request-scoped sessions are closed before a
+StreamingResponse body is sent.
+"""
+import csv
+import io
+import re
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import AsyncIterator
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.drawings.models import Drawing
+from app.core.files import storage
+from app.core.files.archive import ZipStream
+from app.core.files.models import File
+from app.settings import local_tz
+
+MANIFEST_NAME = "manifest.csv"
+MANIFEST_COLUMNS = [
+    "drawing_no", "revision", "title", "discipline", "registered_at",
+    "path", "original_filename", "size_bytes", "sha256", "status",
+]
+_UNSAFE = re.compile(r'[\x00-\x1f/\\:*?"<>|]+')
+
+
+@dataclass(frozen=True)
+class SetMember:
+    drawing_no: str
+    revision: str
+    title: str
+    discipline: str
+    registered_at: datetime
+    filename: str
+    storage_path: str | None
+    size_bytes: int | None
+
+
+async def current_set(
+    db: AsyncSession,
+    tenant_id: uuid.UUID,
+    project_id: uuid.UUID,
+    disciplines: list[str] | None = None,
+) -> list[SetMember]:
+    q = (
+        select(
+            Drawing.drawing_no, Drawing.revision, Drawing.title, Drawing.discipline,
+            Drawing.registered_at, File.filename, File.storage_path, File.size_bytes,
+        )
+        .join(File, File.id == Drawing.file_id)
+        .where(
+            Drawing.tenant_id == tenant_id,
+            Drawing.project_id == project_id,
+            Drawing.status == "active",
+            Drawing.is_deleted == False,
+        )
+        .order_by(Drawing.discipline, Drawing.drawing_no)
+    )
+    if disciplines:
+        q = q.where(Drawing.discipline.in_(disciplines))
+    result = await db.execute(q)
+    return [SetMember(*row) for row in result.all()]
+
+
+def _safe(part: str) -> str:
+    return _UNSAFE.sub("_", part).strip(" .") or "_"
+
+
+def member_names(members: list[SetMember]) -> list[str]:
+    """Archive paths, unique even where sanitising makes two names collide."""
+    names, seen = [], set()
+    for m in members:
+        stem, dot, ext = m.filename.rpartition(".")
+        suffix = "." + _safe(ext) if dot and stem else ""
+        base = f"{_safe(m.discipline)}/{_safe(m.drawing_no)} rev {_safe(m.revision)}"
+        name, n = base + suffix, 1
+        while name.lower() in seen:
+            n += 1
+            name = f"{base} ({n}){suffix}"
+        seen.add(name.lower())
+        names.append(name)
+    return names
+
+
+def _manifest(rows: list[list]) -> bytes:
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(MANIFEST_COLUMNS)
+    writer.writerows(rows)
+    return buf.getvalue().encode("utf-8-sig")  # BOM: Excel opens æøå correctly
+
+
+async def stream_set_zip(tenant_id: uuid.UUID, members: list[SetMember]) -> AsyncIterator[bytes]:
+    z = ZipStream()
+    rows = []
+    for m, name in zip(members, member_names(members)):
+        local = m.registered_at.astimezone(local_tz())
+        row = [m.drawing_no, m.revision, m.title, m.discipline, local.isoformat(timespec="seconds"), name, m.filename]
+        if not storage.tenant_owns(tenant_id, m.storage_path) or not await storage.exists(m.storage_path):
+            rows.append(row[:5] + ["", m.filename, "", "", "missing"])
+            continue
+        async for out in z.add(name, storage.iter_bytes(m.storage_path), modified=local, size=m.size_bytes):
+            yield out
+        written = z.written[-1]
+        rows.append(row + [written.size_bytes, written.sha256, "included"])
+    now = datetime.now(timezone.utc).astimezone(local_tz())
+    yield z.add_bytes(MANIFEST_NAME, _manifest(rows), modified=now)
+    yield z.close()
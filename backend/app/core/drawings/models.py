@@ -4,6 +4,7 @@ from sqlalchemy import DateTime, String, Text, ForeignKey, UniqueConstraint, Boo
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 from app.db.base import Base, TimestampMixin, SoftDeleteMixin, TenantScopedMixin
+from app.db.search import search_index, search_vector_column, trigram_index
 
 
 class Drawing(Base, TimestampMixin, SoftDeleteMixin, TenantScopedMixin):
@@ -11,6 +12,8 @@ class Drawing(Base, TimestampMixin, SoftDeleteMixin, TenantScopedMixin):
     Project drawing register with revision control.
     status: received | active | superseded | void
     One active revision per drawing_no per project.
+    supersedes_drawing_id: the previous revision; the chain is the drawing's
+    revision history (service.revision_history).
     """
     __tablename__ = "drawings"
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -21,11 +24,15 @@ class Drawing(Base, TimestampMixin, SoftDeleteMixin, TenantScopedMixin):
     revision: Mapped[str] = mapped_column(String(50), nullable=False)
     status: Mapped[str] = mapped_column(String(50), nullable=False, default="active")
     file_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("files.id", ondelete="RESTRICT"), nullable=False)
-    supersedes_drawing_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), ForeignKey("drawings.id", ondelete="SET NULL"), nullable=True)
+    supersedes_drawing_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), ForeignKey("drawings.id", ondelete="SET NULL"), nullable=True, index=True)
     source_thread_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), ForeignKey("message_threads.id", ondelete="SET NULL"), nullable=True)
     source_message_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), ForeignKey("incoming_messages.id", ondelete="SET NULL"), nullable=True)
     registered_by: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="RESTRICT"), nullable=False)
     registered_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    search_vector = search_vector_column(("drawing_no", "A"), ("title", "A"), ("discipline", "C"))
     __table_args__ = (
         UniqueConstraint("tenant_id", "project_id", "drawing_no", "revision", name="uq_drawing_no_revision"),
+        search_index("drawings"),
+        trigram_index("drawings", "drawing_no"),
+        trigram_index("drawings", "discipline"),
     )
@@ -1,10 +1,12 @@
 import uuid
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.drawings import service
+from app.core.drawings import export, service
 from app.core.drawings.schemas import (
     DrawingCreate, DrawingRead, DrawingFromInboxRequest,
+    DrawingTransmittalCreate, DrawingTransmittalRead,
 )
 from app.dependencies import get_db, get_current_user, CurrentUser
 
@@ -23,6 +25,19 @@ async def register_drawing(
     )
 
 
+@router.post("/projects/{project_id}/drawings/transmittals", response_model=DrawingTransmittalRead, status_code=201)
+async def register_transmittal(
+    project_id: uuid.UUID,
+    data: DrawingTransmittalCreate,
+    db: AsyncSession = Depends(get_db),
+    current: CurrentUser = Depends(get_current_user),
+):
+    """Register a whole transmittal in one transaction; per-drawing conflicts are reported, not raised."""
+    return await service.register_transmittal(
+        db, current.tenant_id, project_id, data, current.user_id
+    )
+
+
 @router.get("/projects/{project_id}/drawings", response_model=list[DrawingRead])
 async def list_drawings(
     project_id: uuid.UUID,
@@ -42,6 +57,27 @@ async def list_drawings(
     )
 
 
+@router.get("/projects/{project_id}/drawings/current-set.zip")
+async def download_current_set(
+    project_id: uuid.UUID,
+    discipline: list[str] | None = Query(None),
+    db: AsyncSession = Depends(get_db),
+    current: CurrentUser = Depends(get_current_user),
+):
+    """All active revisions (optionally of some disciplines) as one streamed ZIP with manifest.csv."""
+    from app.core.projects.service import get_project
+    project = await get_project(db, project_id)
+    if not project:
+        raise HTTPException(404, "Project not found")
+    members = await export.current_set(db, current.tenant_id, project_id, discipline)
+    filename = f"{project.project_no}-current-set.zip".replace('"', "")
+    return StreamingResponse(
+        export.stream_set_zip(current.tenant_id, members),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
 @router.get("/projects/{project_id}/drawings/{drawing_id}", response_model=DrawingRead)
 async def get_drawing(
     project_id: uuid.UUID,
@@ -55,6 +91,20 @@ async def get_drawing(
     return drawing
 
 
+@router.get("/projects/{project_id}/drawings/{drawing_id}/revisions", response_model=list[DrawingRead])
+async def list_revisions(
+    project_id: uuid.UUID,
+    drawing_id: uuid.UUID,
+    db: AsyncSession = Depends(get_db),
+    _: CurrentUser = Depends(get_current_user),
+):
+    """All revisions of the drawing (older and newer), newest first."""
+    drawing = await service.get_drawing(db, drawing_id)
+    if not drawing or drawing.project_id != project_id:
+        raise HTTPException(404, "Drawing not found")
+    return await service.revision_history(db, drawing_id)
+
+
 @router.post("/projects/{project_id}/drawings/from-inbox", response_model=DrawingRead, status_code=201)
 async def register_from_inbox(
     project_id: uuid.UUID,
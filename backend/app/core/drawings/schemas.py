@@ -42,3 +42,27 @@ class DrawingFromInboxRequest(BaseModel):
     discipline: str = Field(..., max_length=100)
     revision: str = Field(..., max_length=50)
     close_thread_on_register: bool = False
+
+
+# ── Transmittals ──────────────────────────────────────────────────────────────
+
+MAX_TRANSMITTAL_DRAWINGS = 1000
+
+
+class DrawingTransmittalCreate(BaseModel):
+    """A consultant's set of drawings, registered together in one transaction."""
+    transmittal_no: str | None = Field(None, max_length=100)
+    drawings: list[DrawingCreate] = Field(..., min_length=1, max_length=MAX_TRANSMITTAL_DRAWINGS)
+
+
+class DrawingTransmittalConflict(BaseModel):
+    drawing_no: str
+    revision: str
+    reason: str
+
+
+class DrawingTransmittalRead(BaseModel):
+    transmittal_no: str | None
+    registered: list[DrawingRead]
+    superseded_drawing_ids: list[uuid.UUID]
+    conflicts: list[DrawingTransmittalConflict]
@@ -1,10 +1,12 @@
 import uuid
+from collections import Counter
 from datetime import datetime, timezone
-from sqlalchemy import select
+from sqlalchemy import func, insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.drawings.models import Drawing
-from app.core.drawings.schemas import DrawingCreate, DrawingFromInboxRequest
+from app.core.drawings.schemas import DrawingCreate, DrawingFromInboxRequest, DrawingTransmittalCreate
+from app.db.search import contains
 
 IMMUTABLE_DRAWING_STATUSES = {"superseded", "void"}
 
@@ -20,6 +22,13 @@ def _assert_drawing_not_superseded(drawing: Drawing) -> None:
         )
 
 
+async def _lock_project_drawings(db: AsyncSession, tenant_id: uuid.UUID, project_id: uuid.UUID) -> None:
+    """Single and transmittal registration supersede the same active revisions – serialise them."""
+    await db.execute(
+        select(func.pg_advisory_xact_lock(func.hashtext(f"drawings:{tenant_id}:{project_id}")))
+    )
+
+
 async def register_drawing(
     db: AsyncSession,
     tenant_id: uuid.UUID,
@@ -35,6 +44,7 @@ async def register_drawing(
     supersedes_id = None
 
     if data.status == "active":
+        await _lock_project_drawings(db, tenant_id, project_id)
         # Find existing active drawing with same drawing_no
         result = await db.execute(
             select(Drawing).where(
@@ -148,6 +158,132 @@ async def register_from_inbox(
     return drawing
 
 
+async def register_transmittal(
+    db: AsyncSession,
+    tenant_id: uuid.UUID,
+    project_id: uuid.UUID,
+    data: DrawingTransmittalCreate,
+    registered_by: uuid.UUID,
+) -> dict:
+    """
+    Register a transmittal's drawings with the same rules as register_drawing,
+    in a fixed number of statements: one lookup of existing revisions, one of
+    files, one UPDATE superseding the active revisions, one multi-row INSERT
+    and one audit INSERT. Drawings that cannot be registered are reported
+    under conflicts; the rest are registered.
+    """
+    from app.core.audit.service import audit_many
+    from app.core.files.models import File
+
+    await _lock_project_drawings(db, tenant_id, project_id)
+    items = data.drawings
+
+    # Every revision of these drawing numbers (uq_drawing_no_revision includes deleted rows)
+    result = await db.execute(
+        select(Drawing.id, Drawing.drawing_no, Drawing.revision, Drawing.status, Drawing.is_deleted).where(
+            Drawing.tenant_id == tenant_id,
+            Drawing.project_id == project_id,
+            Drawing.drawing_no.in_({d.drawing_no for d in items}),
+        )
+    )
+    existing: set[tuple[str, str]] = set()
+    active: dict[str, tuple[uuid.UUID, str]] = {}
+    for drawing_id, drawing_no, revision, status, is_deleted in result.all():
+        existing.add((drawing_no, revision))
+        if status == "active" and not is_deleted:
+            active[drawing_no] = (drawing_id, revision)
+
+    result = await db.execute(
+        select(File.id).where(
+            File.tenant_id == tenant_id,
+            File.id.in_({d.file_id for d in items}),
+            File.is_deleted == False,
+        )
+    )
+    files = set(result.scalars().all())
+
+    active_in_set = Counter(no for no, _ in {(d.drawing_no, d.revision) for d in items if d.status == "active"})
+    seen: set[tuple[str, str]] = set()
+    accepted: list[DrawingCreate] = []
+    conflicts = []
+    for d in items:
+        key = (d.drawing_no, d.revision)
+        if key in seen:
+            reason = "Duplicate drawing_no and revision in transmittal"
+        elif key in existing:
+            reason = "Revision already registered"
+        elif d.status == "active" and active_in_set[d.drawing_no] > 1:
+            reason = "More than one active revision of this drawing in transmittal"
+        elif d.file_id not in files:
+            reason = "File not found"
+        else:
+            reason = None
+        seen.add(key)
+        if reason:
+            conflicts.append({"drawing_no": d.drawing_no, "revision": d.revision, "reason": reason})
+        else:
+            accepted.append(d)
+
+    now = datetime.now(timezone.utc)
+    rows, superseded, events = [], [], []
+    for d in accepted:
+        supersedes = active.get(d.drawing_no) if d.status == "active" else None
+        row = {
+            "id": uuid.uuid4(), "tenant_id": tenant_id, "project_id": project_id,
+            "drawing_no": d.drawing_no, "title": d.title, "discipline": d.discipline,
+            "revision": d.revision, "status": d.status, "file_id": d.file_id,
+            "supersedes_drawing_id": supersedes[0] if supersedes else None,
+            "registered_by": registered_by, "registered_at": now,
+        }
+        rows.append(row)
+        if supersedes:
+            superseded.append(supersedes[0])
+            events.append({
+                "action": "drawing.superseded", "resource_type": "drawing",
+                "resource_id": str(supersedes[0]),
+                "detail": {
+                    "drawing_no": d.drawing_no,
+                    "old_revision": supersedes[1],
+                    "new_revision": d.revision,
+                    "transmittal_no": data.transmittal_no,
+                },
+            })
+        events.append({
+            "action": "drawing.registered", "resource_type": "drawing",
+            "resource_id": str(row["id"]),
+            "detail": {
+                "drawing_no": d.drawing_no,
+                "revision": d.revision,
+                "discipline": d.discipline,
+                "status": d.status,
+                "supersedes_id": str(supersedes[0]) if supersedes else None,
+                "transmittal_no": data.transmittal_no,
+            },
+        })
+
+    registered: list[Drawing] = []
+    if superseded:
+        await db.execute(
+            update(Drawing).where(Drawing.id.in_(superseded)).values(status="superseded")
+        )
+    if rows:
+        await db.execute(insert(Drawing), rows)
+        await audit_many(db, tenant_id=tenant_id, user_id=registered_by, events=events)
+        result = await db.execute(
+            select(Drawing)
+            .where(Drawing.id.in_([r["id"] for r in rows]))
+            .order_by(Drawing.drawing_no, Drawing.revision)
+        )
+        registered = list(result.scalars().all())
+
+    return {
+        "transmittal_no": data.transmittal_no,
+        "registered": registered,
+        "superseded_drawing_ids": superseded,
+        "conflicts": conflicts,
+    }
+
+
 async def get_drawing(db: AsyncSession, drawing_id: uuid.UUID) -> Drawing | None:
     result = await db.execute(
         select(Drawing).where(
@@ -175,11 +311,41 @@ async def list_drawings(
     if only_active:
         q = q.where(Drawing.status == "active")
     if discipline:
-        q = q.where(Drawing.discipline.ilike(f"%{discipline}%"))
+        q = q.where(contains(Drawing.discipline, discipline))
     if drawing_no:
-        q = q.where(Drawing.drawing_no.ilike(f"%{drawing_no}%"))
+        q = q.where(contains(Drawing.drawing_no, drawing_no))
     if status:
         q = q.where(Drawing.status == status)
     q = q.order_by(Drawing.drawing_no, Drawing.registered_at.desc())
     result = await db.execute(q)
     return list(result.scalars().all())
+
+
+def revision_history_query(drawing_id: uuid.UUID):
+    """
+    Every revision in the supersedes chain of drawing_id, newest first: one
+    recursive CTE walks to older revisions (supersedes_drawing_id, primary
+    key lookups), another to newer ones (indexed supersedes_drawing_id).
+    UNION rather than UNION ALL, so a corrupt cyclic chain still terminates.
+    Deleted revisions are walked through but not returned.
+    """
+    D = Drawing
+    older = select(D.id, D.supersedes_drawing_id).where(D.id == drawing_id).cte("older", recursive=True)
+    older = older.union(
+        select(D.id, D.supersedes_drawing_id).join(older, D.id == older.c.supersedes_drawing_id)
+    )
+    newer = select(D.id).where(D.id == drawing_id).cte("newer", recursive=True)
+    newer = newer.union(select(D.id).join(newer, D.supersedes_drawing_id == newer.c.id))
+    return (
+        select(D)
+        .where(
+            D.id.in_(select(older.c.id).union(select(newer.c.id))),
+            D.is_deleted == False,
+        )
+        .order_by(D.registered_at.desc())
+    )
+
+
+async def revision_history(db: AsyncSession, drawing_id: uuid.UUID) -> list[Drawing]:
+    result = await db.execute(revision_history_query(drawing_id))
+    return list(result.scalars().all())
@@ -0,0 +1,108 @@
+"""
+ZIP archives streamed while they are built.
+
+zipfile writes to an unseekable sink, so every member gets a data descriptor
+after its bytes instead of sizes patched into its local header. Output is
+handed on after each chunk; memory stays at about one chunk per download and
+nothing is written to disk. ZIP64 is used where needed, so archives and
+members may exceed 4 GB.
+"""
+import hashlib
+import io
+import zipfile
+from dataclasses import dataclass
+from datetime import datetime
+from typing import AsyncIterable, AsyncIterator
+
+ZIP_EPOCH = datetime(1980, 1, 1)
+
+
+class _Sink(io.RawIOBase):
+    """Unseekable write target collecting output until it is drained."""
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+        self._pos = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        self._chunks.append(bytes(b))
+        self._pos += len(b)
+        return len(b)
+
+    def tell(self) -> int:
+        return self._pos
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+@dataclass(frozen=True)
+class WrittenMember:
+    name: str
+    size_bytes: int
+    sha256: str
+
+
+def _zip_info(name: str, modified: datetime, size: int | None, compress: bool) -> zipfile.ZipInfo:
+    modified = max(modified.replace(tzinfo=None), ZIP_EPOCH)
+    info = zipfile.ZipInfo(name, date_time=modified.timetuple()[:6])
+    info.compress_type = zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+    if size is not None:
+        info.file_size = size  # lets zipfile decide on ZIP64 up front
+    return info
+
+
+class ZipStream:
+    """
+    z = ZipStream()
+    async for out in z.add(name, chunks, modified=...): yield out
+    yield z.add_bytes("manifest.csv", data, modified=...)
+    yield z.close()
+
+    Members are stored uncompressed unless compress=True: drawings and
+    photos are compressed formats already.
+    """
+
+    def __init__(self) -> None:
+        self._sink = _Sink()
+        self._zip = zipfile.ZipFile(self._sink, "w", allowZip64=True)
+        self.written: list[WrittenMember] = []
+
+    async def add(
+        self,
+        name: str,
+        chunks: AsyncIterable[bytes],
+        *,
+        modified: datetime,
+        size: int | None = None,
+        compress: bool = False,
+    ) -> AsyncIterator[bytes]:
+        digest = hashlib.sha256()
+        total = 0
+        info = _zip_info(name, modified, size, compress)
+        with self._zip.open(info, "w", force_zip64=size is None) as dest:
+            async for chunk in chunks:
+                dest.write(chunk)
+                digest.update(chunk)
+                total += len(chunk)
+                if out := self._sink.drain():
+                    yield out
+        self.written.append(WrittenMember(name, total, digest.hexdigest()))
+        if out := self._sink.drain():
+            yield out
+
+    def add_bytes(self, name: str, data: bytes, *, modified: datetime, compress: bool = True) -> bytes:
+        info = _zip_info(name, modified, len(data), compress)
+        self._zip.writestr(info, data)
+        self.written.append(WrittenMember(name, len(data), hashlib.sha256(data).hexdigest()))
+        return self._sink.drain()
+
+    def close(self) -> bytes:
+        """Central directory; the last bytes of the archive."""
+        self._zip.close()
+        return self._sink.drain()
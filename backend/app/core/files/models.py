@@ -1,19 +1,25 @@
 import uuid
-from sqlalchemy import Integer, String, ForeignKey
+from sqlalchemy import BigInteger, Index, String, ForeignKey
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 from app.db.base import Base, TimestampMixin, SoftDeleteMixin, TenantScopedMixin
 
 
 class File(Base, TimestampMixin, SoftDeleteMixin, TenantScopedMixin):
-    """Stores file metadata. Actual bytes go to MinIO in Sprint 4+."""
+    """
+    File metadata. Uploaded bytes are content-addressed (see storage):
+    storage_path is the object key and sha256 its digest, shared by every
+    File with the same content in the tenant.
+    """
     __tablename__ = "files"
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     filename: Mapped[str] = mapped_column(String(500), nullable=False)
     content_type: Mapped[str | None] = mapped_column(String(100), nullable=True)
-    size_bytes: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    size_bytes: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
     storage_path: Mapped[str | None] = mapped_column(String(1000), nullable=True)
+    sha256: Mapped[str | None] = mapped_column(String(64), nullable=True)
     uploaded_by: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    __table_args__ = (Index("ix_files_tenant_sha256", "tenant_id", "sha256"),)
 
 
 class FileLink(Base, TimestampMixin, TenantScopedMixin):
@@ -0,0 +1,60 @@
+import uuid
+from urllib.parse import quote
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.files import service, storage
+from app.core.files.schemas import FileRead
+from app.dependencies import get_db, get_current_user, CurrentUser
+from app.http_cache import IMMUTABLE_CACHE_CONTROL, etag_matches, not_modified
+
+router = APIRouter(tags=["files"])
+
+
+@router.post("/files", response_model=FileRead, status_code=201)
+async def upload_file(
+    request: Request,
+    filename: str = Query(..., min_length=1, max_length=500),
+    db: AsyncSession = Depends(get_db),
+    current: CurrentUser = Depends(get_current_user),
+):
+    """
+    The request body is the file itself (not multipart), streamed to storage
+    as it arrives. Returns a File whose id can be used as file_id elsewhere.
+    """
+    return await service.upload_file(
+        db, current.tenant_id, filename, request.headers.get("content-type"),
+        request.stream(), current.user_id,
+    )
+
+
+@router.get("/files/{file_id}/content")
+async def download_file(
+    file_id: uuid.UUID,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current: CurrentUser = Depends(get_current_user),
+):
+    f = await service.get_file(db, file_id)
+    if (
+        not f
+        or not storage.tenant_owns(current.tenant_id, f.storage_path)
+        or not await storage.exists(f.storage_path)
+    ):
+        raise HTTPException(404, "File content not found")
+    headers = {"Content-Disposition": f"attachment; filename*=UTF-8''{quote(f.filename)}"}
+    if f.sha256:
+        # Content-addressed: the bytes behind this File never change
+        etag = f'"{f.sha256}"'
+        if etag_matches(request, etag):
+            return not_modified(etag, IMMUTABLE_CACHE_CONTROL)
+        headers.update({"ETag": etag, "Cache-Control": IMMUTABLE_CACHE_CONTROL})
+        if f.size_bytes is not None:
+            headers["Content-Length"] = str(f.size_bytes)
+    return StreamingResponse(
+        storage.iter_bytes(f.storage_path),
+        media_type=f.content_type or "application/octet-stream",
+        headers=headers,
+    )
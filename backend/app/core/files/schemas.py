@@ -9,10 +9,11 @@ class FileRead(BaseModel):
     content_type: str | None
     size_bytes: int | None
     storage_path: str | None
+    sha256: str | None
     created_at: datetime
 
 class FileCreate(BaseModel):
+    """File metadata only; storage_path is set by the upload (POST /files) alone."""
     filename: str
     content_type: str | None = None
     size_bytes: int | None = None
-    storage_path: str | None = None
@@ -1,6 +1,8 @@
 import uuid
+from typing import AsyncIterable
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.files import storage
 from app.core.files.models import File, FileLink
 from app.core.files.schemas import FileCreate
 
@@ -13,6 +15,42 @@ async def create_file(db: AsyncSession, tenant_id: uuid.UUID, data: FileCreate,
     return f
 
 
+async def upload_file(
+    db: AsyncSession,
+    tenant_id: uuid.UUID,
+    filename: str,
+    content_type: str | None,
+    chunks: AsyncIterable[bytes],
+    uploaded_by: uuid.UUID | None = None,
+) -> File:
+    """Stream bytes into storage (stored once per content) and record a File for them."""
+    from fastapi import HTTPException
+    from app.settings import get_settings
+
+    try:
+        stored = await storage.save_stream(tenant_id, chunks, get_settings().FILE_MAX_UPLOAD_BYTES)
+    except storage.FileTooLarge as e:
+        raise HTTPException(413, str(e))
+    f = File(
+        tenant_id=tenant_id,
+        filename=filename,
+        content_type=content_type,
+        size_bytes=stored.size_bytes,
+        storage_path=stored.key,
+        sha256=stored.sha256,
+        uploaded_by=uploaded_by,
+    )
+    db.add(f)
+    await db.flush()
+    await db.refresh(f)
+    return f
+
+
+async def get_file(db: AsyncSession, file_id: uuid.UUID) -> File | None:
+    result = await db.execute(select(File).where(File.id == file_id, File.is_deleted == False))
+    return result.scalar_one_or_none()
+
+
 async def link_file(db: AsyncSession, tenant_id: uuid.UUID, file_id: uuid.UUID, resource_type: str, resource_id: uuid.UUID) -> FileLink:
     link = FileLink(tenant_id=tenant_id, file_id=file_id, resource_type=resource_type, resource_id=resource_id)
     db.add(link)
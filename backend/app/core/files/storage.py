@@ -0,0 +1,260 @@
+"""
+File bytes.
+
+Uploaded files are content-addressed: the bytes are stored once per tenant
+under <tenant_id>/<sha256[:2]>/<sha256>, and every File row carrying the
+same content (an inbox attachment, a drawing, a document) points at that
+one object through File.storage_path. Objects are never rewritten, so they
+are never invalidated either.
+
+An upload is streamed to a spool file under FILE_STORAGE_ROOT/.spool while
+it is hashed and counted, chunk by chunk. Once the hash is known, the spool
+file is moved into place (local) or PUT (S3), unless the object is already
+stored, in which case the spool file is dropped.
+
+Backends (FILE_STORAGE_BACKEND):
+  local  files under FILE_STORAGE_ROOT
+  s3     any S3-compatible store (AWS, MinIO) at S3_ENDPOINT_URL/S3_BUCKET,
+         path-style requests signed with AWS Signature V4
+
+Only the tenant's own content keys are ever read (tenant_owns), matched
+exactly, so "<own>/../<other>/..." does not pass: storage_path used to be
+set by clients through FileCreate, so a row of one tenant could name another
+tenant's object. Migration 0027 clears storage_path on rows that are not a
+content key; such rows have no stored bytes.
+"""
+import asyncio
+import hashlib
+import hmac
+import os
+import re
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import AsyncIterable, AsyncIterator, Protocol
+from urllib.parse import quote, urlsplit
+
+import httpx
+
+from app.settings import get_settings
+
+CHUNK_SIZE = 1024 * 1024
+EMPTY_SHA256 = hashlib.sha256(b"").hexdigest()
+_CONTENT_KEY = re.compile(r"[0-9a-f-]{36}/[0-9a-f]{2}/(?P<sha256>[0-9a-f]{64})")
+
+
+class FileTooLarge(Exception):
+    pass
+
+
+def content_key(tenant_id: uuid.UUID, sha256: str) -> str:
+    return f"{tenant_id}/{sha256[:2]}/{sha256}"
+
+
+def tenant_owns(tenant_id: uuid.UUID, storage_path: str | None) -> bool:
+    """True only for an exact content key in the tenant's own prefix."""
+    m = _CONTENT_KEY.fullmatch(storage_path or "")
+    return m is not None and storage_path == content_key(tenant_id, m["sha256"])
+
+
+async def _iter_file(path: Path, chunk_size: int = CHUNK_SIZE) -> AsyncIterator[bytes]:
+    f = await asyncio.to_thread(path.open, "rb")
+    try:
+        while chunk := await asyncio.to_thread(f.read, chunk_size):
+            yield chunk
+    finally:
+        f.close()
+
+
+class StorageBackend(Protocol):
+    async def exists(self, key: str) -> bool: ...
+
+    async def put_file(self, key: str, path: Path, size: int, sha256: str) -> None:
+        """Store the spooled file at path under key; the spool file may be moved or left."""
+
+    def iter_bytes(self, key: str, chunk_size: int = CHUNK_SIZE) -> AsyncIterator[bytes]: ...
+
+
+# ── Local filesystem ──────────────────────────────────────────────────────────
+
+class LocalStorage:
+    def __init__(self, root: Path) -> None:
+        self.root = root.resolve()
+
+    def path(self, key: str) -> Path:
+        path = (self.root / key).resolve()
+        if not path.is_relative_to(self.root):
+            raise ValueError(f"storage key outside storage root: {key!r}")
+        return path
+
+    async def exists(self, key: str) -> bool:
+        return await asyncio.to_thread(self.path(key).is_file)
+
+    async def put_file(self, key: str, path: Path, size: int, sha256: str) -> None:
+        target = self.path(key)
+
+        def move() -> None:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(path, target)  # atomic: readers never see a partial object
+
+        await asyncio.to_thread(move)
+
+    def iter_bytes(self, key: str, chunk_size: int = CHUNK_SIZE) -> AsyncIterator[bytes]:
+        return _iter_file(self.path(key), chunk_size)
+
+
+# ── S3-compatible ─────────────────────────────────────────────────────────────
+
+def _hmac(key: bytes, msg: str) -> bytes:
+    return hmac.new(key, msg.encode("utf-8"), hashlib.sha256).digest()
+
+
+def sigv4_headers(
+    method: str,
+    url: str,
+    headers: dict[str, str],
+    payload_sha256: str,
+    *,
+    access_key: str,
+    secret_key: str,
+    region: str,
+    now: datetime | None = None,
+) -> dict[str, str]:
+    """headers plus x-amz-date, x-amz-content-sha256 and Authorization (SigV4, service s3)."""
+    now = now or datetime.now(timezone.utc)
+    amz_date = now.strftime("%Y%m%dT%H%M%SZ")
+    scope_date = amz_date[:8]
+    parts = urlsplit(url)
+    signed = {k.lower(): v.strip() for k, v in headers.items()}
+    signed["host"] = parts.netloc
+    signed["x-amz-date"] = amz_date
+    signed["x-amz-content-sha256"] = payload_sha256
+    names = sorted(signed)
+    query = "&".join(sorted(p if "=" in p else f"{p}=" for p in parts.query.split("&") if p))
+    canonical = "\n".join([
+        method,
+        parts.path or "/",  # already URI-encoded; S3 does not encode twice
+        query,
+        "".join(f"{n}:{signed[n]}\n" for n in names),
+        ";".join(names),
+        payload_sha256,
+    ])
+    scope = f"{scope_date}/{region}/s3/aws4_request"
+    to_sign = "\n".join([
+        "AWS4-HMAC-SHA256", amz_date, scope, hashlib.sha256(canonical.encode("utf-8")).hexdigest(),
+    ])
+    key = _hmac(_hmac(_hmac(_hmac(f"AWS4{secret_key}".encode("utf-8"), scope_date), region), "s3"), "aws4_request")
+    signature = hmac.new(key, to_sign.encode("utf-8"), hashlib.sha256).hexdigest()
+    out = {k: v for k, v in signed.items() if k != "host"}
+    out["authorization"] = (
+        f"AWS4-HMAC-SHA256 Credential={access_key}/{scope}, "
+        f"SignedHeaders={';'.join(names)}, Signature={signature}"
+    )
+    return out
+
+
+class S3Storage:
+    def __init__(self, endpoint_url: str, bucket: str, access_key: str, secret_key: str, region: str) -> None:
+        self.base = f"{endpoint_url.rstrip('/')}/{bucket}"
+        self.access_key = access_key
+        self.secret_key = secret_key
+        self.region = region
+        self.client = httpx.AsyncClient(timeout=httpx.Timeout(30.0, read=300.0, write=300.0))
+
+    def _request(self, method: str, key: str, payload_sha256: str = EMPTY_SHA256, headers: dict | None = None):
+        url = f"{self.base}/{quote(key, safe='/')}"
+        signed = sigv4_headers(
+            method, url, headers or {}, payload_sha256,
+            access_key=self.access_key, secret_key=self.secret_key, region=self.region,
+        )
+        return url, signed
+
+    async def exists(self, key: str) -> bool:
+        url, headers = self._request("HEAD", key)
+        response = await self.client.head(url, headers=headers)
+        if response.status_code == 404:
+            return False
+        response.raise_for_status()
+        return True
+
+    async def put_file(self, key: str, path: Path, size: int, sha256: str) -> None:
+        url, headers = self._request("PUT", key, sha256, {"content-length": str(size)})
+        response = await self.client.put(url, headers=headers, content=_iter_file(path))
+        response.raise_for_status()
+
+    async def iter_bytes(self, key: str, chunk_size: int = CHUNK_SIZE) -> AsyncIterator[bytes]:
+        url, headers = self._request("GET", key)
+        async with self.client.stream("GET", url, headers=headers) as response:
+            response.raise_for_status()
+            async for chunk in response.aiter_bytes(chunk_size):
+                yield chunk
+
+
+# ── Backend selection ─────────────────────────────────────────────────────────
+
+@lru_cache
+def _backend(kind: str, root: str, endpoint_url: str, bucket: str, access_key: str, secret_key: str, region: str):
+    if kind == "local":
+        return LocalStorage(Path(root))
+    if kind == "s3":
+        return S3Storage(endpoint_url, bucket, access_key, secret_key, region)
+    raise ValueError(f"Unknown FILE_STORAGE_BACKEND: {kind!r}")
+
+
+def backend() -> StorageBackend:
+    s = get_settings()
+    return _backend(
+        s.FILE_STORAGE_BACKEND, s.FILE_STORAGE_ROOT,
+        s.S3_ENDPOINT_URL, s.S3_BUCKET, s.S3_ACCESS_KEY, s.S3_SECRET_KEY, s.S3_REGION,
+    )
+
+
+async def exists(storage_path: str) -> bool:
+    return await backend().exists(storage_path)
+
+
+def iter_bytes(storage_path: str, chunk_size: int = CHUNK_SIZE) -> AsyncIterator[bytes]:
+    return backend().iter_bytes(storage_path, chunk_size)
+
+
+# ── Uploads ───────────────────────────────────────────────────────────────────
+
+@dataclass(frozen=True)
+class StoredObject:
+    key: str
+    sha256: str
+    size_bytes: int
+    created: bool   # False: the same bytes were already stored for this tenant
+
+
+async def save_stream(
+    tenant_id: uuid.UUID, chunks: AsyncIterable[bytes], max_bytes: int | None = None
+) -> StoredObject:
+    """Spool, hash and store an upload; raises FileTooLarge past max_bytes."""
+    spool = Path(get_settings().FILE_STORAGE_ROOT) / ".spool"
+    await asyncio.to_thread(spool.mkdir, parents=True, exist_ok=True)
+    tmp = spool / uuid.uuid4().hex
+    digest = hashlib.sha256()
+    size = 0
+    f = await asyncio.to_thread(tmp.open, "wb")
+    try:
+        try:
+            async for chunk in chunks:
+                size += len(chunk)
+                if max_bytes is not None and size > max_bytes:
+                    raise FileTooLarge(f"File exceeds {max_bytes} bytes")
+                digest.update(chunk)
+                await asyncio.to_thread(f.write, chunk)
+        finally:
+            await asyncio.to_thread(f.close)
+        sha256 = digest.hexdigest()
+        key = content_key(tenant_id, sha256)
+        store = backend()
+        created = not await store.exists(key)
+        if created:
+            await store.put_file(key, tmp, size, sha256)
+        return StoredObject(key, sha256, size, created)
+    finally:
+        await asyncio.to_thread(tmp.unlink, missing_ok=True)
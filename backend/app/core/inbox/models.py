@@ -3,6 +3,7 @@ from sqlalchemy import Boolean, Integer, String, Text, ForeignKey
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.db.base import Base, TimestampMixin, SoftDeleteMixin, TenantScopedMixin
+from app.db.search import search_index, search_vector_column
 
 
 class MessageThread(Base, TimestampMixin, SoftDeleteMixin, TenantScopedMixin):
@@ -12,8 +13,10 @@ class MessageThread(Base, TimestampMixin, SoftDeleteMixin, TenantScopedMixin):
     subject: Mapped[str] = mapped_column(String(500), nullable=False)
     status: Mapped[str] = mapped_column(String(50), nullable=False, default="open")
     assigned_to: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    search_vector = search_vector_column(("subject", "A"))
     project: Mapped["Project"] = relationship(back_populates="threads")
     messages: Mapped[list["IncomingMessage"]] = relationship(back_populates="thread", lazy="noload")
+    __table_args__ = (search_index("message_threads"),)
 
 
 class IncomingMessage(Base, TimestampMixin, SoftDeleteMixin, TenantScopedMixin):
@@ -29,8 +32,12 @@ class IncomingMessage(Base, TimestampMixin, SoftDeleteMixin, TenantScopedMixin):
     body_html: Mapped[str | None] = mapped_column(Text, nullable=True)
     message_id_header: Mapped[str | None] = mapped_column(String(255), nullable=True)
     is_new_thread: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    search_vector = search_vector_column(
+        ("subject_raw", "A"), ("sender_name", "C"), ("sender_email", "C"), ("body_text", "B"),
+    )
     thread: Mapped["MessageThread"] = relationship(back_populates="messages")
     attachments: Mapped[list["IncomingAttachment"]] = relationship(back_populates="message", lazy="noload")
+    __table_args__ = (search_index("incoming_messages"),)
 
 
 class IncomingAttachment(Base, TimestampMixin, TenantScopedMixin):
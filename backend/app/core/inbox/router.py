@@ -5,20 +5,28 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.inbox import service as inbox_service
 from app.core.inbox.models import IncomingMessage
 from app.core.inbox.schemas import MessageRead, ThreadRead
+from app.db.fieldsets import FIELDS_QUERY, parse_fields, load_only_fields, sparse_model, sparse_rows
 from app.dependencies import get_db, get_current_user, CurrentUser
 
 router = APIRouter(tags=["inbox"])
 
-@router.get("/threads/{thread_id}/messages", response_model=list[MessageRead])
-async def list_messages(thread_id: uuid.UUID, db: AsyncSession = Depends(get_db), current: CurrentUser = Depends(get_current_user)):
+@router.get(
+    "/threads/{thread_id}/messages",
+    response_model=list[sparse_model(MessageRead)],
+    response_model_exclude_unset=True,
+)
+async def list_messages(thread_id: uuid.UUID, fields: str | None = FIELDS_QUERY, db: AsyncSession = Depends(get_db), current: CurrentUser = Depends(get_current_user)):
+    # body_html is never part of the list; body_text only on request
+    selected = parse_fields(MessageRead, fields, heavy={"body_text"})
     result = await db.execute(
         select(IncomingMessage).where(
             IncomingMessage.thread_id == thread_id,
             IncomingMessage.tenant_id == current.tenant_id,
             IncomingMessage.is_deleted == False,
         ).order_by(IncomingMessage.created_at.asc())
+        .options(load_only_fields(IncomingMessage, selected))
     )
-    return list(result.scalars().all())
+    return sparse_rows(result.scalars().all(), selected)
 
 @router.post("/threads/{thread_id}/close", response_model=ThreadRead)
 async def close_thread(thread_id: uuid.UUID, db: AsyncSession = Depends(get_db), current: CurrentUser = Depends(get_current_user)):
@@ -4,6 +4,7 @@ from sqlalchemy import Boolean, DateTime, String, Text, ForeignKey
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.db.base import Base, TimestampMixin, SoftDeleteMixin, TenantScopedMixin
+from app.db.search import search_index, search_vector_column
 
 
 class Incident(Base, TimestampMixin, SoftDeleteMixin, TenantScopedMixin):
@@ -33,7 +34,11 @@ class Incident(Base, TimestampMixin, SoftDeleteMixin, TenantScopedMixin):
     assigned_to: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
     occurred_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     location: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    search_vector = search_vector_column(
+        ("incident_no", "A"), ("title", "A"), ("description", "B"), ("location", "C"),
+    )
     messages: Mapped[list["IncidentMessage"]] = relationship(back_populates="incident", lazy="noload")
+    __table_args__ = (search_index("incidents"),)
 
 
 class IncidentMessage(Base, TimestampMixin, SoftDeleteMixin, TenantScopedMixin):
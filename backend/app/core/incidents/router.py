@@ -1,7 +1,8 @@
 import uuid
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.incidents import service
+from app.core.incidents.models import Incident
 from app.core.incidents.schemas import (
     IncidentCreate, IncidentRead, IncidentTriageUpdate,
     IncidentMessageCreate, IncidentMessageRead,
@@ -10,6 +11,7 @@ from app.core.files.schemas import FileCreate
 from app.core.files.service import create_file, link_file
 from app.core.projects.service import get_project
 from app.dependencies import get_db, get_current_user, CurrentUser
+from app.http_cache import not_modified_since, set_etag
 
 router = APIRouter(tags=["incidents"])
 
@@ -39,12 +41,17 @@ async def list_incidents(
 @router.get("/incidents/{incident_id}", response_model=IncidentRead)
 async def get_incident(
     incident_id: uuid.UUID,
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db),
     _: CurrentUser = Depends(get_current_user),
 ):
+    if (unchanged := await not_modified_since(request, db, Incident, incident_id)) is not None:
+        return unchanged
     incident = await service.get_incident(db, incident_id)
     if not incident:
         raise HTTPException(404, "Incident not found")
+    set_etag(response, incident)
     return incident
 
 
@@ -1,15 +1,19 @@
 import uuid
-from sqlalchemy import String, Text, ForeignKey
+from sqlalchemy import String, Text, ForeignKey, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from app.db.base import Base, TimestampMixin, SoftDeleteMixin, TenantScopedMixin
+from app.db.base import Base, TimestampMixin, SoftDeleteMixin, TenantScopedMixin, VersionedMixin
+from app.db.search import search_index, search_vector_column
 
 
-class Nonconformance(Base, TimestampMixin, SoftDeleteMixin, TenantScopedMixin):
+class Nonconformance(Base, TimestampMixin, SoftDeleteMixin, TenantScopedMixin, VersionedMixin):
     """
     NC – Avvik.
     status flow: open -> under_review -> resolved -> closed
     owner_user_id: required, primary responsible person
+    source_type/source_id/source_key: origin of auto-created NCs
+    (checklist run + field id, compliance timesheet + rule/day); unique while
+    not deleted so auto-creation is idempotent.
     """
     __tablename__ = "nonconformances"
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -22,12 +26,24 @@ class Nonconformance(Base, TimestampMixin, SoftDeleteMixin, TenantScopedMixin):
     status: Mapped[str] = mapped_column(String(50), nullable=False, default="open")
     source_type: Mapped[str | None] = mapped_column(String(50), nullable=True)
     source_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), nullable=True)
+    source_key: Mapped[str | None] = mapped_column(String(255), nullable=True)
     owner_user_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
     root_cause: Mapped[str | None] = mapped_column(Text, nullable=True)
+    search_vector = search_vector_column(
+        ("nc_no", "A"), ("title", "A"), ("description", "B"), ("root_cause", "C"),
+    )
     actions: Mapped[list["CapaAction"]] = relationship(back_populates="nonconformance", lazy="noload")
+    __table_args__ = (
+        Index(
+            "uq_nc_source_key", "tenant_id", "source_type", "source_id", "source_key",
+            unique=True,
+            postgresql_where=text("source_key IS NOT NULL AND is_deleted = false"),
+        ),
+        search_index("nonconformances"),
+    )
 
 
-class CapaAction(Base, TimestampMixin, SoftDeleteMixin, TenantScopedMixin):
+class CapaAction(Base, TimestampMixin, SoftDeleteMixin, TenantScopedMixin, VersionedMixin):
     """
     CAPA – Corrective And Preventive Action.
     status lifecycle: open -> done -> verified (terminal)
@@ -1,14 +1,16 @@
 import uuid
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.nonconformance import service
+from app.core.nonconformance.models import Nonconformance
 from app.core.nonconformance.schemas import (
     NonconformanceCreate, NonconformanceRead, NonconformanceUpdate,
     CapaActionCreate, CapaActionRead, CapaActionUpdate, CapaTransitionRequest,
 )
 from app.core.projects.service import get_project
 from app.dependencies import get_db, get_current_user, CurrentUser
+from app.http_cache import check_if_match, not_modified_since, set_etag
 
 router = APIRouter(tags=["nonconformances"])
 
@@ -40,12 +42,17 @@ async def list_ncs(
 @router.get("/nonconformances/{nc_id}", response_model=NonconformanceRead)
 async def get_nc(
     nc_id: uuid.UUID,
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db),
     _: CurrentUser = Depends(get_current_user),
 ):
+    if (unchanged := await not_modified_since(request, db, Nonconformance, nc_id)) is not None:
+        return unchanged
     nc = await service.get_nc(db, nc_id)
     if not nc:
         raise HTTPException(404, "Nonconformance not found")
+    set_etag(response, nc)
     return nc
 
 
@@ -53,13 +60,18 @@ async def get_nc(
 async def update_nc(
     nc_id: uuid.UUID,
     data: NonconformanceUpdate,
+    response: Response,
+    if_match: str | None = Header(None),
     db: AsyncSession = Depends(get_db),
     current: CurrentUser = Depends(get_current_user),
 ):
     nc = await service.get_nc(db, nc_id)
     if not nc:
         raise HTTPException(404, "Nonconformance not found")
-    return await service.update_nc(db, nc, data, current.user_id, current.tenant_id)
+    check_if_match(if_match, nc)
+    nc = await service.update_nc(db, nc, data, current.user_id, current.tenant_id)
+    set_etag(response, nc)
+    return nc
 
 
 @router.post("/nonconformances/{nc_id}/actions", response_model=CapaActionRead, status_code=201)
@@ -89,6 +101,8 @@ async def update_capa(
     nc_id: uuid.UUID,
     action_id: uuid.UUID,
     data: CapaActionUpdate,
+    response: Response,
+    if_match: str | None = Header(None),
     db: AsyncSession = Depends(get_db),
     _: CurrentUser = Depends(get_current_user),
 ):
@@ -103,7 +117,10 @@ async def update_capa(
     action = result.scalar_one_or_none()
     if not action:
         raise HTTPException(404, "Action not found")
-    return await service.update_capa(db, action, data)
+    check_if_match(if_match, action)
+    action = await service.update_capa(db, action, data)
+    set_etag(response, action)
+    return action
 
 
 @router.post("/nonconformances/{nc_id}/actions/{action_id}/transition", response_model=CapaActionRead)
@@ -28,6 +28,7 @@ class NonconformanceRead(BaseModel):
     source_id: uuid.UUID | None
     owner_user_id: uuid.UUID | None
     root_cause: str | None
+    version: int
     created_at: datetime
 
 
@@ -63,6 +64,7 @@ class CapaActionRead(BaseModel):
     done_at: str | None
     verified_at: str | None
     verified_by: uuid.UUID | None
+    version: int
     created_at: datetime
 
 
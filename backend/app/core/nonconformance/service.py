@@ -1,6 +1,8 @@
 import uuid
+from dataclasses import dataclass
 from datetime import datetime, timezone
-from sqlalchemy import select, func
+from sqlalchemy import select, func, text, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.nonconformance.models import Nonconformance, CapaAction
 from app.core.nonconformance.schemas import (
@@ -15,17 +17,116 @@ CAPA_VALID_TRANSITIONS = {
 }
 
 
-async def generate_nc_no(db: AsyncSession, tenant_id: uuid.UUID, project_id: uuid.UUID) -> str:
-    year = datetime.now(timezone.utc).year
-    yy = str(year)[-2:]
+async def _lock_nc_numbering(db: AsyncSession, tenant_id: uuid.UUID, project_id: uuid.UUID) -> None:
+    """Serialise NC number allocation per project until the transaction ends."""
+    await db.execute(
+        select(func.pg_advisory_xact_lock(func.hashtext(f"nc_no:{tenant_id}:{project_id}")))
+    )
+
+
+async def _count_ncs(db: AsyncSession, tenant_id: uuid.UUID, project_id: uuid.UUID) -> int:
     result = await db.execute(
         select(func.count(Nonconformance.id)).where(
             Nonconformance.tenant_id == tenant_id,
             Nonconformance.project_id == project_id,
         )
     )
-    count = result.scalar_one() or 0
-    return f"NC-{yy}-{count + 1:04d}"
+    return result.scalar_one() or 0
+
+
+def _format_nc_no(seq: int) -> str:
+    yy = str(datetime.now(timezone.utc).year)[-2:]
+    return f"NC-{yy}-{seq:04d}"
+
+
+async def generate_nc_no(db: AsyncSession, tenant_id: uuid.UUID, project_id: uuid.UUID) -> str:
+    await _lock_nc_numbering(db, tenant_id, project_id)
+    return _format_nc_no(await _count_ncs(db, tenant_id, project_id) + 1)
+
+
+# ── Batched auto-NC factory ───────────────────────────────────────────────────
+
+@dataclass
+class NCSource:
+    """One auto-NC request. payload: title, description, severity, owner_user_id, nc_type."""
+    source_type: str
+    source_id: uuid.UUID
+    source_key: str
+    payload: dict
+
+
+async def create_ncs_from_sources(
+    db: AsyncSession,
+    tenant_id: uuid.UUID,
+    project_id: uuid.UUID,
+    sources: list[NCSource],
+) -> list[tuple[NCSource, str]]:
+    """
+    Idempotent bulk creation of auto-NCs for one project.
+    Existing NCs are resolved in one query, numbers are allocated as one
+    block and the rest is inserted in one statement. The unique index
+    uq_nc_source_key backs the idempotency against concurrent submits.
+    Returns (source, nc_no) for the NCs actually created.
+    """
+    if not sources:
+        return []
+    keys = {(s.source_type, s.source_id, s.source_key): s for s in sources}
+
+    existing = await db.execute(
+        select(Nonconformance.source_type, Nonconformance.source_id, Nonconformance.source_key)
+        .where(
+            Nonconformance.tenant_id == tenant_id,
+            tuple_(
+                Nonconformance.source_type, Nonconformance.source_id, Nonconformance.source_key
+            ).in_(list(keys)),
+            Nonconformance.is_deleted == False,
+        )
+    )
+    for row in existing.all():
+        keys.pop(tuple(row), None)
+    if not keys:
+        return []
+
+    await _lock_nc_numbering(db, tenant_id, project_id)
+    base = await _count_ncs(db, tenant_id, project_id)
+    pending = list(keys.values())
+    rows = [
+        {
+            "id": uuid.uuid4(),
+            "tenant_id": tenant_id,
+            "project_id": project_id,
+            "nc_no": _format_nc_no(base + i + 1),
+            "title": s.payload["title"],
+            "description": s.payload.get("description"),
+            "nc_type": s.payload.get("nc_type", "nonconformance"),
+            "severity": s.payload.get("severity", "low"),
+            "status": "open",
+            "source_type": s.source_type,
+            "source_id": s.source_id,
+            "source_key": s.source_key,
+            "owner_user_id": s.payload.get("owner_user_id"),
+            "is_deleted": False,
+        }
+        for i, s in enumerate(pending)
+    ]
+    result = await db.execute(
+        pg_insert(Nonconformance)
+        .values(rows)
+        .on_conflict_do_nothing(
+            index_elements=["tenant_id", "source_type", "source_id", "source_key"],
+            index_where=text("source_key IS NOT NULL AND is_deleted = false"),
+        )
+        .returning(
+            Nonconformance.source_type, Nonconformance.source_id,
+            Nonconformance.source_key, Nonconformance.nc_no,
+        )
+    )
+    created = {(r.source_type, r.source_id, r.source_key): r.nc_no for r in result.all()}
+    return [
+        (s, created[(s.source_type, s.source_id, s.source_key)])
+        for s in pending
+        if (s.source_type, s.source_id, s.source_key) in created
+    ]
 
 
 async def create_nc(
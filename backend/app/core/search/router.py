@@ -0,0 +1,29 @@
+import uuid
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.search import service
+from app.core.search.schemas import SearchResults
+from app.dependencies import get_db, get_current_user, CurrentUser
+
+router = APIRouter(tags=["search"])
+
+
+@router.get("/search", response_model=SearchResults)
+async def search(
+    q: str = Query(..., min_length=2, max_length=200),
+    project_id: uuid.UUID | None = Query(None),
+    types: str | None = Query(None, description=f"Comma-separated subset of: {', '.join(service.SEARCH_KINDS)}"),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0, le=1000),
+    db: AsyncSession = Depends(get_db),
+    current: CurrentUser = Depends(get_current_user),
+):
+    kinds = None
+    if types is not None:
+        kinds = [t.strip() for t in types.split(",") if t.strip()]
+        unknown = set(kinds) - set(service.SEARCH_KINDS)
+        if unknown or not kinds:
+            raise HTTPException(400, f"Unknown types: {', '.join(sorted(unknown)) or types}")
+    return await service.search(
+        db, current.tenant_id, q.strip(), project_id=project_id, kinds=kinds, limit=limit, offset=offset,
+    )
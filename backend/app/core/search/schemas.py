@@ -0,0 +1,24 @@
+import uuid
+from datetime import datetime
+from typing import Literal
+from pydantic import BaseModel
+
+SearchKind = Literal["doc", "incident", "nonconformance", "thread", "message", "drawing", "task"]
+
+
+class SearchHit(BaseModel):
+    """parent_id: the thread of a message hit, otherwise null."""
+    kind: SearchKind
+    id: uuid.UUID
+    project_id: uuid.UUID
+    ref: str | None
+    title: str
+    parent_id: uuid.UUID | None
+    updated_at: datetime
+    rank: float
+
+
+class SearchResults(BaseModel):
+    query: str
+    items: list[SearchHit]
+    next_offset: int | None
@@ -0,0 +1,159 @@
+"""
+Unified full-text search across HMS records.
+
+Every source table has a generated search_vector with a GIN index (see
+app/db/search.py). A search runs one indexed, ranked query per source and
+merges them with UNION ALL; each branch is cut to offset + limit + 1 rows
+before the merge, so the final sort only sees a page's worth of rows per
+source.
+
+Document text is stored compressed in doc_content_blobs, so a document
+matches on its own fields (number, title, type) or on the search_vector of
+any of its version blobs, ranked by the better of the two.
+"""
+import uuid
+from sqlalchemy import String, and_, func, literal, literal_column, select, union_all
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.documents.models import DocContentBlob, ProjectDoc, ProjectDocVersion
+from app.core.drawings.models import Drawing
+from app.core.inbox.models import IncomingMessage, MessageThread
+from app.core.incidents.models import Incident
+from app.core.nonconformance.models import Nonconformance
+from app.core.tasks.models import Task
+from app.db.search import search_query
+
+SEARCH_KINDS = ("doc", "incident", "nonconformance", "thread", "message", "drawing", "task")
+
+
+def _matches(vector, query):
+    return vector.bool_op("@@")(query)
+
+
+def _rank(vector, query):
+    # normalization 1: divide by 1 + log(length), so long mail bodies don't win by size
+    return func.ts_rank(vector, query, 1)
+
+
+def _hit(kind: str, model, ref, title, query, parent_id=None):
+    return select(
+        literal(kind, String).label("kind"),
+        model.id.label("id"),
+        model.project_id.label("project_id"),
+        ref.label("ref") if ref is not None else literal(None, String).label("ref"),
+        title.label("title"),
+        parent_id.label("parent_id") if parent_id is not None else literal(None, UUID(as_uuid=True)).label("parent_id"),
+        model.updated_at.label("updated_at"),
+        _rank(model.search_vector, query).label("rank"),
+    )
+
+
+def _record_branch(kind: str, model, ref, title, query, tenant_id, project_id, parent_id):
+    stmt = _hit(kind, model, ref, title, query, parent_id).where(
+        model.tenant_id == tenant_id,
+        model.is_deleted == False,
+        _matches(model.search_vector, query),
+    )
+    if project_id is not None:
+        stmt = stmt.where(model.project_id == project_id)
+    return stmt
+
+
+def _doc_branch(query, tenant_id, project_id):
+    by_fields = select(
+        ProjectDoc.id.label("doc_id"),
+        _rank(ProjectDoc.search_vector, query).label("rank"),
+    ).where(ProjectDoc.tenant_id == tenant_id, _matches(ProjectDoc.search_vector, query))
+    by_content = (
+        select(
+            ProjectDocVersion.doc_id.label("doc_id"),
+            _rank(DocContentBlob.search_vector, query).label("rank"),
+        )
+        .join(DocContentBlob, and_(
+            DocContentBlob.tenant_id == ProjectDocVersion.tenant_id,
+            DocContentBlob.content_hash == ProjectDocVersion.content_hash,
+        ))
+        .where(
+            DocContentBlob.tenant_id == tenant_id,
+            _matches(DocContentBlob.search_vector, query),
+            ProjectDocVersion.is_deleted == False,
+        )
+    )
+    matched = union_all(by_fields, by_content).subquery("doc_matches")
+    stmt = (
+        select(
+            literal("doc", String).label("kind"),
+            ProjectDoc.id.label("id"),
+            ProjectDoc.project_id.label("project_id"),
+            ProjectDoc.doc_no.label("ref"),
+            ProjectDoc.title.label("title"),
+            literal(None, UUID(as_uuid=True)).label("parent_id"),
+            ProjectDoc.updated_at.label("updated_at"),
+            func.max(matched.c.rank).label("rank"),
+        )
+        .join(matched, matched.c.doc_id == ProjectDoc.id)
+        .where(ProjectDoc.tenant_id == tenant_id, ProjectDoc.is_deleted == False)
+        .group_by(ProjectDoc.id)
+    )
+    if project_id is not None:
+        stmt = stmt.where(ProjectDoc.project_id == project_id)
+    return stmt
+
+
+# kind → (model, ref, title, parent_id) for the single-table sources
+_RECORD_SOURCES = {
+    "incident": (Incident, Incident.incident_no, Incident.title, None),
+    "nonconformance": (Nonconformance, Nonconformance.nc_no, Nonconformance.title, None),
+    "thread": (MessageThread, None, MessageThread.subject, None),
+    "message": (IncomingMessage, IncomingMessage.sender_email, IncomingMessage.subject_raw, IncomingMessage.thread_id),
+    "drawing": (Drawing, Drawing.drawing_no + " rev " + Drawing.revision, Drawing.title, None),
+    "task": (Task, None, Task.title, None),
+}
+
+
+def build_search(
+    q: str,
+    tenant_id: uuid.UUID,
+    project_id: uuid.UUID | None,
+    kinds: list[str],
+    limit: int,
+    offset: int,
+):
+    """One page of hits (limit + 1 rows, the extra one signals a next page)."""
+    query = search_query(q)
+    window = offset + limit + 1
+    parts = []
+    for kind in kinds:
+        if kind == "doc":
+            branch = _doc_branch(query, tenant_id, project_id)
+        else:
+            model, ref, title, parent_id = _RECORD_SOURCES[kind]
+            branch = _record_branch(kind, model, ref, title, query, tenant_id, project_id, parent_id)
+        top = branch.order_by(literal_column("rank").desc()).limit(window).subquery()
+        parts.append(select(top))
+    hits = union_all(*parts).subquery("hits")
+    return (
+        select(hits)
+        .order_by(hits.c.rank.desc(), hits.c.updated_at.desc(), hits.c.id)
+        .offset(offset)
+        .limit(limit + 1)
+    )
+
+
+async def search(
+    db: AsyncSession,
+    tenant_id: uuid.UUID,
+    q: str,
+    project_id: uuid.UUID | None = None,
+    kinds: list[str] | None = None,
+    limit: int = 20,
+    offset: int = 0,
+) -> dict:
+    result = await db.execute(build_search(q, tenant_id, project_id, kinds or list(SEARCH_KINDS), limit, offset))
+    rows = result.mappings().all()
+    return {
+        "query": q,
+        "items": [dict(r) for r in rows[:limit]],
+        "next_offset": offset + limit if len(rows) > limit else None,
+    }
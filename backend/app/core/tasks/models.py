@@ -3,10 +3,11 @@ from datetime import datetime
 from sqlalchemy import DateTime, String, Text, ForeignKey
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from app.db.base import Base, TimestampMixin, SoftDeleteMixin, TenantScopedMixin
+from app.db.base import Base, TimestampMixin, SoftDeleteMixin, TenantScopedMixin, VersionedMixin
+from app.db.search import search_index, search_vector_column
 
 
-class Task(Base, TimestampMixin, SoftDeleteMixin, TenantScopedMixin):
+class Task(Base, TimestampMixin, SoftDeleteMixin, TenantScopedMixin, VersionedMixin):
     __tablename__ = "tasks"
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     project_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("projects.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -16,4 +17,6 @@ class Task(Base, TimestampMixin, SoftDeleteMixin, TenantScopedMixin):
     status: Mapped[str] = mapped_column(String(50), nullable=False, default="open")
     assigned_to: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
     due_date: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    search_vector = search_vector_column(("title", "A"), ("description", "B"))
     project: Mapped["Project"] = relationship(back_populates="tasks")  # type: ignore
+    __table_args__ = (search_index("tasks"),)
@@ -1,15 +1,26 @@
 import uuid
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.tasks import service
 from app.core.tasks.schemas import TaskRead, TaskUpdate
 from app.dependencies import get_db, get_current_user, CurrentUser
+from app.http_cache import check_if_match, set_etag
 
 router = APIRouter(tags=["tasks"])
 
 @router.patch("/tasks/{task_id}", response_model=TaskRead)
-async def update_task(task_id: uuid.UUID, data: TaskUpdate, db: AsyncSession = Depends(get_db), _: CurrentUser = Depends(get_current_user)):
+async def update_task(
+    task_id: uuid.UUID,
+    data: TaskUpdate,
+    response: Response,
+    if_match: str | None = Header(None),
+    db: AsyncSession = Depends(get_db),
+    _: CurrentUser = Depends(get_current_user),
+):
     task = await service.get_task(db, task_id)
     if not task:
         raise HTTPException(404, "Task not found")
-    return await service.update_task(db, task, data)
+    check_if_match(if_match, task)
+    task = await service.update_task(db, task, data)
+    set_etag(response, task)
+    return task
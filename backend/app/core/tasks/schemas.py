@@ -13,6 +13,7 @@ class TaskRead(BaseModel):
     status: str
     assigned_to: uuid.UUID | None
     due_date: datetime | None
+    version: int
     created_at: datetime
 
 class TaskUpdate(BaseModel):
@@ -0,0 +1,424 @@
+"""
+Bulk import of punch data (time clocks / site turnstiles) into time_entries.
+
+Pipeline:
+  1. The request body (CSV with header row, or NDJSON) is decoded incrementally
+     and streamed into a per-transaction staging table with asyncpg COPY.
+     Rows that cannot be parsed are still staged, pre-marked with a reject reason.
+  2. Validation runs set-wise in SQL against the staging table (users, matching
+     open timesheet for the week, overlaps in file and against existing entries).
+  3. Valid rows are merged into time_entries with one INSERT ... SELECT; rejects
+     are copied to time_entry_import_rejects for the downloadable report.
+
+Throughput does not depend on create_entry – no per-row round trips.
+"""
+import codecs
+import csv
+import io
+import json
+import uuid
+from datetime import datetime, date, timezone
+from typing import AsyncIterator
+from zoneinfo import ZoneInfo
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.timesheets.models import TimeEntryImport, TimeEntryImportReject
+
+VALID_IMPORT_FORMATS = {"csv", "ndjson"}
+
+STAGING_TABLE = "tmp_time_entry_import"
+STAGING_COPY_COLUMNS = [
+    "row_no", "raw_line", "user_id", "user_email", "work_date",
+    "start_time", "end_time", "break_minutes", "description", "reject_reason",
+]
+
+# Reject reason codes (also the values in the rejects report)
+REJECT_PARSE_ERROR = "parse_error"
+REJECT_MISSING_FIELD = "missing_field"
+REJECT_INVALID_INTERVAL = "invalid_interval"
+REJECT_UNKNOWN_USER = "unknown_user"
+REJECT_BREAK_EXCEEDS_DURATION = "break_exceeds_duration"
+REJECT_NO_TIMESHEET = "no_timesheet"
+REJECT_TIMESHEET_NOT_OPEN = "timesheet_not_open"
+REJECT_OVERLAPS_IN_FILE = "overlaps_in_file"
+REJECT_OVERLAPS_EXISTING = "overlaps_existing"
+
+
+# ── Parsing ───────────────────────────────────────────────────────────────────
+
+def _parse_timestamp(value: str, tz: ZoneInfo) -> datetime:
+    ts = datetime.fromisoformat(value.strip())
+    if ts.tzinfo is None:
+        # Time clocks usually export local wall-clock time
+        ts = ts.replace(tzinfo=tz)
+    return ts.astimezone(timezone.utc)
+
+
+def parse_import_row(row: dict, row_no: int, raw_line: str, tz: ZoneInfo) -> tuple:
+    """
+    Map one source row to a staging record (STAGING_COPY_COLUMNS order).
+    Never raises: unparseable rows are returned with reject_reason set.
+    """
+    def rejected(reason: str) -> tuple:
+        return (row_no, raw_line, None, None, None, None, None, None, None, reason)
+
+    try:
+        user_id_raw = (row.get("user_id") or "").strip()
+        user_email = (row.get("user_email") or "").strip().lower() or None
+        start_raw = (row.get("start_time") or "").strip()
+        end_raw = (row.get("end_time") or "").strip()
+        if not (user_id_raw or user_email) or not start_raw or not end_raw:
+            return rejected(REJECT_MISSING_FIELD)
+
+        user_id = uuid.UUID(user_id_raw) if user_id_raw else None
+        start_time = _parse_timestamp(start_raw, tz)
+        end_time = _parse_timestamp(end_raw, tz)
+        if end_time <= start_time:
+            return rejected(REJECT_INVALID_INTERVAL)
+
+        work_date_raw = (row.get("work_date") or "").strip()
+        work_date = (
+            date.fromisoformat(work_date_raw) if work_date_raw
+            else start_time.astimezone(tz).date()
+        )
+        break_raw = str(row.get("break_minutes") or "0").strip()
+        break_minutes = int(break_raw or 0)
+        if break_minutes < 0:
+            return rejected(REJECT_PARSE_ERROR)
+        description = (row.get("description") or None)
+    except (ValueError, TypeError, AttributeError):
+        return rejected(REJECT_PARSE_ERROR)
+
+    return (
+        row_no, raw_line, user_id, user_email, work_date,
+        start_time, end_time, break_minutes, description, None,
+    )
+
+
+async def _iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Incrementally decode a byte stream into text lines (UTF-8, BOM tolerant)."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    buf = ""
+    async for chunk in chunks:
+        buf += decoder.decode(chunk)
+        *lines, buf = buf.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    buf += decoder.decode(b"", final=True)
+    if buf:
+        yield buf.rstrip("\r")
+
+
+def _in_quoted_field(line: str, in_quotes: bool) -> bool:
+    """Whether a CSV record is still inside a quoted field at the end of line."""
+    field_start = not in_quotes
+    i = 0
+    while i < len(line):
+        c = line[i]
+        if in_quotes:
+            if c == '"':
+                if line[i + 1:i + 2] == '"':
+                    i += 2
+                    continue
+                in_quotes = False
+        else:
+            if c == '"' and field_start:
+                in_quotes = True
+            field_start = c == ","
+        i += 1
+    return in_quotes
+
+
+async def _iter_csv_records(lines: AsyncIterator[str]) -> AsyncIterator[tuple[list[str], str]]:
+    """
+    CSV records with their raw text. A quoted field may span lines (Excel
+    writes multi-line descriptions that way), so lines are joined until the
+    record's quotes are closed before it is parsed.
+    """
+    pending: list[str] = []
+    in_quotes = False
+    async for line in lines:
+        if not pending and not line.strip():
+            continue
+        pending.append(line)
+        in_quotes = _in_quoted_field(line, in_quotes)
+        if in_quotes:
+            continue
+        raw = "\n".join(pending)
+        pending.clear()
+        yield next(csv.reader([raw])), raw
+    if pending:
+        # Unterminated quote at end of input: parsed as far as csv allows
+        raw = "\n".join(pending)
+        try:
+            values = next(csv.reader([raw], strict=True))
+        except csv.Error:
+            values = None
+        yield values, raw
+
+
+async def _iter_staging_records(
+    chunks: AsyncIterator[bytes], source_format: str, tz: ZoneInfo
+) -> AsyncIterator[tuple]:
+    row_no = 0
+    if source_format == "csv":
+        header: list[str] | None = None
+        async for values, raw in _iter_csv_records(_iter_lines(chunks)):
+            if header is None:
+                header = [h.strip().lower() for h in values or []]
+                continue
+            row_no += 1
+            if values is None:
+                yield (row_no, raw, None, None, None, None, None, None, None, REJECT_PARSE_ERROR)
+                continue
+            yield parse_import_row(dict(zip(header, values)), row_no, raw, tz)
+        return
+
+    async for line in _iter_lines(chunks):
+        if not line.strip():
+            continue
+        row_no += 1
+        try:
+            obj = json.loads(line)
+        except ValueError:
+            obj = None
+        if not isinstance(obj, dict):
+            yield (row_no, line, None, None, None, None, None, None, None, REJECT_PARSE_ERROR)
+            continue
+        yield parse_import_row({k.lower(): v for k, v in obj.items()}, row_no, line, tz)
+
+
+# ── Set-wise validation ───────────────────────────────────────────────────────
+
+_VALIDATION_STEPS: list[str] = [
+    # Resolve user_email → user_id within the tenant
+    f"""
+    UPDATE {STAGING_TABLE} s SET user_id = u.id
+    FROM users u
+    WHERE s.user_id IS NULL AND s.user_email IS NOT NULL AND s.reject_reason IS NULL
+      AND u.tenant_id = CAST(:tenant_id AS uuid) AND lower(u.email) = s.user_email
+      AND u.is_deleted = false
+    """,
+    f"""
+    UPDATE {STAGING_TABLE} s SET reject_reason = '{REJECT_UNKNOWN_USER}'
+    WHERE s.reject_reason IS NULL AND NOT EXISTS (
+        SELECT 1 FROM users u
+        WHERE u.id = s.user_id AND u.tenant_id = CAST(:tenant_id AS uuid) AND u.is_deleted = false
+    )
+    """,
+    f"""
+    UPDATE {STAGING_TABLE} s SET reject_reason = '{REJECT_BREAK_EXCEEDS_DURATION}'
+    WHERE s.reject_reason IS NULL
+      AND s.break_minutes * 60 >= extract(epoch FROM (s.end_time - s.start_time))
+    """,
+    # Matching timesheet: same tenant/project/user, ISO week containing work_date
+    f"""
+    UPDATE {STAGING_TABLE} s SET timesheet_id = t.id, timesheet_status = t.status
+    FROM timesheets t
+    WHERE s.reject_reason IS NULL
+      AND t.tenant_id = CAST(:tenant_id AS uuid)
+      AND t.project_id = CAST(:project_id AS uuid)
+      AND t.user_id = s.user_id
+      AND t.week_start = date_trunc('week', s.work_date)::date
+      AND t.is_deleted = false
+    """,
+    f"""
+    UPDATE {STAGING_TABLE} s SET reject_reason = '{REJECT_NO_TIMESHEET}'
+    WHERE s.reject_reason IS NULL AND s.timesheet_id IS NULL
+    """,
+    f"""
+    UPDATE {STAGING_TABLE} s SET reject_reason = '{REJECT_TIMESHEET_NOT_OPEN}'
+    WHERE s.reject_reason IS NULL AND s.timesheet_status <> 'open'
+    """,
+    # Overlap inside the file – the earliest row wins
+    f"""
+    UPDATE {STAGING_TABLE} s SET reject_reason = '{REJECT_OVERLAPS_IN_FILE}'
+    WHERE s.reject_reason IS NULL AND EXISTS (
+        SELECT 1 FROM {STAGING_TABLE} o
+        WHERE o.reject_reason IS NULL
+          AND o.user_id = s.user_id AND o.work_date = s.work_date
+          AND o.row_no < s.row_no
+          AND o.start_time < s.end_time AND o.end_time > s.start_time
+    )
+    """,
+    # Overlap with stored entries – same rule as _check_overlap
+    f"""
+    UPDATE {STAGING_TABLE} s SET reject_reason = '{REJECT_OVERLAPS_EXISTING}'
+    WHERE s.reject_reason IS NULL AND EXISTS (
+        SELECT 1 FROM time_entries e
+        WHERE e.tenant_id = CAST(:tenant_id AS uuid)
+          AND e.user_id = s.user_id AND e.work_date = s.work_date
+          AND e.status <> 'rejected' AND e.is_deleted = false
+          AND e.start_time < s.end_time
+          AND (e.end_time IS NULL OR e.end_time > s.start_time)
+    )
+    """,
+    # Net minutes – same formula as _calc_net_minutes
+    f"""
+    UPDATE {STAGING_TABLE} s SET net_minutes = greatest(
+        0, floor(extract(epoch FROM (s.end_time - s.start_time)) / 60)::int - s.break_minutes
+    )
+    WHERE s.reject_reason IS NULL
+    """,
+]
+
+_MERGE_ENTRIES = f"""
+INSERT INTO time_entries (
+    id, tenant_id, timesheet_id, user_id, project_id, work_date,
+    start_time, end_time, break_minutes, net_minutes, description,
+    status, is_adjustment, is_deleted, created_at, updated_at
+)
+SELECT gen_random_uuid(), CAST(:tenant_id AS uuid), s.timesheet_id, s.user_id,
+       CAST(:project_id AS uuid), s.work_date, s.start_time, s.end_time,
+       s.break_minutes, s.net_minutes, s.description,
+       'active', false, false, now(), now()
+FROM {STAGING_TABLE} s
+WHERE s.reject_reason IS NULL
+ORDER BY s.row_no
+"""
+
+_COPY_REJECTS = f"""
+INSERT INTO time_entry_import_rejects (id, tenant_id, import_id, row_no, reason, raw_line)
+SELECT gen_random_uuid(), CAST(:tenant_id AS uuid), CAST(:import_id AS uuid),
+       s.row_no, s.reject_reason, s.raw_line
+FROM {STAGING_TABLE} s
+WHERE s.reject_reason IS NOT NULL
+"""
+
+
+async def _create_staging_table(db: AsyncSession) -> None:
+    await db.execute(text(f"DROP TABLE IF EXISTS {STAGING_TABLE}"))
+    await db.execute(text(f"""
+        CREATE TEMP TABLE {STAGING_TABLE} (
+            row_no integer NOT NULL,
+            raw_line text,
+            user_id uuid,
+            user_email text,
+            work_date date,
+            start_time timestamptz,
+            end_time timestamptz,
+            break_minutes integer,
+            description text,
+            reject_reason text,
+            timesheet_id uuid,
+            timesheet_status text,
+            net_minutes integer
+        ) ON COMMIT DROP
+    """))
+
+
+async def _copy_into_staging(db: AsyncSession, records: AsyncIterator[tuple]) -> None:
+    conn = await db.connection()
+    raw = await conn.get_raw_connection()
+    await raw.driver_connection.copy_records_to_table(
+        STAGING_TABLE, records=records, columns=STAGING_COPY_COLUMNS,
+    )
+
+
+# ── Import ────────────────────────────────────────────────────────────────────
+
+async def import_time_entries(
+    db: AsyncSession,
+    tenant_id: uuid.UUID,
+    project_id: uuid.UUID,
+    chunks: AsyncIterator[bytes],
+    source_format: str,
+    imported_by: uuid.UUID,
+) -> TimeEntryImport:
+    from fastapi import HTTPException
+    from app.core.timesheets.service import _get_tenant_tz
+
+    if source_format not in VALID_IMPORT_FORMATS:
+        raise HTTPException(400, f"Unsupported import format '{source_format}'")
+
+    tz = await _get_tenant_tz(db, tenant_id)
+    batch = TimeEntryImport(
+        tenant_id=tenant_id,
+        project_id=project_id,
+        source_format=source_format,
+        status="processing",
+        imported_by=imported_by,
+    )
+    db.add(batch)
+    await db.flush()
+
+    await _create_staging_table(db)
+    await _copy_into_staging(db, _iter_staging_records(chunks, source_format, tz))
+    await db.execute(text(
+        f"CREATE INDEX ON {STAGING_TABLE} (user_id, work_date, row_no)"
+    ))
+    await db.execute(text(f"ANALYZE {STAGING_TABLE}"))
+
+    params = {"tenant_id": str(tenant_id), "project_id": str(project_id)}
+    for statement in _VALIDATION_STEPS:
+        await db.execute(text(statement), params)
+
+    counts = await db.execute(text(
+        f"SELECT count(*), count(*) FILTER (WHERE reject_reason IS NULL) FROM {STAGING_TABLE}"
+    ))
+    total, valid = counts.one()
+
+    await db.execute(text(_MERGE_ENTRIES), params)
+    await db.execute(text(_COPY_REJECTS), {**params, "import_id": str(batch.id)})
+
+    batch.status = "completed"
+    batch.total_rows = total
+    batch.imported_rows = valid
+    batch.rejected_rows = total - valid
+    batch.completed_at = datetime.now(timezone.utc)
+    await db.flush()
+
+    from app.core.audit.service import audit
+    await audit(db, tenant_id=tenant_id, user_id=imported_by,
+        action="timeentry.import", resource_type="time_entry_import",
+        resource_id=str(batch.id),
+        detail={"project_id": str(project_id), "format": source_format,
+                "total_rows": total, "imported_rows": valid,
+                "rejected_rows": total - valid},
+    )
+    await db.refresh(batch)
+    return batch
+
+
+async def get_import(db: AsyncSession, import_id: uuid.UUID) -> TimeEntryImport | None:
+    result = await db.execute(
+        select(TimeEntryImport).where(TimeEntryImport.id == import_id)
+    )
+    return result.scalar_one_or_none()
+
+
+async def stream_rejects_csv(
+    tenant_id: uuid.UUID, user_id: uuid.UUID, import_id: uuid.UUID
+) -> AsyncIterator[str]:
+    """
+    Rejects report as CSV, streamed with a server-side cursor.
+    Uses its own session: request-scoped sessions are closed before a
+    StreamingResponse body is sent.
+    """
+    from app.db.session import get_session, set_rls_context
+
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(["row_no", "reason", "raw_line"])
+    async with get_session() as db:
+        await set_rls_context(db, tenant_id, user_id)
+        result = await db.stream(
+            select(
+                TimeEntryImportReject.row_no,
+                TimeEntryImportReject.reason,
+                TimeEntryImportReject.raw_line,
+            ).where(
+                TimeEntryImportReject.import_id == import_id,
+                TimeEntryImportReject.tenant_id == tenant_id,
+            ).order_by(TimeEntryImportReject.row_no)
+            .execution_options(yield_per=1000)
+        )
+        async for partition in result.partitions(1000):
+            for row in partition:
+                writer.writerow(row)
+            yield buf.getvalue()
+            buf.seek(0)
+            buf.truncate()
+    if buf.tell():
+        yield buf.getvalue()
@@ -1,20 +1,20 @@
 import uuid
-from datetime import datetime, date
+from datetime import datetime, date, time
 from sqlalchemy import (
-    Boolean, DateTime, Date, String, Text,
-    ForeignKey, Integer, UniqueConstraint, Index
+    Boolean, DateTime, Date, Time, String, Text,
+    ForeignKey, Integer, UniqueConstraint, Index, text
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from app.db.base import Base, TimestampMixin, SoftDeleteMixin, TenantScopedMixin
+from app.db.base import Base, TimestampMixin, SoftDeleteMixin, TenantScopedMixin, VersionedMixin
 
 
-class Timesheet(Base, TimestampMixin, SoftDeleteMixin, TenantScopedMixin):
+class Timesheet(Base, TimestampMixin, SoftDeleteMixin, TenantScopedMixin, VersionedMixin):
     """
     One timesheet per user per ISO week.
     status: open → submitted → approved → locked
     Reopen requires explicit admin action + audit.
-    Row-level locked on all transitions.
+    Transitions are guarded by the version column (VersionedMixin), not row locks.
     """
     __tablename__ = "timesheets"
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -38,13 +38,14 @@ class Timesheet(Base, TimestampMixin, SoftDeleteMixin, TenantScopedMixin):
     )
 
 
-class TimeEntry(Base, TimestampMixin, SoftDeleteMixin, TenantScopedMixin):
+class TimeEntry(Base, TimestampMixin, SoftDeleteMixin, TenantScopedMixin, VersionedMixin):
     """
     Single time entry within a timesheet.
     Immutable once timesheet is locked.
     is_adjustment=True entries reference original_entry_id and contain delta_minutes.
     Cross-midnight entries allowed; compliance splits per local day.
     Overlap check excludes rejected entries.
+    Open entry (clocked in, on site): end_time IS NULL – at most one per user.
     """
     __tablename__ = "time_entries"
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -53,7 +54,7 @@ class TimeEntry(Base, TimestampMixin, SoftDeleteMixin, TenantScopedMixin):
     project_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("projects.id", ondelete="CASCADE"), nullable=False, index=True)
     work_date: Mapped[date] = mapped_column(Date, nullable=False)
     start_time: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
-    end_time: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    end_time: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     break_minutes: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
     net_minutes: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
@@ -63,6 +64,20 @@ class TimeEntry(Base, TimestampMixin, SoftDeleteMixin, TenantScopedMixin):
     original_entry_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), ForeignKey("time_entries.id", ondelete="SET NULL"), nullable=True)
     delta_minutes: Mapped[int | None] = mapped_column(Integer, nullable=True)
     timesheet: Mapped["Timesheet"] = relationship(back_populates="entries")
+    __table_args__ = (
+        Index(
+            "ix_time_entries_open", "tenant_id", "project_id",
+            postgresql_where=text("end_time IS NULL AND is_deleted = false"),
+        ),
+        Index(
+            "uq_time_entries_one_open_per_user", "tenant_id", "user_id", unique=True,
+            postgresql_where=text("end_time IS NULL AND is_deleted = false"),
+        ),
+        Index(
+            "ix_time_entries_adjustments_created", "tenant_id", "created_at",
+            postgresql_where=text("is_adjustment = true AND is_deleted = false"),
+        ),
+    )
 
 
 class ComplianceRule(Base, TimestampMixin, SoftDeleteMixin, TenantScopedMixin):
@@ -112,9 +127,36 @@ class ComplianceResult(Base, TimestampMixin, TenantScopedMixin):
     timesheet: Mapped["Timesheet"] = relationship(back_populates="compliance_results")
 
 
+class OvertimePolicy(Base, TimestampMixin, TenantScopedMixin):
+    """
+    Overtime / supplement bands used when payroll lines are generated.
+    One row per tenant; tenants without a row use the AML defaults
+    (9 h per day, 40 h per week).
+    Night window is local time and may wrap midnight (21:00 → 06:00).
+    weekend_days_json: ISO weekdays (1 = Monday … 7 = Sunday).
+    Overtime is 50 % unless it falls in the night window / on a weekend day
+    and the corresponding overtime_100_* flag is set.
+    """
+    __tablename__ = "overtime_policies"
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    daily_limit_minutes: Mapped[int] = mapped_column(Integer, nullable=False, default=540)
+    weekly_limit_minutes: Mapped[int] = mapped_column(Integer, nullable=False, default=2400)
+    night_start: Mapped[time] = mapped_column(Time, nullable=False, default=time(21, 0))
+    night_end: Mapped[time] = mapped_column(Time, nullable=False, default=time(6, 0))
+    weekend_days_json: Mapped[str] = mapped_column(Text, nullable=False, default="[6, 7]")
+    overtime_100_at_night: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
+    overtime_100_on_weekend: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
+    __table_args__ = (
+        UniqueConstraint("tenant_id", name="uq_overtime_policy_tenant"),
+    )
+
+
 class PayrollExport(Base, TimestampMixin, SoftDeleteMixin, TenantScopedMixin):
     """
     Payroll export batch.
+    mode: full (approved sheets in period) | delta (new sheets + unexported
+    adjustments created since high_water_mark of the last sent delta export,
+    less a margin for late commits)
     status: generated → sent → voided
     When marked sent: related timesheets set to locked.
     Double export prevention: timesheets cannot be in two non-voided exports.
@@ -132,6 +174,10 @@ class PayrollExport(Base, TimestampMixin, SoftDeleteMixin, TenantScopedMixin):
     voided_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     voided_by: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
     void_reason: Mapped[str | None] = mapped_column(Text, nullable=True)
+    mode: Mapped[str] = mapped_column(String(20), nullable=False, default="full")
+    high_water_mark: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    # Snapshot of the overtime policy the bands were computed with
+    overtime_policy_json: Mapped[str | None] = mapped_column(Text, nullable=True)
     lines: Mapped[list["PayrollExportLine"]] = relationship(back_populates="export", lazy="noload")
 
 
@@ -139,6 +185,8 @@ class PayrollExportLine(Base, TimestampMixin, TenantScopedMixin):
     """
     One line per user per timesheet in the export.
     net_minutes: netto minutter etter justeringer.
+    ordinary + overtime_50 + overtime_100 = net_minutes (adjustments count as ordinary).
+    night_minutes / weekend_minutes are supplements and overlap the bands above.
     source_entry_ids_json: list of entry UUIDs included.
     """
     __tablename__ = "payroll_export_lines"
@@ -148,8 +196,62 @@ class PayrollExportLine(Base, TimestampMixin, TenantScopedMixin):
     user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="RESTRICT"), nullable=False, index=True)
     project_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("projects.id", ondelete="RESTRICT"), nullable=False)
     net_minutes: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    ordinary_minutes: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    overtime_50_minutes: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    overtime_100_minutes: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    night_minutes: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    weekend_minutes: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
     source_entry_ids_json: Mapped[str | None] = mapped_column(Text, nullable=True)
     export: Mapped["PayrollExport"] = relationship(back_populates="lines")
     __table_args__ = (
         UniqueConstraint("export_id", "timesheet_id", name="uq_export_line_timesheet"),
     )
+
+
+class PayrollExportLineEntry(Base, TenantScopedMixin):
+    """
+    Reverse index: which export line included which time entry.
+    Regular entries and adjustments are both linked; lookups go by entry_id.
+    source_entry_ids_json on the line is kept for API compatibility.
+    """
+    __tablename__ = "payroll_export_line_entries"
+    line_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("payroll_export_lines.id", ondelete="CASCADE"), primary_key=True)
+    entry_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("time_entries.id", ondelete="RESTRICT"), primary_key=True, index=True)
+    export_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("payroll_exports.id", ondelete="CASCADE"), nullable=False, index=True)
+
+
+class TimeEntryImport(Base, TimestampMixin, TenantScopedMixin):
+    """
+    One bulk import of punch data (time clocks / turnstiles) into a project.
+    source_format: csv | ndjson
+    status: processing → completed
+    Rows are streamed into a per-transaction staging table with COPY, validated
+    set-wise in SQL and merged into time_entries in one INSERT ... SELECT.
+    """
+    __tablename__ = "time_entry_imports"
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    project_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("projects.id", ondelete="CASCADE"), nullable=False, index=True)
+    source_format: Mapped[str] = mapped_column(String(20), nullable=False)
+    status: Mapped[str] = mapped_column(String(50), nullable=False, default="processing")
+    total_rows: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    imported_rows: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    rejected_rows: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    imported_by: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="RESTRICT"), nullable=False)
+    completed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+
+class TimeEntryImportReject(Base, TenantScopedMixin):
+    """
+    One rejected source row of a TimeEntryImport.
+    reason: machine-readable code (e.g. overlaps_existing, no_timesheet).
+    raw_line: the original row as received, for the downloadable rejects report.
+    """
+    __tablename__ = "time_entry_import_rejects"
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    import_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("time_entry_imports.id", ondelete="CASCADE"), nullable=False)
+    row_no: Mapped[int] = mapped_column(Integer, nullable=False)
+    reason: Mapped[str] = mapped_column(String(100), nullable=False)
+    raw_line: Mapped[str | None] = mapped_column(Text, nullable=True)
+    __table_args__ = (
+        Index("ix_time_entry_import_rejects_import_row", "import_id", "row_no"),
+    )
@@ -0,0 +1,187 @@
+"""
+Overtime / supplement classification for payroll lines.
+
+Every regular entry of an export is classified in one set-based query:
+
+  1. entries are cut into local-time segments at midnight and at the edges of
+     the night window (the break is taken off the start of the entry, as in
+     the compliance split),
+  2. running sums per user and local day give the minutes beyond the daily
+     limit; running sums of the remaining ordinary minutes per user and ISO
+     week give the minutes beyond the weekly limit,
+  3. overtime in the night window / on a weekend day goes to the 100 % band
+     (when the policy says so), the rest to 50 %,
+  4. everything is summed per timesheet.
+
+The weekly sum runs over all sheets of the user in the export, so a worker on
+two projects the same week gets overtime on whichever segments come last.
+Segment lengths are measured in UTC, so DST switch nights count real minutes.
+Local time is the tenant zone, which is settings.LOCAL_TIMEZONE until tenants
+carry a zone of their own.
+Public holidays are not modelled.
+"""
+import json
+import uuid
+from dataclasses import dataclass
+from datetime import time, timedelta
+from zoneinfo import ZoneInfo
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.timesheets.models import OvertimePolicy
+
+DEFAULT_POLICY = {
+    "daily_limit_minutes": 540,      # AML § 10-4 (1): 9 h per 24 h
+    "weekly_limit_minutes": 2400,    # AML § 10-4 (1): 40 h per 7 days
+    "night_start": time(21, 0),
+    "night_end": time(6, 0),
+    "weekend_days_json": "[6, 7]",
+    "overtime_100_at_night": True,
+    "overtime_100_on_weekend": True,
+}
+
+
+@dataclass
+class BandTotals:
+    overtime_50_minutes: int = 0
+    overtime_100_minutes: int = 0
+    night_minutes: int = 0
+    weekend_minutes: int = 0
+
+
+async def get_policy(db: AsyncSession, tenant_id: uuid.UUID) -> OvertimePolicy:
+    """Tenant policy, or a transient (unsaved) policy with the defaults."""
+    result = await db.execute(
+        select(OvertimePolicy).where(OvertimePolicy.tenant_id == tenant_id)
+    )
+    return result.scalar_one_or_none() or OvertimePolicy(tenant_id=tenant_id, **DEFAULT_POLICY)
+
+
+def policy_snapshot(policy: OvertimePolicy) -> str:
+    return json.dumps({
+        "daily_limit_minutes": policy.daily_limit_minutes,
+        "weekly_limit_minutes": policy.weekly_limit_minutes,
+        "night_start": policy.night_start.strftime("%H:%M"),
+        "night_end": policy.night_end.strftime("%H:%M"),
+        "weekend_days": json.loads(policy.weekend_days_json),
+        "overtime_100_at_night": policy.overtime_100_at_night,
+        "overtime_100_on_weekend": policy.overtime_100_on_weekend,
+    })
+
+
+def _as_interval(t: time) -> timedelta:
+    return timedelta(hours=t.hour, minutes=t.minute)
+
+
+def _policy_params(policy: OvertimePolicy, tz: ZoneInfo) -> dict:
+    return {
+        "tz": tz.key,
+        "daily_limit": policy.daily_limit_minutes,
+        "weekly_limit": policy.weekly_limit_minutes,
+        "night_start": _as_interval(policy.night_start),
+        "night_end": _as_interval(policy.night_end),
+        "weekend_days": [int(d) for d in json.loads(policy.weekend_days_json)],
+        "ot100_night": policy.overtime_100_at_night,
+        "ot100_weekend": policy.overtime_100_on_weekend,
+    }
+
+
+_BANDS_SQL = text("""
+WITH params AS (
+    SELECT CAST(:tz AS text)                 AS tz,
+           CAST(:daily_limit AS int)         AS daily_limit,
+           CAST(:weekly_limit AS int)        AS weekly_limit,
+           CAST(:night_start AS interval)    AS ns,
+           CAST(:night_end AS interval)      AS ne,
+           CAST(:weekend_days AS int[])      AS weekend_days,
+           CAST(:ot100_night AS boolean)     AS ot100_night,
+           CAST(:ot100_weekend AS boolean)   AS ot100_weekend
+),
+entries AS (
+    SELECT e.timesheet_id, e.user_id,
+           (e.start_time + make_interval(mins => e.break_minutes)) AT TIME ZONE p.tz AS ls,
+           e.end_time AT TIME ZONE p.tz AS le
+    FROM time_entries e, params p
+    WHERE e.tenant_id = CAST(:tenant_id AS uuid)
+      AND e.timesheet_id = ANY(CAST(:sheet_ids AS uuid[]))
+      AND e.is_deleted = false AND e.status <> 'rejected'
+      AND e.is_adjustment = false AND e.end_time IS NOT NULL
+      AND e.end_time > e.start_time + make_interval(mins => e.break_minutes)
+),
+segments AS (
+    SELECT en.timesheet_id, en.user_id,
+           greatest(en.ls, w.lo) AS seg_start,
+           least(en.le, w.hi)    AS seg_end,
+           w.is_night
+    FROM entries en
+    CROSS JOIN params p
+    CROSS JOIN LATERAL generate_series(date_trunc('day', en.ls), en.le, interval '1 day') AS d(day)
+    CROSS JOIN LATERAL (VALUES
+        (d.day,                          d.day + least(p.ns, p.ne),    p.ns > p.ne),
+        (d.day + least(p.ns, p.ne),      d.day + greatest(p.ns, p.ne), p.ns < p.ne),
+        (d.day + greatest(p.ns, p.ne),   d.day + interval '1 day',     p.ns > p.ne)
+    ) AS w(lo, hi, is_night)
+    WHERE greatest(en.ls, w.lo) < least(en.le, w.hi)
+),
+minutes AS (
+    SELECT s.timesheet_id, s.user_id, s.seg_start, s.seg_end, s.is_night,
+           CAST(s.seg_start AS date) AS local_date,
+           EXTRACT(ISODOW FROM s.seg_start)::int = ANY(p.weekend_days) AS is_weekend,
+           EXTRACT(EPOCH FROM (s.seg_end AT TIME ZONE p.tz) - (s.seg_start AT TIME ZONE p.tz)) / 60 AS mins
+    FROM segments s, params p
+),
+daily AS (
+    SELECT m.*,
+           greatest(0, least(m.mins,
+               sum(m.mins) OVER (
+                   PARTITION BY m.user_id, m.local_date
+                   ORDER BY m.seg_start, m.seg_end ROWS UNBOUNDED PRECEDING
+               ) - p.daily_limit
+           )) AS daily_ot
+    FROM minutes m, params p
+),
+weekly AS (
+    SELECT d.*,
+           greatest(0, least(d.mins - d.daily_ot,
+               sum(d.mins - d.daily_ot) OVER (
+                   PARTITION BY d.user_id, date_trunc('week', d.local_date)
+                   ORDER BY d.seg_start, d.seg_end ROWS UNBOUNDED PRECEDING
+               ) - p.weekly_limit
+           )) AS weekly_ot,
+           (d.is_night AND p.ot100_night) OR (d.is_weekend AND p.ot100_weekend) AS is_ot100
+    FROM daily d, params p
+)
+SELECT timesheet_id,
+       round(sum(CASE WHEN is_ot100 THEN 0 ELSE daily_ot + weekly_ot END))::int AS overtime_50,
+       round(sum(CASE WHEN is_ot100 THEN daily_ot + weekly_ot ELSE 0 END))::int AS overtime_100,
+       round(sum(CASE WHEN is_night THEN mins ELSE 0 END))::int                 AS night,
+       round(sum(CASE WHEN is_weekend THEN mins ELSE 0 END))::int               AS weekend
+FROM weekly
+GROUP BY timesheet_id
+""")
+
+
+async def compute_bands(
+    db: AsyncSession,
+    tenant_id: uuid.UUID,
+    sheet_ids: list[uuid.UUID],
+    policy: OvertimePolicy,
+    tz: ZoneInfo,
+) -> dict[uuid.UUID, BandTotals]:
+    """Band totals per timesheet for all given sheets in one round trip."""
+    if not sheet_ids:
+        return {}
+    result = await db.execute(_BANDS_SQL, {
+        "tenant_id": str(tenant_id),
+        "sheet_ids": [str(s) for s in sheet_ids],
+        **_policy_params(policy, tz),
+    })
+    return {
+        row.timesheet_id: BandTotals(
+            overtime_50_minutes=row.overtime_50,
+            overtime_100_minutes=row.overtime_100,
+            night_minutes=row.night,
+            weekend_minutes=row.weekend,
+        )
+        for row in result
+    }
@@ -0,0 +1,154 @@
+"""
+Live on-site presence (roll call) from open time entries.
+
+An open entry is a clock-in without end_time. The partial index
+ix_time_entries_open makes "who is on site" a cheap lookup in the DB; on top
+of that each process keeps an in-memory map per (tenant, project) so the
+roll-call endpoint answers without touching the database at all.
+
+The map is rebuilt from the DB at startup and kept current by clock-in /
+clock-out. Changes are staged on the session and only applied after the
+transaction commits, so a rolled-back punch never shows up in the roll call.
+"""
+import logging
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.timesheets.models import TimeEntry
+
+logger = logging.getLogger(__name__)
+
+_PENDING_KEY = "presence_ops"
+
+
+@dataclass(frozen=True)
+class Presence:
+    user_id: uuid.UUID
+    entry_id: uuid.UUID
+    since: datetime
+    full_name: str | None
+    email: str | None
+
+
+class PresenceRegistry:
+    """In-memory {(tenant_id, project_id): {user_id: Presence}}."""
+
+    def __init__(self) -> None:
+        self._projects: dict[tuple[uuid.UUID, uuid.UUID], dict[uuid.UUID, Presence]] = {}
+        self.loaded_at: datetime | None = None
+
+    def clock_in(self, tenant_id: uuid.UUID, project_id: uuid.UUID, presence: Presence) -> None:
+        self._projects.setdefault((tenant_id, project_id), {})[presence.user_id] = presence
+
+    def clock_out(self, tenant_id: uuid.UUID, project_id: uuid.UUID, user_id: uuid.UUID) -> None:
+        on_site = self._projects.get((tenant_id, project_id))
+        if on_site is not None:
+            on_site.pop(user_id, None)
+            if not on_site:
+                del self._projects[(tenant_id, project_id)]
+
+    def replace_project(
+        self, tenant_id: uuid.UUID, project_id: uuid.UUID, people: list[Presence]
+    ) -> None:
+        if people:
+            self._projects[(tenant_id, project_id)] = {p.user_id: p for p in people}
+        else:
+            self._projects.pop((tenant_id, project_id), None)
+
+    def replace_all(self, rows: list[tuple[uuid.UUID, uuid.UUID, Presence]], loaded_at: datetime) -> None:
+        projects: dict[tuple[uuid.UUID, uuid.UUID], dict[uuid.UUID, Presence]] = {}
+        for tenant_id, project_id, presence in rows:
+            projects.setdefault((tenant_id, project_id), {})[presence.user_id] = presence
+        self._projects = projects
+        self.loaded_at = loaded_at
+
+    def roll_call(self, tenant_id: uuid.UUID, project_id: uuid.UUID) -> list[Presence]:
+        on_site = self._projects.get((tenant_id, project_id), {})
+        return sorted(on_site.values(), key=lambda p: p.since)
+
+
+registry = PresenceRegistry()
+
+
+# ── Transaction-aware staging ─────────────────────────────────────────────────
+
+def stage_clock_in(db: AsyncSession, tenant_id: uuid.UUID, project_id: uuid.UUID, presence: Presence) -> None:
+    db.sync_session.info.setdefault(_PENDING_KEY, []).append(
+        ("in", tenant_id, project_id, presence)
+    )
+
+
+def stage_clock_out(db: AsyncSession, tenant_id: uuid.UUID, project_id: uuid.UUID, user_id: uuid.UUID) -> None:
+    db.sync_session.info.setdefault(_PENDING_KEY, []).append(
+        ("out", tenant_id, project_id, user_id)
+    )
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_pending(session: Session) -> None:
+    for op, tenant_id, project_id, payload in session.info.pop(_PENDING_KEY, []):
+        if op == "in":
+            registry.clock_in(tenant_id, project_id, payload)
+        else:
+            registry.clock_out(tenant_id, project_id, payload)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+# ── Loading from the DB ───────────────────────────────────────────────────────
+
+def _open_entries_query():
+    from app.core.rbac.models import User
+    return (
+        select(
+            TimeEntry.tenant_id, TimeEntry.project_id, TimeEntry.user_id,
+            TimeEntry.id, TimeEntry.start_time, User.full_name, User.email,
+        )
+        .join(User, User.id == TimeEntry.user_id)
+        .where(TimeEntry.end_time.is_(None), TimeEntry.is_deleted == False)
+    )
+
+
+def _to_presence(row) -> Presence:
+    return Presence(
+        user_id=row.user_id, entry_id=row.id, since=row.start_time,
+        full_name=row.full_name, email=row.email,
+    )
+
+
+async def rebuild(db: AsyncSession) -> int:
+    """Reload the whole map from open entries (startup). Returns people on site."""
+    result = await db.execute(_open_entries_query())
+    rows = [(r.tenant_id, r.project_id, _to_presence(r)) for r in result.all()]
+    registry.replace_all(rows, datetime.now(timezone.utc))
+    return len(rows)
+
+
+async def refresh_project(db: AsyncSession, tenant_id: uuid.UUID, project_id: uuid.UUID) -> None:
+    """Re-sync a single project from the partial index (e.g. after a multi-worker drift)."""
+    result = await db.execute(
+        _open_entries_query().where(
+            TimeEntry.tenant_id == tenant_id,
+            TimeEntry.project_id == project_id,
+        )
+    )
+    registry.replace_project(tenant_id, project_id, [_to_presence(r) for r in result.all()])
+
+
+async def rebuild_on_startup() -> None:
+    from app.db.session import get_session
+    try:
+        async with get_session() as db:
+            count = await rebuild(db)
+    except Exception:
+        # DB not reachable / not migrated yet – start empty, punches fill it in
+        logger.exception("Presence map rebuild failed; starting with an empty roll call")
+        return
+    logger.info("Presence map loaded: %d on site", count)
@@ -1,18 +1,26 @@
 import uuid
-from fastapi import APIRouter, Depends, HTTPException, Query
+from datetime import datetime, timezone
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.timesheets import service
+from app.core.timesheets import service, importer, presence
+from app.core.timesheets.models import Timesheet
 from app.core.timesheets.schemas import (
     TimesheetCreate, TimesheetRead, ReopenRequest,
     TimeEntryCreate, TimeEntryUpdate, TimeEntryRead,
-    AdjustmentCreate,
+    AdjustmentCreate, TimeEntryImportRead,
+    ClockInRequest, ClockOutRequest, RollCallRead,
     ComplianceRuleCreate, ComplianceRuleRead, ComplianceResultRead,
     ViolationResolveRequest,
+    OvertimePolicyUpdate, OvertimePolicyRead,
     PayrollExportCreate, PayrollExportRead, PayrollExportLineRead,
+    PayrollInclusionRead,
     VoidExportRequest,
 )
+from app.db.fieldsets import FIELDS_QUERY, parse_fields, load_only_fields, sparse_model, sparse_rows
 from app.dependencies import get_db, get_current_user, CurrentUser
+from app.http_cache import check_if_match, not_modified_since, set_etag
 
 router = APIRouter(tags=["timesheets"])
 
@@ -47,60 +55,85 @@ async def list_timesheets(
 @router.get("/timesheets/{timesheet_id}", response_model=TimesheetRead)
 async def get_timesheet(
     timesheet_id: uuid.UUID,
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db),
     _: CurrentUser = Depends(get_current_user),
 ):
+    if (unchanged := await not_modified_since(request, db, Timesheet, timesheet_id)) is not None:
+        return unchanged
     sheet = await service.get_timesheet(db, timesheet_id)
     if not sheet:
         raise HTTPException(404, "Timesheet not found")
+    set_etag(response, sheet)
     return sheet
 
 
 @router.post("/timesheets/{timesheet_id}/submit", response_model=TimesheetRead)
 async def submit_timesheet(
     timesheet_id: uuid.UUID,
+    response: Response,
+    if_match: str | None = Header(None),
     db: AsyncSession = Depends(get_db),
     current: CurrentUser = Depends(get_current_user),
 ):
-    return await service.submit_timesheet(db, timesheet_id, current.user_id, current.tenant_id)
+    sheet = await service.submit_timesheet(db, timesheet_id, current.user_id, current.tenant_id, if_match)
+    set_etag(response, sheet)
+    return sheet
 
 
 @router.post("/timesheets/{timesheet_id}/approve", response_model=TimesheetRead)
 async def approve_timesheet(
     timesheet_id: uuid.UUID,
+    response: Response,
+    if_match: str | None = Header(None),
     db: AsyncSession = Depends(get_db),
     current: CurrentUser = Depends(get_current_user),
 ):
-    return await service.approve_timesheet(db, timesheet_id, current.user_id, current.tenant_id)
+    sheet = await service.approve_timesheet(db, timesheet_id, current.user_id, current.tenant_id, if_match)
+    set_etag(response, sheet)
+    return sheet
 
 
 @router.post("/timesheets/{timesheet_id}/reject", response_model=TimesheetRead)
 async def reject_timesheet(
     timesheet_id: uuid.UUID,
+    response: Response,
     reason: str = Query(..., min_length=1),
+    if_match: str | None = Header(None),
     db: AsyncSession = Depends(get_db),
     current: CurrentUser = Depends(get_current_user),
 ):
-    return await service.reject_timesheet(db, timesheet_id, current.user_id, current.tenant_id, reason)
+    sheet = await service.reject_timesheet(db, timesheet_id, current.user_id, current.tenant_id, reason, if_match)
+    set_etag(response, sheet)
+    return sheet
 
 
 @router.post("/timesheets/{timesheet_id}/lock", response_model=TimesheetRead)
 async def lock_timesheet(
     timesheet_id: uuid.UUID,
+    response: Response,
+    if_match: str | None = Header(None),
     db: AsyncSession = Depends(get_db),
     current: CurrentUser = Depends(get_current_user),
 ):
-    return await service.lock_timesheet(db, timesheet_id, current.user_id, current.tenant_id)
+    sheet = await service.lock_timesheet(db, timesheet_id, current.user_id, current.tenant_id, if_match)
+    set_etag(response, sheet)
+    return sheet
 
 
 @router.post("/timesheets/{timesheet_id}/reopen", response_model=TimesheetRead)
 async def reopen_timesheet(
     timesheet_id: uuid.UUID,
     data: ReopenRequest,
+    response: Response,
+    if_match: str | None = Header(None),
     db: AsyncSession = Depends(get_db),
     current: CurrentUser = Depends(get_current_user),
 ):
-    return await service.reopen_timesheet(db, timesheet_id, current.user_id, current.tenant_id, data)
+    sheet = await service.reopen_timesheet(db, timesheet_id, current.user_id, current.tenant_id, data, if_match)
+    set_etag(response, sheet)
+    return sheet
 
 
 # ── Time entries ──────────────────────────────────────────────────────────────
@@ -131,16 +164,21 @@ async def list_entries(
 async def update_entry(
     entry_id: uuid.UUID,
     data: TimeEntryUpdate,
+    response: Response,
+    if_match: str | None = Header(None),
     db: AsyncSession = Depends(get_db),
     current: CurrentUser = Depends(get_current_user),
 ):
     entry = await service.get_entry(db, entry_id)
     if not entry:
         raise HTTPException(404, "Entry not found")
+    check_if_match(if_match, entry)
     sheet = await service.get_timesheet(db, entry.timesheet_id)
     if not sheet:
         raise HTTPException(404, "Timesheet not found")
-    return await service.update_entry(db, current.tenant_id, entry, sheet, data, current.user_id)
+    entry = await service.update_entry(db, current.tenant_id, entry, sheet, data, current.user_id)
+    set_etag(response, entry)
+    return entry
 
 
 @router.delete("/time-entries/{entry_id}", status_code=204)
@@ -171,6 +209,102 @@ async def create_adjustment(
     return await service.create_adjustment(db, current.tenant_id, sheet, data, current.user_id)
 
 
+# ── Clock-in / roll call ──────────────────────────────────────────────────────
+
+@router.post("/projects/{project_id}/clock-in", response_model=TimeEntryRead, status_code=201)
+async def clock_in(
+    project_id: uuid.UUID,
+    data: ClockInRequest,
+    db: AsyncSession = Depends(get_db),
+    current: CurrentUser = Depends(get_current_user),
+):
+    return await service.clock_in(db, current.tenant_id, project_id, data, current.user_id)
+
+
+@router.post("/projects/{project_id}/clock-out", response_model=TimeEntryRead)
+async def clock_out(
+    project_id: uuid.UUID,
+    data: ClockOutRequest,
+    db: AsyncSession = Depends(get_db),
+    current: CurrentUser = Depends(get_current_user),
+):
+    return await service.clock_out(db, current.tenant_id, project_id, data, current.user_id)
+
+
+@router.get("/projects/{project_id}/roll-call", response_model=RollCallRead)
+async def roll_call(
+    project_id: uuid.UUID,
+    refresh: bool = Query(False),
+    db: AsyncSession = Depends(get_db),
+    current: CurrentUser = Depends(get_current_user),
+):
+    """
+    Who is on site right now. Served from the in-process presence map;
+    ?refresh=true re-reads this project's open entries first.
+    """
+    if refresh:
+        await presence.refresh_project(db, current.tenant_id, project_id)
+    people = presence.registry.roll_call(current.tenant_id, project_id)
+    return RollCallRead(
+        project_id=project_id,
+        count=len(people),
+        as_of=datetime.now(timezone.utc),
+        people=people,
+    )
+
+
+# ── Bulk import ─────────────────────────────────────────────────────────────
+
+@router.post("/projects/{project_id}/time-entries/import", response_model=TimeEntryImportRead, status_code=201)
+async def import_time_entries(
+    project_id: uuid.UUID,
+    request: Request,
+    format: str | None = Query(None, pattern="^(csv|ndjson)$"),
+    db: AsyncSession = Depends(get_db),
+    current: CurrentUser = Depends(get_current_user),
+):
+    """
+    Streamed bulk import of punch data. Body is raw CSV (header row required)
+    or NDJSON; format is taken from ?format= or the Content-Type header.
+    Columns: user_id | user_email, work_date (optional), start_time, end_time,
+    break_minutes (optional), description (optional).
+    """
+    if format is None:
+        content_type = request.headers.get("content-type", "")
+        format = "ndjson" if "ndjson" in content_type or "jsonl" in content_type else "csv"
+    return await importer.import_time_entries(
+        db, current.tenant_id, project_id, request.stream(), format, current.user_id
+    )
+
+
+@router.get("/time-entry-imports/{import_id}", response_model=TimeEntryImportRead)
+async def get_import(
+    import_id: uuid.UUID,
+    db: AsyncSession = Depends(get_db),
+    _: CurrentUser = Depends(get_current_user),
+):
+    batch = await importer.get_import(db, import_id)
+    if not batch:
+        raise HTTPException(404, "Import not found")
+    return batch
+
+
+@router.get("/time-entry-imports/{import_id}/rejects.csv")
+async def download_import_rejects(
+    import_id: uuid.UUID,
+    db: AsyncSession = Depends(get_db),
+    current: CurrentUser = Depends(get_current_user),
+):
+    batch = await importer.get_import(db, import_id)
+    if not batch:
+        raise HTTPException(404, "Import not found")
+    return StreamingResponse(
+        importer.stream_rejects_csv(current.tenant_id, current.user_id, import_id),
+        media_type="text/csv",
+        headers={"Content-Disposition": f'attachment; filename="import-{import_id}-rejects.csv"'},
+    )
+
+
 # ── Compliance ────────────────────────────────────────────────────────────────
 
 @router.post("/compliance/rules", response_model=ComplianceRuleRead, status_code=201)
@@ -203,20 +337,27 @@ async def evaluate_compliance(
     return await service.run_compliance(db, sheet, current.tenant_id)
 
 
-@router.get("/timesheets/{timesheet_id}/compliance", response_model=list[ComplianceResultRead])
+@router.get(
+    "/timesheets/{timesheet_id}/compliance",
+    response_model=list[sparse_model(ComplianceResultRead)],
+    response_model_exclude_unset=True,
+)
 async def get_compliance_results(
     timesheet_id: uuid.UUID,
+    fields: str | None = FIELDS_QUERY,
     db: AsyncSession = Depends(get_db),
     _: CurrentUser = Depends(get_current_user),
 ):
     from sqlalchemy import select
     from app.core.timesheets.models import ComplianceResult
+    selected = parse_fields(ComplianceResultRead, fields, heavy={"per_day_json", "rule_snapshot_json"})
     result = await db.execute(
         select(ComplianceResult).where(
             ComplianceResult.timesheet_id == timesheet_id
         ).order_by(ComplianceResult.evaluated_at.desc())
+        .options(load_only_fields(ComplianceResult, selected))
     )
-    return list(result.scalars().all())
+    return sparse_rows(result.scalars().all(), selected)
 
 
 @router.post("/compliance/results/{result_id}/resolve", response_model=ComplianceResultRead)
@@ -229,6 +370,25 @@ async def resolve_violation(
     return await service.resolve_violation(db, result_id, current.user_id, current.tenant_id, data)
 
 
+# ── Overtime policy ───────────────────────────────────────────────────────────
+
+@router.get("/payroll/overtime-policy", response_model=OvertimePolicyRead)
+async def get_overtime_policy(
+    db: AsyncSession = Depends(get_db),
+    current: CurrentUser = Depends(get_current_user),
+):
+    return await service.get_overtime_policy(db, current.tenant_id)
+
+
+@router.put("/payroll/overtime-policy", response_model=OvertimePolicyRead)
+async def set_overtime_policy(
+    data: OvertimePolicyUpdate,
+    db: AsyncSession = Depends(get_db),
+    current: CurrentUser = Depends(get_current_user),
+):
+    return await service.set_overtime_policy(db, current.tenant_id, data, current.user_id)
+
+
 # ── Payroll export ────────────────────────────────────────────────────────────
 
 @router.post("/payroll/exports", response_model=PayrollExportRead, status_code=201)
@@ -274,6 +434,26 @@ async def get_export_lines(
     return list(result.scalars().all())
 
 
+@router.get("/time-entries/{entry_id}/payroll-exports", response_model=list[PayrollInclusionRead])
+async def get_entry_exports(
+    entry_id: uuid.UUID,
+    db: AsyncSession = Depends(get_db),
+    current: CurrentUser = Depends(get_current_user),
+):
+    rows = await service.list_entry_exports(db, current.tenant_id, entry_id)
+    return [PayrollInclusionRead(export=e, line=l) for e, l in rows]
+
+
+@router.get("/timesheets/{timesheet_id}/payroll-exports", response_model=list[PayrollInclusionRead])
+async def get_timesheet_exports(
+    timesheet_id: uuid.UUID,
+    db: AsyncSession = Depends(get_db),
+    current: CurrentUser = Depends(get_current_user),
+):
+    rows = await service.list_timesheet_exports(db, current.tenant_id, timesheet_id)
+    return [PayrollInclusionRead(export=e, line=l) for e, l in rows]
+
+
 @router.post("/payroll/exports/{export_id}/send", response_model=PayrollExportRead)
 async def mark_export_sent(
     export_id: uuid.UUID,
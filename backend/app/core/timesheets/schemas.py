@@ -1,5 +1,5 @@
 import uuid
-from datetime import datetime, date
+from datetime import datetime, date, time
 from pydantic import BaseModel, Field, model_validator
 from typing import Literal
 
@@ -32,6 +32,7 @@ class TimesheetRead(BaseModel):
     locked_by: uuid.UUID | None
     reopened_at: datetime | None
     reopened_by: uuid.UUID | None
+    version: int
     created_at: datetime
 
 
@@ -86,7 +87,7 @@ class TimeEntryRead(BaseModel):
     project_id: uuid.UUID
     work_date: date
     start_time: datetime
-    end_time: datetime
+    end_time: datetime | None
     break_minutes: int
     net_minutes: int
     description: str | None
@@ -94,6 +95,50 @@ class TimeEntryRead(BaseModel):
     is_adjustment: bool
     original_entry_id: uuid.UUID | None
     delta_minutes: int | None
+    version: int
+    created_at: datetime
+
+
+class ClockInRequest(BaseModel):
+    # Set when a site terminal / foreman punches for someone else
+    user_id: uuid.UUID | None = None
+    description: str | None = None
+
+
+class ClockOutRequest(BaseModel):
+    user_id: uuid.UUID | None = None
+    break_minutes: int = Field(0, ge=0)
+    description: str | None = None
+
+
+class PresenceRead(BaseModel):
+    model_config = {"from_attributes": True}
+    user_id: uuid.UUID
+    entry_id: uuid.UUID
+    since: datetime
+    full_name: str | None
+    email: str | None
+
+
+class RollCallRead(BaseModel):
+    project_id: uuid.UUID
+    count: int
+    as_of: datetime
+    people: list[PresenceRead]
+
+
+class TimeEntryImportRead(BaseModel):
+    model_config = {"from_attributes": True}
+    id: uuid.UUID
+    tenant_id: uuid.UUID
+    project_id: uuid.UUID
+    source_format: str
+    status: str
+    total_rows: int
+    imported_rows: int
+    rejected_rows: int
+    imported_by: uuid.UUID
+    completed_at: datetime | None
     created_at: datetime
 
 
@@ -144,12 +189,42 @@ class ViolationResolveRequest(BaseModel):
     resolution_note: str = Field(..., min_length=1)
 
 
+# ── Overtime policy ───────────────────────────────────────────────────────────
+
+class OvertimePolicyUpdate(BaseModel):
+    daily_limit_minutes: int = Field(540, gt=0, le=1440)
+    weekly_limit_minutes: int = Field(2400, gt=0, le=10080)
+    night_start: time = time(21, 0)
+    night_end: time = time(6, 0)
+    weekend_days: list[int] = [6, 7]  # ISO weekdays, 1 = Monday
+    overtime_100_at_night: bool = True
+    overtime_100_on_weekend: bool = True
+
+    @model_validator(mode="after")
+    def check_weekend_days(self):
+        if any(d < 1 or d > 7 for d in self.weekend_days):
+            raise ValueError("weekend_days must be ISO weekdays 1–7")
+        return self
+
+
+class OvertimePolicyRead(BaseModel):
+    model_config = {"from_attributes": True}
+    daily_limit_minutes: int
+    weekly_limit_minutes: int
+    night_start: time
+    night_end: time
+    weekend_days_json: str
+    overtime_100_at_night: bool
+    overtime_100_on_weekend: bool
+
+
 # ── Payroll export ────────────────────────────────────────────────────────────
 
 class PayrollExportCreate(BaseModel):
     period_start: date
     period_end: date
     project_id: uuid.UUID | None = None  # None = all projects in tenant
+    mode: Literal["full", "delta"] = "full"
 
 
 class PayrollExportRead(BaseModel):
@@ -166,6 +241,9 @@ class PayrollExportRead(BaseModel):
     voided_at: datetime | None
     voided_by: uuid.UUID | None
     void_reason: str | None
+    mode: str
+    high_water_mark: datetime | None
+    overtime_policy_json: str | None
     created_at: datetime
 
 
@@ -177,8 +255,18 @@ class PayrollExportLineRead(BaseModel):
     user_id: uuid.UUID
     project_id: uuid.UUID
     net_minutes: int
+    ordinary_minutes: int
+    overtime_50_minutes: int
+    overtime_100_minutes: int
+    night_minutes: int
+    weekend_minutes: int
     source_entry_ids_json: str | None
 
 
+class PayrollInclusionRead(BaseModel):
+    export: PayrollExportRead
+    line: PayrollExportLineRead
+
+
 class VoidExportRequest(BaseModel):
     reason: str = Field(..., min_length=1)
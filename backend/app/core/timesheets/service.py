@@ -2,19 +2,22 @@ import json
 import uuid
 from datetime import datetime, date, timezone, timedelta
 from zoneinfo import ZoneInfo
-from sqlalchemy import select, func, and_, or_
+from sqlalchemy import select, insert, func, and_, or_, case
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.timesheets.models import (
     Timesheet, TimeEntry, ComplianceRule, ComplianceResult,
-    PayrollExport, PayrollExportLine,
+    OvertimePolicy, PayrollExport, PayrollExportLine, PayrollExportLineEntry,
 )
 from app.core.timesheets.schemas import (
     TimesheetCreate, TimeEntryCreate, TimeEntryUpdate,
-    AdjustmentCreate, ComplianceRuleCreate,
-    PayrollExportCreate, ViolationResolveRequest,
+    AdjustmentCreate, ClockInRequest, ClockOutRequest, ComplianceRuleCreate,
+    OvertimePolicyUpdate, PayrollExportCreate, ViolationResolveRequest,
     ReopenRequest, VoidExportRequest,
 )
+from app.http_cache import check_if_match
+from app.settings import get_settings
 
 IMMUTABLE_TIMESHEET_STATUSES = {"locked"}
 EDITABLE_TIMESHEET_STATUSES = {"open"}
@@ -26,7 +29,7 @@ async def _get_tenant_tz(db: AsyncSession, tenant_id: uuid.UUID) -> ZoneInfo:
     from app.core.tenants.models import Tenant
     result = await db.execute(select(Tenant).where(Tenant.id == tenant_id))
     tenant = result.scalar_one_or_none()
-    tz_name = getattr(tenant, "timezone", None) or "UTC"
+    tz_name = getattr(tenant, "timezone", None) or get_settings().LOCAL_TIMEZONE
     try:
         return ZoneInfo(tz_name)
     except Exception:
@@ -78,16 +81,6 @@ async def get_timesheet(db: AsyncSession, timesheet_id: uuid.UUID) -> Timesheet
     return result.scalar_one_or_none()
 
 
-async def get_timesheet_locked(db: AsyncSession, timesheet_id: uuid.UUID) -> Timesheet | None:
-    """Row-level lock for state transitions."""
-    result = await db.execute(
-        select(Timesheet)
-        .where(Timesheet.id == timesheet_id, Timesheet.is_deleted == False)
-        .with_for_update()
-    )
-    return result.scalar_one_or_none()
-
-
 async def list_timesheets(
     db: AsyncSession,
     tenant_id: uuid.UUID,
@@ -111,15 +104,19 @@ async def list_timesheets(
 
 
 # ── State machine ─────────────────────────────────────────────────────────────
+# No row locks: Timesheet is versioned, so of two concurrent transitions the
+# second one's UPDATE matches no row and is answered with 412. Idempotent
+# repeats are checked before If-Match, so a retried request still succeeds.
 
 async def submit_timesheet(
     db: AsyncSession,
     timesheet_id: uuid.UUID,
     submitted_by: uuid.UUID,
     tenant_id: uuid.UUID,
+    if_match: str | None = None,
 ) -> Timesheet:
     from fastapi import HTTPException
-    sheet = await get_timesheet_locked(db, timesheet_id)
+    sheet = await get_timesheet(db, timesheet_id)
     if not sheet:
         raise HTTPException(404, "Timesheet not found")
 
@@ -128,6 +125,17 @@ async def submit_timesheet(
         return sheet
     if sheet.status != "open":
         raise HTTPException(400, f"Cannot submit timesheet with status '{sheet.status}'")
+    check_if_match(if_match, sheet)
+
+    open_entries = await db.execute(
+        select(func.count(TimeEntry.id)).where(
+            TimeEntry.timesheet_id == sheet.id,
+            TimeEntry.end_time.is_(None),
+            TimeEntry.is_deleted == False,
+        )
+    )
+    if open_entries.scalar_one():
+        raise HTTPException(400, "Cannot submit timesheet while entries are still clocked in")
 
     # Run compliance before submit
     violations = await run_compliance(db, sheet, tenant_id)
@@ -157,9 +165,10 @@ async def approve_timesheet(
     timesheet_id: uuid.UUID,
     approved_by: uuid.UUID,
     tenant_id: uuid.UUID,
+    if_match: str | None = None,
 ) -> Timesheet:
     from fastapi import HTTPException
-    sheet = await get_timesheet_locked(db, timesheet_id)
+    sheet = await get_timesheet(db, timesheet_id)
     if not sheet:
         raise HTTPException(404, "Timesheet not found")
 
@@ -168,6 +177,7 @@ async def approve_timesheet(
         return sheet
     if sheet.status != "submitted":
         raise HTTPException(400, f"Cannot approve timesheet with status '{sheet.status}'")
+    check_if_match(if_match, sheet)
 
     # Re-run compliance at approve
     violations = await run_compliance(db, sheet, tenant_id)
@@ -198,15 +208,17 @@ async def reject_timesheet(
     rejected_by: uuid.UUID,
     tenant_id: uuid.UUID,
     reason: str,
+    if_match: str | None = None,
 ) -> Timesheet:
     from fastapi import HTTPException
-    sheet = await get_timesheet_locked(db, timesheet_id)
+    sheet = await get_timesheet(db, timesheet_id)
     if not sheet:
         raise HTTPException(404, "Timesheet not found")
     if sheet.status == "locked":
         raise HTTPException(400, "Cannot reject a locked timesheet")
     if sheet.status not in ("submitted", "approved"):
         raise HTTPException(400, f"Cannot reject timesheet with status '{sheet.status}'")
+    check_if_match(if_match, sheet)
 
     sheet.status = "open"
     await db.flush()
@@ -225,15 +237,17 @@ async def lock_timesheet(
     timesheet_id: uuid.UUID,
     locked_by: uuid.UUID,
     tenant_id: uuid.UUID,
+    if_match: str | None = None,
 ) -> Timesheet:
     from fastapi import HTTPException
-    sheet = await get_timesheet_locked(db, timesheet_id)
+    sheet = await get_timesheet(db, timesheet_id)
     if not sheet:
         raise HTTPException(404, "Timesheet not found")
     if sheet.status == "locked":
         return sheet  # idempotent
     if sheet.status != "approved":
         raise HTTPException(400, f"Cannot lock timesheet with status '{sheet.status}'")
+    check_if_match(if_match, sheet)
 
     sheet.status = "locked"
     sheet.locked_at = datetime.now(timezone.utc)
@@ -255,13 +269,15 @@ async def reopen_timesheet(
     reopened_by: uuid.UUID,
     tenant_id: uuid.UUID,
     data: ReopenRequest,
+    if_match: str | None = None,
 ) -> Timesheet:
     from fastapi import HTTPException
-    sheet = await get_timesheet_locked(db, timesheet_id)
+    sheet = await get_timesheet(db, timesheet_id)
     if not sheet:
         raise HTTPException(404, "Timesheet not found")
     if sheet.status != "locked":
         raise HTTPException(400, f"Only locked timesheets can be reopened. Current status: '{sheet.status}'")
+    check_if_match(if_match, sheet)
 
     sheet.status = "open"
     sheet.reopened_at = datetime.now(timezone.utc)
@@ -305,9 +321,10 @@ async def _check_overlap(
         TimeEntry.status != "rejected",
         TimeEntry.is_deleted == False,
         # Overlap condition: not (end <= other.start OR start >= other.end)
+        # Open (clocked-in) entries have no end and overlap everything after start
         and_(
             TimeEntry.start_time < end_time,
-            TimeEntry.end_time > start_time,
+            or_(TimeEntry.end_time.is_(None), TimeEntry.end_time > start_time),
         ),
     )
     if exclude_entry_id:
@@ -318,7 +335,8 @@ async def _check_overlap(
         raise HTTPException(
             400,
             f"Time entry overlaps with existing entry "
-            f"{existing.start_time.isoformat()} – {existing.end_time.isoformat()}"
+            f"{existing.start_time.isoformat()} – "
+            f"{existing.end_time.isoformat() if existing.end_time else 'open'}"
         )
 
 
@@ -388,6 +406,8 @@ async def update_entry(
         raise HTTPException(400, f"Cannot edit entries on timesheet with status '{sheet.status}'")
     if entry.is_adjustment:
         raise HTTPException(400, "Adjustment entries cannot be edited")
+    if entry.end_time is None and data.end_time is None:
+        raise HTTPException(400, "Entry is still clocked in. Clock out or set end_time.")
 
     new_start = data.start_time or entry.start_time
     new_end = data.end_time or entry.end_time
@@ -399,6 +419,7 @@ async def update_entry(
     await _check_overlap(db, tenant_id, entry.user_id, entry.work_date,
                          new_start, new_end, exclude_entry_id=entry.id)
 
+    was_open = entry.end_time is None
     entry.start_time = new_start
     entry.end_time = new_end
     entry.break_minutes = new_break
@@ -413,6 +434,9 @@ async def update_entry(
         resource_id=str(entry.id),
         detail={"net_minutes": entry.net_minutes},
     )
+    if was_open:
+        from app.core.timesheets import presence
+        presence.stage_clock_out(db, tenant_id, entry.project_id, entry.user_id)
     await db.refresh(entry)
     return entry
 
@@ -432,6 +456,9 @@ async def delete_entry(
 
     entry.is_deleted = True
     await db.flush()
+    if entry.end_time is None:
+        from app.core.timesheets import presence
+        presence.stage_clock_out(db, tenant_id, entry.project_id, entry.user_id)
 
     from app.core.audit.service import audit
     await audit(db, tenant_id=tenant_id, user_id=deleted_by,
@@ -464,6 +491,16 @@ async def create_adjustment(
     if not original:
         raise HTTPException(404, "Original entry not found")
 
+    exported_in = await db.execute(
+        select(PayrollExportLineEntry.export_id)
+        .join(PayrollExport, PayrollExport.id == PayrollExportLineEntry.export_id)
+        .where(
+            PayrollExportLineEntry.entry_id == original.id,
+            PayrollExport.status != "voided",
+        )
+    )
+    export_ids = [str(e) for e in exported_in.scalars().all()]
+
     adj = TimeEntry(
         tenant_id=tenant_id,
         timesheet_id=sheet.id,
@@ -487,12 +524,171 @@ async def create_adjustment(
     await audit(db, tenant_id=tenant_id, user_id=created_by,
         action="timeentry.adjustment", resource_type="time_entry",
         resource_id=str(adj.id),
-        detail={"original_entry_id": str(data.original_entry_id), "delta_minutes": data.delta_minutes},
+        detail={"original_entry_id": str(data.original_entry_id), "delta_minutes": data.delta_minutes,
+                "exported_in": export_ids},
     )
     await db.refresh(adj)
     return adj
 
 
+# ── Clock-in / clock-out ──────────────────────────────────────────────────────
+
+async def _get_or_create_current_sheet(
+    db: AsyncSession,
+    tenant_id: uuid.UUID,
+    project_id: uuid.UUID,
+    user_id: uuid.UUID,
+    work_date: date,
+) -> Timesheet:
+    from fastapi import HTTPException
+    week_start = work_date - timedelta(days=work_date.weekday())
+    result = await db.execute(
+        select(Timesheet).where(
+            Timesheet.tenant_id == tenant_id,
+            Timesheet.project_id == project_id,
+            Timesheet.user_id == user_id,
+            Timesheet.week_start == week_start,
+            Timesheet.is_deleted == False,
+        )
+    )
+    sheet = result.scalar_one_or_none()
+    if not sheet:
+        sheet = await create_timesheet(
+            db, tenant_id, user_id,
+            TimesheetCreate(project_id=project_id, week_start=week_start),
+        )
+    if sheet.status not in EDITABLE_TIMESHEET_STATUSES:
+        raise HTTPException(400, f"Cannot clock in on timesheet with status '{sheet.status}'")
+    return sheet
+
+
+async def _get_open_entry(
+    db: AsyncSession, tenant_id: uuid.UUID, user_id: uuid.UUID
+) -> TimeEntry | None:
+    """Uses the partial index on open entries; at most one per user."""
+    result = await db.execute(
+        select(TimeEntry).where(
+            TimeEntry.tenant_id == tenant_id,
+            TimeEntry.user_id == user_id,
+            TimeEntry.end_time.is_(None),
+            TimeEntry.is_deleted == False,
+        ).with_for_update()
+    )
+    return result.scalar_one_or_none()
+
+
+async def clock_in(
+    db: AsyncSession,
+    tenant_id: uuid.UUID,
+    project_id: uuid.UUID,
+    data: ClockInRequest,
+    punched_by: uuid.UUID,
+) -> TimeEntry:
+    """
+    Create an open-ended entry (end_time NULL) starting now.
+    Idempotent: an existing open entry on the same project is returned.
+    """
+    from fastapi import HTTPException
+    from app.core.rbac.models import User
+    from app.core.timesheets import presence
+
+    user_id = data.user_id or punched_by
+    user_result = await db.execute(
+        select(User).where(User.id == user_id, User.tenant_id == tenant_id, User.is_deleted == False)
+    )
+    user = user_result.scalar_one_or_none()
+    if not user:
+        raise HTTPException(404, "User not found")
+
+    def already_open(existing: TimeEntry) -> TimeEntry:
+        if existing.project_id == project_id:
+            return existing
+        raise HTTPException(409, "User is already clocked in on another project")
+
+    existing = await _get_open_entry(db, tenant_id, user_id)
+    if existing:
+        return already_open(existing)
+
+    tz = await _get_tenant_tz(db, tenant_id)
+    now = datetime.now(timezone.utc)
+    work_date = now.astimezone(tz).date()
+    sheet = await _get_or_create_current_sheet(db, tenant_id, project_id, user_id, work_date)
+
+    entry = TimeEntry(
+        tenant_id=tenant_id,
+        timesheet_id=sheet.id,
+        user_id=user_id,
+        project_id=project_id,
+        work_date=work_date,
+        start_time=now,
+        end_time=None,
+        break_minutes=0,
+        net_minutes=0,
+        description=data.description,
+        status="active",
+        is_adjustment=False,
+    )
+    try:
+        # Savepoint: a concurrent punch that won the partial unique index
+        # on open entries must not abort the whole transaction
+        async with db.begin_nested():
+            db.add(entry)
+            await db.flush()
+    except IntegrityError:
+        existing = await _get_open_entry(db, tenant_id, user_id)
+        if existing is None:
+            raise
+        return already_open(existing)
+
+    from app.core.audit.service import audit
+    await audit(db, tenant_id=tenant_id, user_id=punched_by,
+        action="timeentry.clock_in", resource_type="time_entry",
+        resource_id=str(entry.id),
+        detail={"user_id": str(user_id), "project_id": str(project_id)},
+    )
+    presence.stage_clock_in(db, tenant_id, project_id, presence.Presence(
+        user_id=user_id, entry_id=entry.id, since=now,
+        full_name=user.full_name, email=user.email,
+    ))
+    await db.refresh(entry)
+    return entry
+
+
+async def clock_out(
+    db: AsyncSession,
+    tenant_id: uuid.UUID,
+    project_id: uuid.UUID,
+    data: ClockOutRequest,
+    punched_by: uuid.UUID,
+) -> TimeEntry:
+    """Close the user's open entry on this project at now()."""
+    from fastapi import HTTPException
+    from app.core.timesheets import presence
+
+    user_id = data.user_id or punched_by
+    entry = await _get_open_entry(db, tenant_id, user_id)
+    if not entry or entry.project_id != project_id:
+        raise HTTPException(404, "No open clock-in for this user on this project")
+
+    now = datetime.now(timezone.utc)
+    entry.end_time = now
+    entry.break_minutes = data.break_minutes
+    entry.net_minutes = _calc_net_minutes(entry.start_time, now, data.break_minutes)
+    if data.description is not None:
+        entry.description = data.description
+    await db.flush()
+
+    from app.core.audit.service import audit
+    await audit(db, tenant_id=tenant_id, user_id=punched_by,
+        action="timeentry.clock_out", resource_type="time_entry",
+        resource_id=str(entry.id),
+        detail={"user_id": str(user_id), "net_minutes": entry.net_minutes},
+    )
+    presence.stage_clock_out(db, tenant_id, project_id, user_id)
+    await db.refresh(entry)
+    return entry
+
+
 async def get_entry(db: AsyncSession, entry_id: uuid.UUID) -> TimeEntry | None:
     result = await db.execute(
         select(TimeEntry).where(TimeEntry.id == entry_id, TimeEntry.is_deleted == False)
@@ -566,6 +762,7 @@ async def run_compliance(
             TimeEntry.is_deleted == False,
             TimeEntry.status != "rejected",
             TimeEntry.is_adjustment == False,
+            TimeEntry.end_time.is_not(None),
         )
     )
     entries = list(entries_result.scalars().all())
@@ -588,6 +785,7 @@ async def run_compliance(
             TimeEntry.is_deleted == False,
             TimeEntry.status != "rejected",
             TimeEntry.is_adjustment == False,
+            TimeEntry.end_time.is_not(None),
         )
     )
     lookback_entries = list(lookback_result.scalars().all())
@@ -603,6 +801,7 @@ async def run_compliance(
     rules = list(rules_result.scalars().all())
 
     results = []
+    nc_pending: list[tuple[ComplianceResult, ComplianceRule]] = []
     for rule in rules:
         params = {}
         if rule.parameters_json:
@@ -652,9 +851,9 @@ async def run_compliance(
             await db.flush()
             results.append(cr)
 
-            # Auto-NC for critical rules
+            # Auto-NC for critical rules – created in one batch below
             if rule.action == "auto_nc" and rule.severity == "critical":
-                await _create_compliance_nc(db, tenant_id, sheet, cr, rule)
+                nc_pending.append((cr, rule))
 
         # If no violations, record a pass (update or create)
         if not violations:
@@ -680,6 +879,7 @@ async def run_compliance(
                 db.add(cr)
                 await db.flush()
 
+    await _create_compliance_ncs(db, tenant_id, sheet, nc_pending)
     return results
 
 
@@ -748,54 +948,45 @@ def _evaluate_rule(
     return violations
 
 
-async def _create_compliance_nc(
+async def _create_compliance_ncs(
     db: AsyncSession,
     tenant_id: uuid.UUID,
     sheet: Timesheet,
-    cr: ComplianceResult,
-    rule: ComplianceRule,
+    violations: list[tuple[ComplianceResult, ComplianceRule]],
 ) -> None:
-    from app.core.nonconformance.models import Nonconformance
-    from app.core.nonconformance.service import generate_nc_no
+    from app.core.nonconformance.service import NCSource, create_ncs_from_sources
     from app.core.audit.service import audit
 
+    if not violations:
+        return
     # Idempotency: source_key = timesheet_id + rule_code + occurred_on
-    source_key = f"{sheet.id}:{rule.rule_code}:{cr.occurred_on}"
-    existing = await db.execute(
-        select(Nonconformance).where(
-            Nonconformance.tenant_id == tenant_id,
-            Nonconformance.source_type == "compliance",
-            Nonconformance.source_id == sheet.id,
-            Nonconformance.source_key == source_key,
-            Nonconformance.is_deleted == False,
+    sources = [
+        NCSource(
+            source_type="compliance",
+            source_id=sheet.id,
+            source_key=f"{sheet.id}:{rule.rule_code}:{cr.occurred_on}",
+            payload={
+                "title": f"Compliance: {rule.title}",
+                "description": f"Auto-NC fra compliance regel {rule.rule_code}. Timesheet: {sheet.id}",
+                "severity": "high",
+                "owner_user_id": None,
+                "rule_code": rule.rule_code,
+                "result_id": str(cr.id),
+            },
+        )
+        for cr, rule in violations
+    ]
+    created = await create_ncs_from_sources(db, tenant_id, sheet.project_id, sources)
+    if created:
+        await audit(db, tenant_id=tenant_id, user_id=sheet.user_id,
+            action="compliance.auto_nc", resource_type="timesheet",
+            resource_id=str(sheet.id),
+            detail={"ncs": [
+                {"rule_code": s.payload["rule_code"], "nc_no": nc_no,
+                 "source_key": s.source_key, "result_id": s.payload["result_id"]}
+                for s, nc_no in created
+            ]},
         )
-    )
-    if existing.scalar_one_or_none():
-        return  # already created
-
-    nc_no = await generate_nc_no(db, tenant_id, sheet.project_id)
-    nc = Nonconformance(
-        tenant_id=tenant_id,
-        project_id=sheet.project_id,
-        nc_no=nc_no,
-        title=f"Compliance: {rule.title}",
-        description=f"Auto-NC fra compliance regel {rule.rule_code}. Timesheet: {sheet.id}",
-        nc_type="nonconformance",
-        severity="high",
-        status="open",
-        source_type="compliance",
-        source_id=sheet.id,
-        source_key=source_key,
-        owner_user_id=None,
-    )
-    db.add(nc)
-    await db.flush()
-
-    await audit(db, tenant_id=tenant_id, user_id=sheet.user_id,
-        action="compliance.auto_nc", resource_type="compliance_result",
-        resource_id=str(cr.id),
-        detail={"rule_code": rule.rule_code, "nc_no": nc_no, "source_key": source_key},
-    )
 
 
 async def resolve_violation(
@@ -855,8 +1046,117 @@ async def list_rules(db: AsyncSession, tenant_id: uuid.UUID) -> list[ComplianceR
     return list(result.scalars().all())
 
 
+# ── Overtime policy ───────────────────────────────────────────────────────────
+
+async def get_overtime_policy(db: AsyncSession, tenant_id: uuid.UUID) -> OvertimePolicy:
+    from app.core.timesheets import overtime
+    return await overtime.get_policy(db, tenant_id)
+
+
+async def set_overtime_policy(
+    db: AsyncSession,
+    tenant_id: uuid.UUID,
+    data: OvertimePolicyUpdate,
+    updated_by: uuid.UUID,
+) -> OvertimePolicy:
+    from app.core.timesheets import overtime
+    policy = await overtime.get_policy(db, tenant_id)
+    policy.daily_limit_minutes = data.daily_limit_minutes
+    policy.weekly_limit_minutes = data.weekly_limit_minutes
+    policy.night_start = data.night_start
+    policy.night_end = data.night_end
+    policy.weekend_days_json = json.dumps(sorted(set(data.weekend_days)))
+    policy.overtime_100_at_night = data.overtime_100_at_night
+    policy.overtime_100_on_weekend = data.overtime_100_on_weekend
+    if policy.id is None:
+        db.add(policy)
+    await db.flush()
+
+    from app.core.audit.service import audit
+    await audit(db, tenant_id=tenant_id, user_id=updated_by,
+        action="overtime_policy.update", resource_type="overtime_policy",
+        resource_id=str(policy.id),
+        detail=json.loads(overtime.policy_snapshot(policy)),
+    )
+    await db.refresh(policy)
+    return policy
+
+
 # ── Payroll export ────────────────────────────────────────────────────────────
 
+async def _write_sheet_lines(
+    db: AsyncSession,
+    tenant_id: uuid.UUID,
+    export: PayrollExport,
+    sheets: list[Timesheet],
+) -> None:
+    """One line per sheet with net minutes, overtime bands and entry links."""
+    sheet_ids = [s.id for s in sheets]
+    # Net minutes per sheet = sum of regular entries + adjustments (one query)
+    totals_result = await db.execute(
+        select(
+            TimeEntry.timesheet_id,
+            func.coalesce(func.sum(case(
+                (TimeEntry.is_adjustment == True, func.coalesce(TimeEntry.delta_minutes, 0)),
+                else_=TimeEntry.net_minutes,
+            )), 0),
+            func.array_agg(TimeEntry.id).filter(TimeEntry.is_adjustment == False),
+        ).where(
+            TimeEntry.timesheet_id.in_(sheet_ids),
+            TimeEntry.is_deleted == False,
+            TimeEntry.status != "rejected",
+        ).group_by(TimeEntry.timesheet_id)
+    )
+    totals = {sid: (net, ids or []) for sid, net, ids in totals_result.all()}
+
+    # Overtime / supplement bands for all sheets in one set-based pass
+    from app.core.timesheets import overtime
+    policy = await overtime.get_policy(db, tenant_id)
+    tz = await _get_tenant_tz(db, tenant_id)
+    bands = await overtime.compute_bands(db, tenant_id, sheet_ids, policy, tz)
+    export.overtime_policy_json = overtime.policy_snapshot(policy)
+
+    lines = []
+    for sheet in sheets:
+        net_minutes, entry_ids = totals.get(sheet.id, (0, []))
+        band = bands.get(sheet.id) or overtime.BandTotals()
+        lines.append(PayrollExportLine(
+            tenant_id=tenant_id,
+            export_id=export.id,
+            timesheet_id=sheet.id,
+            user_id=sheet.user_id,
+            project_id=sheet.project_id,
+            net_minutes=net_minutes,
+            # Adjustments have no position in time and are booked as ordinary
+            ordinary_minutes=net_minutes - band.overtime_50_minutes - band.overtime_100_minutes,
+            overtime_50_minutes=band.overtime_50_minutes,
+            overtime_100_minutes=band.overtime_100_minutes,
+            night_minutes=band.night_minutes,
+            weekend_minutes=band.weekend_minutes,
+            source_entry_ids_json=json.dumps([str(i) for i in entry_ids]),
+        ))
+    db.add_all(lines)
+    await db.flush()
+
+    # Reverse index entry → line, set-based from the lines just written
+    await db.execute(
+        insert(PayrollExportLineEntry).from_select(
+            ["tenant_id", "line_id", "entry_id", "export_id"],
+            select(
+                PayrollExportLine.tenant_id, PayrollExportLine.id,
+                TimeEntry.id, PayrollExportLine.export_id,
+            )
+            .join(TimeEntry, TimeEntry.timesheet_id == PayrollExportLine.timesheet_id)
+            .where(
+                PayrollExportLine.export_id == export.id,
+                PayrollExportLine.timesheet_id.in_(sheet_ids),
+                TimeEntry.is_deleted == False,
+                TimeEntry.status != "rejected",
+            ),
+        )
+    )
+
+
 async def generate_export(
     db: AsyncSession,
     tenant_id: uuid.UUID,
@@ -864,6 +1164,8 @@ async def generate_export(
     generated_by: uuid.UUID,
 ) -> PayrollExport:
     from fastapi import HTTPException
+    if data.mode == "delta":
+        return await _generate_delta_export(db, tenant_id, data, generated_by)
     now = datetime.now(timezone.utc)
 
     # Find approved sheets in period
@@ -908,43 +1210,165 @@ async def generate_export(
     db.add(export)
     await db.flush()
 
-    for sheet in sheets:
-        # Load entries for this sheet
-        entries_result = await db.execute(
-            select(TimeEntry).where(
-                TimeEntry.timesheet_id == sheet.id,
-                TimeEntry.is_deleted == False,
-                TimeEntry.status != "rejected",
-            )
+    await _write_sheet_lines(db, tenant_id, export, sheets)
+
+    from app.core.audit.service import audit
+    await audit(db, tenant_id=tenant_id, user_id=generated_by,
+        action="payroll_export.generate", resource_type="payroll_export",
+        resource_id=str(export.id),
+        detail={"period_start": str(data.period_start), "period_end": str(data.period_end),
+                "sheet_count": len(sheets)},
+    )
+    await db.refresh(export)
+    return export
+
+
+# How long before the last mark a late-committing adjustment may be stamped
+DELTA_MARK_MARGIN = timedelta(hours=1)
+
+
+async def _last_high_water_mark(db: AsyncSession, tenant_id: uuid.UUID) -> datetime | None:
+    result = await db.execute(
+        select(func.max(PayrollExport.high_water_mark)).where(
+            PayrollExport.tenant_id == tenant_id,
+            PayrollExport.status == "sent",
+        )
+    )
+    return result.scalar_one_or_none()
+
+
+async def _generate_delta_export(
+    db: AsyncSession,
+    tenant_id: uuid.UUID,
+    data: PayrollExportCreate,
+    generated_by: uuid.UUID,
+) -> PayrollExport:
+    """
+    Delta export: what changed since the last sent delta export.
+      - approved sheets (week_end <= period_end) not in any non-voided export,
+      - adjustments not yet linked to a non-voided export (full exports link
+        the adjustments they sum, see _write_sheet_lines and migration 0015).
+    The scan over adjustments is bounded by the last sent mark, less
+    DELTA_MARK_MARGIN: created_at is set on insert, not on commit, so an
+    adjustment committed after the previous delta's snapshot may carry a
+    timestamp slightly before its mark. The link anti-join keeps the window
+    overlap from exporting anything twice. Only one delta may await sending at
+    a time, so a voided delta's adjustments are always inside the next window
+    (adjustments unlinked by a voided full export come back with their sheet).
+    """
+    from fastapi import HTTPException
+    if data.project_id:
+        raise HTTPException(400, "Delta exports cover the whole tenant; project_id is not supported")
+    now = datetime.now(timezone.utc)
+
+    # One delta generation per tenant at a time
+    await db.execute(
+        select(func.pg_advisory_xact_lock(func.hashtext(f"payroll_export:{tenant_id}")))
+    )
+    pending = await db.execute(
+        select(PayrollExport.id).where(
+            PayrollExport.tenant_id == tenant_id,
+            PayrollExport.mode == "delta",
+            PayrollExport.status == "generated",
+            PayrollExport.is_deleted == False,
+        ).limit(1)
+    )
+    if pending.scalar_one_or_none():
+        raise HTTPException(409, "The previous delta export must be sent or voided first")
+    since = await _last_high_water_mark(db, tenant_id)
+
+    already_exported = (
+        select(PayrollExportLine.id)
+        .join(PayrollExport, PayrollExport.id == PayrollExportLine.export_id)
+        .where(
+            PayrollExportLine.timesheet_id == Timesheet.id,
+            PayrollExport.status != "voided",
         )
-        entries = list(entries_result.scalars().all())
+    )
+    sheets_result = await db.execute(
+        select(Timesheet).where(
+            Timesheet.tenant_id == tenant_id,
+            Timesheet.status == "approved",
+            Timesheet.week_end <= data.period_end,
+            Timesheet.is_deleted == False,
+            ~already_exported.exists(),
+        )
+    )
+    sheets = list(sheets_result.scalars().all())
 
-        # Net minutes = sum of regular entries + adjustments
-        net_minutes = sum(
-            e.delta_minutes if e.is_adjustment else e.net_minutes
-            for e in entries
+    adjustment_linked = (
+        select(PayrollExportLineEntry.entry_id)
+        .join(PayrollExport, PayrollExport.id == PayrollExportLineEntry.export_id)
+        .where(
+            PayrollExportLineEntry.entry_id == TimeEntry.id,
+            PayrollExport.status != "voided",
         )
-        entry_ids = [str(e.id) for e in entries if not e.is_adjustment]
+    )
+    adj_q = select(
+        TimeEntry.timesheet_id, TimeEntry.user_id, TimeEntry.project_id,
+        func.sum(func.coalesce(TimeEntry.delta_minutes, 0)),
+        func.array_agg(TimeEntry.id),
+    ).where(
+        TimeEntry.tenant_id == tenant_id,
+        TimeEntry.is_adjustment == True,
+        TimeEntry.is_deleted == False,
+        TimeEntry.status != "rejected",
+        ~adjustment_linked.exists(),
+    ).group_by(TimeEntry.timesheet_id, TimeEntry.user_id, TimeEntry.project_id)
+    if since is not None:
+        adj_q = adj_q.where(TimeEntry.created_at >= since - DELTA_MARK_MARGIN)
+    # Sheets exported in full here already carry their adjustments
+    new_sheet_ids = {s.id for s in sheets}
+    adjustments = [row for row in (await db.execute(adj_q)).all() if row[0] not in new_sheet_ids]
 
+    if not sheets and not adjustments:
+        raise HTTPException(400, "Nothing to export since the last sent export")
+
+    export = PayrollExport(
+        tenant_id=tenant_id,
+        period_start=data.period_start,
+        period_end=data.period_end,
+        status="generated",
+        mode="delta",
+        high_water_mark=now,
+        generated_by=generated_by,
+        generated_at=now,
+    )
+    db.add(export)
+    await db.flush()
+
+    if sheets:
+        await _write_sheet_lines(db, tenant_id, export, sheets)
+
+    # Adjustment-only lines: no position in time, booked as ordinary minutes
+    links = []
+    for timesheet_id, user_id, project_id, delta_minutes, entry_ids in adjustments:
         line = PayrollExportLine(
+            id=uuid.uuid4(),
             tenant_id=tenant_id,
             export_id=export.id,
-            timesheet_id=sheet.id,
-            user_id=sheet.user_id,
-            project_id=sheet.project_id,
-            net_minutes=net_minutes,
-            source_entry_ids_json=json.dumps(entry_ids),
+            timesheet_id=timesheet_id,
+            user_id=user_id,
+            project_id=project_id,
+            net_minutes=delta_minutes,
+            ordinary_minutes=delta_minutes,
+            source_entry_ids_json=json.dumps([]),
         )
         db.add(line)
-
+        links.extend(
+            {"tenant_id": tenant_id, "line_id": line.id, "entry_id": e, "export_id": export.id}
+            for e in entry_ids
+        )
     await db.flush()
+    if links:
+        await db.execute(insert(PayrollExportLineEntry), links)
 
     from app.core.audit.service import audit
     await audit(db, tenant_id=tenant_id, user_id=generated_by,
         action="payroll_export.generate", resource_type="payroll_export",
         resource_id=str(export.id),
-        detail={"period_start": str(data.period_start), "period_end": str(data.period_end),
-                "sheet_count": len(sheets)},
+        detail={"mode": "delta", "since": since.isoformat() if since else None,
+                "sheet_count": len(sheets), "adjustment_sheet_count": len(adjustments)},
     )
     await db.refresh(export)
     return export
@@ -1038,6 +1462,38 @@ async def void_export(
     return export
 
 
+async def list_entry_exports(
+    db: AsyncSession, tenant_id: uuid.UUID, entry_id: uuid.UUID
+) -> list[tuple[PayrollExport, PayrollExportLine]]:
+    """Exports (incl. voided) whose lines included the entry – via the link index."""
+    result = await db.execute(
+        select(PayrollExport, PayrollExportLine)
+        .join(PayrollExportLineEntry, PayrollExportLineEntry.export_id == PayrollExport.id)
+        .join(PayrollExportLine, PayrollExportLine.id == PayrollExportLineEntry.line_id)
+        .where(
+            PayrollExportLineEntry.entry_id == entry_id,
+            PayrollExportLineEntry.tenant_id == tenant_id,
+        )
+        .order_by(PayrollExport.generated_at)
+    )
+    return [tuple(row) for row in result.all()]
+
+
+async def list_timesheet_exports(
+    db: AsyncSession, tenant_id: uuid.UUID, timesheet_id: uuid.UUID
+) -> list[tuple[PayrollExport, PayrollExportLine]]:
+    result = await db.execute(
+        select(PayrollExport, PayrollExportLine)
+        .join(PayrollExportLine, PayrollExportLine.export_id == PayrollExport.id)
+        .where(
+            PayrollExportLine.timesheet_id == timesheet_id,
+            PayrollExportLine.tenant_id == tenant_id,
+        )
+        .order_by(PayrollExport.generated_at)
+    )
+    return [tuple(row) for row in result.all()]
+
+
 async def get_export(db: AsyncSession, export_id: uuid.UUID) -> PayrollExport | None:
     result = await db.execute(
         select(PayrollExport).where(
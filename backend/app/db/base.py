@@ -1,9 +1,9 @@
 import uuid
 from datetime import datetime, timezone
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, text
+from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, text
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+from sqlalchemy.orm import DeclarativeBase, Mapped, declared_attr, mapped_column
 
 
 def utcnow() -> datetime:
@@ -27,6 +27,21 @@ class SoftDeleteMixin:
     is_deleted: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
 
 
+class VersionedMixin:
+    """
+    Optimistic concurrency. Every ORM flush of the row is a single
+    UPDATE ... SET version = :v + 1 WHERE id = :id AND version = :v, so a write
+    based on a stale read matches no row and raises StaleDataError (answered
+    with 412, see app.main). Clients can also pin the version they edited with
+    If-Match (app.http_cache.check_if_match).
+    """
+    version: Mapped[int] = mapped_column(Integer, nullable=False, server_default=text("1"))
+
+    @declared_attr.directive
+    def __mapper_args__(cls):
+        return {"version_id_col": cls.__table__.c.version}
+
+
 class TenantScopedMixin:
     tenant_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
@@ -0,0 +1,66 @@
+"""
+Sparse fieldsets for list endpoints.
+
+List responses leave out the heavy text columns of a row (document content,
+checklist schemas/answers, mail bodies, ...) unless the caller asks for them,
+and accept ?fields=a,b,c to pick any subset of the read schema.
+
+Only the selected columns are loaded (load_only) and rows are serialised from
+exactly those attributes, so an unselected column never leaves the database.
+Routes declare response_model=list[sparse_model(XRead)] with
+response_model_exclude_unset=True: the rows are validated, every field but id
+is optional in the OpenAPI schema, and left-out fields stay out of the body.
+Mapper-level deferral is deliberately not used: services read the same
+columns on single rows, where an implicit async lazy load would fail.
+"""
+from functools import lru_cache
+from typing import Iterable
+
+from fastapi import HTTPException, Query
+from pydantic import BaseModel, create_model
+from sqlalchemy import inspect
+from sqlalchemy.orm import load_only
+
+FIELDS_QUERY = Query(
+    None,
+    description="Comma-separated fields to return. Default: all except large text fields.",
+)
+
+
+def parse_fields(schema: type[BaseModel], fields: str | None, heavy: Iterable[str] = ()) -> list[str]:
+    """?fields= → ordered field names of schema. id is always included."""
+    names = list(schema.model_fields)
+    if fields is None:
+        excluded = set(heavy)
+        return [n for n in names if n not in excluded]
+    requested = {f.strip() for f in fields.split(",") if f.strip()}
+    unknown = requested - set(names)
+    if unknown:
+        raise HTTPException(400, f"Unknown fields: {', '.join(sorted(unknown))}")
+    if "id" in names:
+        requested.add("id")
+    return [n for n in names if n in requested]
+
+
+def load_only_fields(model, selected: list[str]):
+    """Loader option restricting an entity query to the selected columns."""
+    columns = inspect(model).column_attrs
+    return load_only(*(getattr(model, n) for n in selected if n in columns))
+
+
+@lru_cache
+def sparse_model(schema: type[BaseModel]) -> type[BaseModel]:
+    """schema with every field except id optional: the list item of a sparse response."""
+    fields = {
+        name: (info.annotation, ... if name == "id" else None)
+        for name, info in schema.model_fields.items()
+    }
+    return create_model(
+        f"{schema.__name__}Fields",
+        __doc__=f"{schema.__name__}; fields outside ?fields= (or heavy fields by default) are left out.",
+        **fields,
+    )
+
+
+def sparse_rows(rows: Iterable, selected: list[str]) -> list[dict]:
+    return [{n: getattr(row, n) for n in selected} for row in rows]
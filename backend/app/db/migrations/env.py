@@ -13,10 +13,10 @@ from app.core.tasks.models import Task  # noqa
 from app.core.files.models import File, FileLink  # noqa
 from app.core.incidents.models import Incident, IncidentMessage  # noqa
 from app.core.nonconformance.models import Nonconformance, CapaAction  # noqa
-from app.core.documents.models import DocTemplate, DocTemplateVersion, ProjectDoc, ProjectDocVersion, AckRequest, AckResponse  # noqa
-from app.core.checklists.models import ChecklistTemplate, ChecklistTemplateVersion, ProjectChecklistTemplate, ProjectChecklistTemplateVersion, ChecklistRun  # noqa
+from app.core.documents.models import DocTemplate, DocTemplateVersion, ProjectDoc, ProjectDocVersion, AckRequest, AckResponse, DocContentBlob  # noqa
+from app.core.checklists.models import ChecklistTemplate, ChecklistTemplateVersion, ProjectChecklistTemplate, ProjectChecklistTemplateVersion, ChecklistRun, ChecklistRunAnswer  # noqa
 from app.core.drawings.models import Drawing  # noqa
-from app.core.timesheets.models import Timesheet, TimeEntry, ComplianceRule, ComplianceResult, PayrollExport, PayrollExportLine  # noqa
+from app.core.timesheets.models import Timesheet, TimeEntry, ComplianceRule, ComplianceResult, OvertimePolicy, PayrollExport, PayrollExportLine, PayrollExportLineEntry, TimeEntryImport, TimeEntryImportReject  # noqa
 
 config = context.config
 if config.config_file_name:
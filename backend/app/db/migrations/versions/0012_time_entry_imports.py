@@ -0,0 +1,62 @@
+"""Time entry bulk import – import batches + rejects report
+
+Revision ID: 0012_time_entry_imports
+Revises: 0011_sprint7_timesheets
+Create Date: 2025-01-01 00:00:11
+"""
+from typing import Sequence, Union
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision: str = "0012_time_entry_imports"
+down_revision: Union[str, None] = "0011_sprint7_timesheets"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # ── time_entry_imports ────────────────────────────────────────────────────
+    op.create_table(
+        "time_entry_imports",
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("tenant_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("project_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("source_format", sa.String(20), nullable=False),
+        sa.Column("status", sa.String(50), nullable=False, server_default="processing"),
+        sa.Column("total_rows", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("imported_rows", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("rejected_rows", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("imported_by", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("completed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+        sa.ForeignKeyConstraint(["tenant_id"], ["tenants.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["project_id"], ["projects.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["imported_by"], ["users.id"], ondelete="RESTRICT"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_time_entry_imports_tenant_id", "time_entry_imports", ["tenant_id"])
+    op.create_index("ix_time_entry_imports_project_id", "time_entry_imports", ["project_id"])
+
+    # ── time_entry_import_rejects ─────────────────────────────────────────────
+    op.create_table(
+        "time_entry_import_rejects",
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("tenant_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("import_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("row_no", sa.Integer, nullable=False),
+        sa.Column("reason", sa.String(100), nullable=False),
+        sa.Column("raw_line", sa.Text, nullable=True),
+        sa.ForeignKeyConstraint(["tenant_id"], ["tenants.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["import_id"], ["time_entry_imports.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_time_entry_import_rejects_tenant_id", "time_entry_import_rejects", ["tenant_id"])
+    op.create_index("ix_time_entry_import_rejects_import_row",
+                    "time_entry_import_rejects", ["import_id", "row_no"])
+
+
+def downgrade() -> None:
+    op.drop_table("time_entry_import_rejects")
+    op.drop_table("time_entry_imports")
@@ -0,0 +1,38 @@
+"""Open time entries (clock-in without end_time) for live roll call
+
+Revision ID: 0013_open_time_entries
+Revises: 0012_time_entry_imports
+Create Date: 2025-01-01 00:00:12
+"""
+from typing import Sequence, Union
+from alembic import op
+
+revision: str = "0013_open_time_entries"
+down_revision: Union[str, None] = "0012_time_entry_imports"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.alter_column("time_entries", "end_time", nullable=True)
+
+    # Roll call: who is on site per project – only open rows are indexed
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_time_entries_open
+        ON time_entries (tenant_id, project_id)
+        WHERE end_time IS NULL AND is_deleted = false
+    """)
+    # A user can only be clocked in once at a time
+    op.execute("""
+        CREATE UNIQUE INDEX IF NOT EXISTS uq_time_entries_one_open_per_user
+        ON time_entries (tenant_id, user_id)
+        WHERE end_time IS NULL AND is_deleted = false
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS uq_time_entries_one_open_per_user")
+    op.execute("DROP INDEX IF EXISTS ix_time_entries_open")
+    # Open entries cannot survive NOT NULL – drop them
+    op.execute("DELETE FROM time_entries WHERE end_time IS NULL")
+    op.alter_column("time_entries", "end_time", nullable=False)
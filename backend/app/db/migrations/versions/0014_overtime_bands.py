@@ -0,0 +1,61 @@
+"""Overtime policy per tenant + per-band totals on payroll export lines
+
+Revision ID: 0014_overtime_bands
+Revises: 0013_open_time_entries
+Create Date: 2025-01-01 00:00:13
+"""
+from typing import Sequence, Union
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision: str = "0014_overtime_bands"
+down_revision: Union[str, None] = "0013_open_time_entries"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BAND_COLUMNS = (
+    "ordinary_minutes",
+    "overtime_50_minutes",
+    "overtime_100_minutes",
+    "night_minutes",
+    "weekend_minutes",
+)
+
+
+def upgrade() -> None:
+    # ── overtime_policies ─────────────────────────────────────────────────────
+    op.create_table(
+        "overtime_policies",
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("tenant_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("daily_limit_minutes", sa.Integer, nullable=False, server_default="540"),
+        sa.Column("weekly_limit_minutes", sa.Integer, nullable=False, server_default="2400"),
+        sa.Column("night_start", sa.Time, nullable=False, server_default="21:00"),
+        sa.Column("night_end", sa.Time, nullable=False, server_default="06:00"),
+        sa.Column("weekend_days_json", sa.Text, nullable=False, server_default="[6, 7]"),
+        sa.Column("overtime_100_at_night", sa.Boolean, nullable=False, server_default="true"),
+        sa.Column("overtime_100_on_weekend", sa.Boolean, nullable=False, server_default="true"),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+        sa.ForeignKeyConstraint(["tenant_id"], ["tenants.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("tenant_id", name="uq_overtime_policy_tenant"),
+    )
+    op.create_index("ix_overtime_policies_tenant_id", "overtime_policies", ["tenant_id"])
+
+    # ── payroll export bands ──────────────────────────────────────────────────
+    for column in BAND_COLUMNS:
+        op.add_column("payroll_export_lines",
+                      sa.Column(column, sa.Integer, nullable=False, server_default="0"))
+    # Existing lines: everything was ordinary time as far as we know
+    op.execute("UPDATE payroll_export_lines SET ordinary_minutes = net_minutes")
+    op.add_column("payroll_exports", sa.Column("overtime_policy_json", sa.Text, nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("payroll_exports", "overtime_policy_json")
+    for column in reversed(BAND_COLUMNS):
+        op.drop_column("payroll_export_lines", column)
+    op.drop_index("ix_overtime_policies_tenant_id", table_name="overtime_policies")
+    op.drop_table("overtime_policies")
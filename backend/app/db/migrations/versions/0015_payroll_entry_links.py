@@ -0,0 +1,65 @@
+"""Reverse index time entry → payroll export line, backfilled from source_entry_ids_json and adjustments
+
+Revision ID: 0015_payroll_entry_links
+Revises: 0014_overtime_bands
+Create Date: 2025-01-01 00:00:14
+"""
+from typing import Sequence, Union
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision: str = "0015_payroll_entry_links"
+down_revision: Union[str, None] = "0014_overtime_bands"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "payroll_export_line_entries",
+        sa.Column("tenant_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("line_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("entry_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("export_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.ForeignKeyConstraint(["tenant_id"], ["tenants.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["line_id"], ["payroll_export_lines.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["entry_id"], ["time_entries.id"], ondelete="RESTRICT"),
+        sa.ForeignKeyConstraint(["export_id"], ["payroll_exports.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("line_id", "entry_id"),
+    )
+    op.create_index("ix_payroll_export_line_entries_tenant_id", "payroll_export_line_entries", ["tenant_id"])
+    op.create_index("ix_payroll_export_line_entries_entry_id", "payroll_export_line_entries", ["entry_id"])
+    op.create_index("ix_payroll_export_line_entries_export_id", "payroll_export_line_entries", ["export_id"])
+
+    # Backfill from the JSON blobs; ids of entries that no longer exist are skipped
+    op.execute("""
+        INSERT INTO payroll_export_line_entries (tenant_id, line_id, entry_id, export_id)
+        SELECT l.tenant_id, l.id, e.id, l.export_id
+        FROM payroll_export_lines l
+        CROSS JOIN LATERAL json_array_elements_text(CAST(l.source_entry_ids_json AS json)) AS j(entry_id)
+        JOIN time_entries e ON e.id = CAST(j.entry_id AS uuid)
+        WHERE l.source_entry_ids_json IS NOT NULL
+        ON CONFLICT DO NOTHING
+    """)
+    # Adjustments were summed into net_minutes but never listed in the JSON;
+    # link those that existed when the line's export was generated
+    op.execute("""
+        INSERT INTO payroll_export_line_entries (tenant_id, line_id, entry_id, export_id)
+        SELECT l.tenant_id, l.id, e.id, l.export_id
+        FROM payroll_export_lines l
+        JOIN payroll_exports x ON x.id = l.export_id
+        JOIN time_entries e ON e.timesheet_id = l.timesheet_id
+        WHERE e.is_adjustment = true
+          AND e.is_deleted = false
+          AND e.status <> 'rejected'
+          AND e.created_at <= x.generated_at
+        ON CONFLICT DO NOTHING
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_payroll_export_line_entries_export_id", table_name="payroll_export_line_entries")
+    op.drop_index("ix_payroll_export_line_entries_entry_id", table_name="payroll_export_line_entries")
+    op.drop_index("ix_payroll_export_line_entries_tenant_id", table_name="payroll_export_line_entries")
+    op.drop_table("payroll_export_line_entries")
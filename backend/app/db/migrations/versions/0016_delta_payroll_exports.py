@@ -0,0 +1,34 @@
+"""Delta payroll exports – export mode + high-water mark, index on adjustments
+
+Revision ID: 0016_delta_payroll_exports
+Revises: 0015_payroll_entry_links
+Create Date: 2025-01-01 00:00:15
+"""
+from typing import Sequence, Union
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0016_delta_payroll_exports"
+down_revision: Union[str, None] = "0015_payroll_entry_links"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("payroll_exports",
+                  sa.Column("mode", sa.String(20), nullable=False, server_default="full"))
+    op.add_column("payroll_exports",
+                  sa.Column("high_water_mark", sa.DateTime(timezone=True), nullable=True))
+
+    # Delta exports scan adjustments created after the last mark
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_time_entries_adjustments_created
+        ON time_entries (tenant_id, created_at)
+        WHERE is_adjustment = true AND is_deleted = false
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_time_entries_adjustments_created")
+    op.drop_column("payroll_exports", "high_water_mark")
+    op.drop_column("payroll_exports", "mode")
@@ -0,0 +1,48 @@
+"""Unique auto-NC source key for all source types (checklist + compliance)
+
+Revision ID: 0017_nc_source_key_unique
+Revises: 0016_delta_payroll_exports
+Create Date: 2025-01-01 00:00:16
+"""
+from typing import Sequence, Union
+from alembic import op
+
+revision: str = "0017_nc_source_key_unique"
+down_revision: Union[str, None] = "0016_delta_payroll_exports"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Compliance NCs were only guarded by a SELECT – soft-delete any duplicates,
+    # keeping the oldest, before the index can be built.
+    op.execute("""
+        UPDATE nonconformances n SET is_deleted = true
+        WHERE n.source_key IS NOT NULL AND n.is_deleted = false
+          AND EXISTS (
+            SELECT 1 FROM nonconformances o
+            WHERE o.tenant_id = n.tenant_id
+              AND o.source_type = n.source_type
+              AND o.source_id = n.source_id
+              AND o.source_key = n.source_key
+              AND o.is_deleted = false
+              AND (o.created_at, o.id) < (n.created_at, n.id)
+          )
+    """)
+    op.execute("DROP INDEX IF EXISTS uq_nc_checklist_source_key")
+    op.execute("""
+        CREATE UNIQUE INDEX IF NOT EXISTS uq_nc_source_key
+        ON nonconformances (tenant_id, source_type, source_id, source_key)
+        WHERE source_key IS NOT NULL AND is_deleted = false
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS uq_nc_source_key")
+    op.execute("""
+        CREATE UNIQUE INDEX uq_nc_checklist_source_key
+        ON nonconformances (tenant_id, source_type, source_id, source_key)
+        WHERE source_type = 'checklist'
+          AND source_key IS NOT NULL
+          AND is_deleted = false
+    """)
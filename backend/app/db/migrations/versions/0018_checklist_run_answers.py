@@ -0,0 +1,80 @@
+"""Shredded checklist run answers for cross-run analytics
+
+Revision ID: 0018_checklist_run_answers
+Revises: 0017_nc_source_key_unique
+Create Date: 2025-01-01 00:00:17
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = "0018_checklist_run_answers"
+down_revision: Union[str, None] = "0017_nc_source_key_unique"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "checklist_run_answers",
+        sa.Column("run_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("checklist_runs.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("field_id", sa.String(255), nullable=False),
+        sa.Column("tenant_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("tenants.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("project_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("projects.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("checklist_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("project_checklist_templates.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("value_text", sa.Text(), nullable=True),
+        sa.Column("value_norm", sa.String(255), nullable=True),
+        sa.Column("file_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("submitted_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("run_id", "field_id"),
+    )
+    op.create_index("ix_checklist_run_answers_tenant_id", "checklist_run_answers", ["tenant_id"])
+    op.create_index(
+        "ix_checklist_run_answers_checklist_field", "checklist_run_answers",
+        ["tenant_id", "checklist_id", "field_id", "submitted_at"],
+    )
+    op.create_index(
+        "ix_checklist_run_answers_project_field", "checklist_run_answers",
+        ["tenant_id", "project_id", "field_id", "submitted_at"],
+    )
+    op.create_index(
+        "ix_checklist_runs_checklist_submitted", "checklist_runs",
+        ["tenant_id", "checklist_id", "submitted_at"],
+    )
+
+    # Backfill from runs already submitted/approved
+    op.execute("""
+        INSERT INTO checklist_run_answers
+            (tenant_id, run_id, field_id, project_id, checklist_id,
+             value_text, value_norm, file_count, submitted_at)
+        SELECT r.tenant_id, r.id, left(a.field_id, 255), r.project_id, r.checklist_id,
+               a.value_text, left(lower(trim(a.value_text)), 255), a.file_count, r.submitted_at
+        FROM checklist_runs r
+        CROSS JOIN LATERAL (
+            SELECT j.key AS field_id,
+                   NULLIF(
+                       CASE jsonb_typeof(v.val)
+                           WHEN 'string' THEN v.val #>> '{}'
+                           WHEN 'null' THEN NULL
+                           ELSE v.val::text
+                       END, '') AS value_text,
+                   CASE WHEN jsonb_typeof(j.value -> 'file_ids') = 'array'
+                        THEN jsonb_array_length(j.value -> 'file_ids') ELSE 0 END AS file_count
+            FROM jsonb_each(CAST(r.answers_json AS jsonb)) j
+            CROSS JOIN LATERAL (
+                SELECT CASE WHEN jsonb_typeof(j.value) = 'object'
+                            THEN j.value -> 'value' ELSE j.value END AS val
+            ) v
+        ) a
+        WHERE r.status IN ('submitted', 'approved')
+          AND r.is_deleted = false
+          AND r.answers_json IS NOT NULL
+          AND r.submitted_at IS NOT NULL
+          AND jsonb_typeof(CAST(r.answers_json AS jsonb)) = 'object'
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_checklist_runs_checklist_submitted", table_name="checklist_runs")
+    op.drop_table("checklist_run_answers")
@@ -0,0 +1,28 @@
+"""Client idempotency key on checklist runs (offline batch sync)
+
+Revision ID: 0019_checklist_run_client_key
+Revises: 0018_checklist_run_answers
+Create Date: 2025-01-01 00:00:18
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0019_checklist_run_client_key"
+down_revision: Union[str, None] = "0018_checklist_run_answers"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("checklist_runs", sa.Column("client_key", sa.String(100), nullable=True))
+    op.execute("""
+        CREATE UNIQUE INDEX IF NOT EXISTS uq_checklist_runs_client_key
+        ON checklist_runs (tenant_id, client_key)
+        WHERE client_key IS NOT NULL
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS uq_checklist_runs_client_key")
+    op.drop_column("checklist_runs", "client_key")
@@ -0,0 +1,43 @@
+"""Recurring project checklists and scheduled runs
+
+Revision ID: 0020_recurring_checklists
+Revises: 0019_checklist_run_client_key
+Create Date: 2025-01-01 00:00:19
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0020_recurring_checklists"
+down_revision: Union[str, None] = "0019_checklist_run_client_key"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("project_checklist_templates", sa.Column("recurrence", sa.String(20), nullable=True))
+    op.add_column(
+        "project_checklist_templates",
+        sa.Column("recurrence_interval", sa.Integer(), nullable=False, server_default="1"),
+    )
+    op.add_column("project_checklist_templates", sa.Column("next_run_at", sa.DateTime(timezone=True), nullable=True))
+    op.add_column("checklist_runs", sa.Column("scheduled_for", sa.DateTime(timezone=True), nullable=True))
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_project_checklists_next_run
+        ON project_checklist_templates (next_run_at)
+        WHERE recurrence IS NOT NULL AND is_deleted = false
+    """)
+    op.execute("""
+        CREATE UNIQUE INDEX IF NOT EXISTS uq_checklist_runs_scheduled_slot
+        ON checklist_runs (checklist_id, scheduled_for)
+        WHERE scheduled_for IS NOT NULL
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS uq_checklist_runs_scheduled_slot")
+    op.execute("DROP INDEX IF EXISTS ix_project_checklists_next_run")
+    op.drop_column("checklist_runs", "scheduled_for")
+    op.drop_column("project_checklist_templates", "next_run_at")
+    op.drop_column("project_checklist_templates", "recurrence_interval")
+    op.drop_column("project_checklist_templates", "recurrence")
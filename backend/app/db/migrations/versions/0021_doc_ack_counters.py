@@ -0,0 +1,43 @@
+"""Acknowledgement counters on project doc versions
+
+Revision ID: 0021_doc_ack_counters
+Revises: 0020_recurring_checklists
+Create Date: 2025-01-01 00:00:20
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0021_doc_ack_counters"
+down_revision: Union[str, None] = "0020_recurring_checklists"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "project_doc_versions",
+        sa.Column("ack_pending_count", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.add_column(
+        "project_doc_versions",
+        sa.Column("ack_acknowledged_count", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.execute("""
+        UPDATE project_doc_versions v
+        SET ack_pending_count = c.pending,
+            ack_acknowledged_count = c.acknowledged
+        FROM (
+            SELECT doc_version_id,
+                   count(*) FILTER (WHERE status = 'pending') AS pending,
+                   count(*) FILTER (WHERE status = 'acknowledged') AS acknowledged
+            FROM ack_requests
+            GROUP BY doc_version_id
+        ) c
+        WHERE c.doc_version_id = v.id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_column("project_doc_versions", "ack_acknowledged_count")
+    op.drop_column("project_doc_versions", "ack_pending_count")
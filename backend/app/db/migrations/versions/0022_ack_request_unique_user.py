@@ -0,0 +1,46 @@
+"""One ack request per user and doc version
+
+Revision ID: 0022_ack_request_unique_user
+Revises: 0021_doc_ack_counters
+Create Date: 2025-01-01 00:00:21
+"""
+from typing import Sequence, Union
+from alembic import op
+
+revision: str = "0022_ack_request_unique_user"
+down_revision: Union[str, None] = "0021_doc_ack_counters"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Duplicates came from repeated ids in ack_user_ids – keep the
+    # acknowledged one (or the oldest) per user and version.
+    op.execute("""
+        DELETE FROM ack_requests a
+        USING (
+            SELECT id, row_number() OVER (
+                PARTITION BY doc_version_id, user_id
+                ORDER BY (status = 'acknowledged') DESC, created_at, id
+            ) AS rn
+            FROM ack_requests
+        ) d
+        WHERE a.id = d.id AND d.rn > 1
+    """)
+    op.execute("""
+        UPDATE project_doc_versions v
+        SET ack_pending_count = (
+                SELECT count(*) FROM ack_requests a
+                WHERE a.doc_version_id = v.id AND a.status = 'pending'),
+            ack_acknowledged_count = (
+                SELECT count(*) FROM ack_requests a
+                WHERE a.doc_version_id = v.id AND a.status = 'acknowledged')
+        WHERE EXISTS (SELECT 1 FROM ack_requests a WHERE a.doc_version_id = v.id)
+    """)
+    op.create_unique_constraint(
+        "uq_ack_requests_version_user", "ack_requests", ["doc_version_id", "user_id"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint("uq_ack_requests_version_user", "ack_requests", type_="unique")
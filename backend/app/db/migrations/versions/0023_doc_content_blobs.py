@@ -0,0 +1,156 @@
+"""Content-addressed, compressed document text
+
+Revision ID: 0023_doc_content_blobs
+Revises: 0022_ack_request_unique_user
+Create Date: 2025-01-01 00:00:22
+"""
+import hashlib
+import json
+import zlib
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = "0023_doc_content_blobs"
+down_revision: Union[str, None] = "0022_ack_request_unique_user"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+VERSION_TABLES = ("doc_template_versions", "project_doc_versions")
+BATCH_SIZE = 500
+NIL_UUID = "00000000-0000-0000-0000-000000000000"
+
+
+# Blob codec as of this revision (zlib text, or zlib JSON line delta with
+# ["c", i1, i2] copying base lines and ["i", "..."] inserting text). Kept
+# here so later changes to app.core.documents.content_store do not change
+# what this migration does.
+
+def _decompress(data: bytes) -> str:
+    return zlib.decompress(data).decode("utf-8")
+
+
+def _apply_delta(base: str, delta: bytes) -> str:
+    base_lines = base.splitlines(keepends=True)
+    parts = []
+    for op_ in json.loads(zlib.decompress(delta)):
+        if op_[0] == "c":
+            parts.extend(base_lines[op_[1]:op_[2]])
+        else:
+            parts.append(op_[1])
+    return "".join(parts)
+
+
+_FETCH_BLOBS = sa.text(
+    "SELECT content_hash, encoding, base_hash, data FROM doc_content_blobs "
+    "WHERE tenant_id = CAST(:tenant_id AS uuid) AND content_hash IN :hashes"
+).bindparams(sa.bindparam("hashes", expanding=True))
+
+
+def _load_texts(bind, tenant_id, digests: set[str]) -> dict[str, str]:
+    """hash → text for digests of one tenant, fetching delta bases as needed."""
+    blobs: dict = {}
+    wanted = set(digests)
+    while wanted:
+        rows = bind.execute(_FETCH_BLOBS, {"tenant_id": str(tenant_id), "hashes": sorted(wanted)}).all()
+        blobs.update((r.content_hash, r) for r in rows)
+        wanted = {r.base_hash for r in rows if r.encoding == "delta"} - blobs.keys()
+    texts: dict[str, str] = {}
+
+    def text_of(digest: str) -> str:
+        if digest not in texts:
+            blob = blobs[digest]
+            if blob.encoding == "delta":
+                texts[digest] = _apply_delta(text_of(blob.base_hash), blob.data)
+            else:
+                texts[digest] = _decompress(blob.data)
+        return texts[digest]
+
+    return {d: text_of(d) for d in digests}
+
+
+def upgrade() -> None:
+    op.create_table(
+        "doc_content_blobs",
+        sa.Column("tenant_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("tenants.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("content_hash", sa.String(64), nullable=False),
+        sa.Column("encoding", sa.String(10), nullable=False, server_default="zlib"),
+        sa.Column("base_hash", sa.String(64), nullable=True),
+        sa.Column("chain_depth", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("data", sa.LargeBinary(), nullable=False),
+        sa.Column("size_bytes", sa.Integer(), nullable=False),
+        sa.Column("stored_bytes", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+        sa.PrimaryKeyConstraint("tenant_id", "content_hash", name="pk_doc_content_blobs"),
+    )
+    op.create_index("ix_doc_content_blobs_tenant_id", "doc_content_blobs", ["tenant_id"])
+
+    for table in VERSION_TABLES:
+        op.add_column(table, sa.Column("content_hash", sa.String(64), nullable=True))
+        op.execute(f"""
+            UPDATE {table}
+            SET content_hash = encode(sha256(convert_to(content, 'UTF8')), 'hex')
+            WHERE content IS NOT NULL
+        """)
+
+    # One full (zlib) blob per distinct text and tenant. Deltas only start
+    # with versions written after this migration. Versions are read in
+    # batches so memory does not grow with the number of documents.
+    bind = op.get_bind()
+    blobs = sa.table(
+        "doc_content_blobs",
+        sa.column("tenant_id"), sa.column("content_hash"), sa.column("encoding"),
+        sa.column("chain_depth"), sa.column("data"), sa.column("size_bytes"), sa.column("stored_bytes"),
+    )
+    insert_blobs = postgresql.insert(blobs).on_conflict_do_nothing()
+    for table in VERSION_TABLES:
+        batch = sa.text(f"""
+            SELECT id, tenant_id, content FROM {table}
+            WHERE content IS NOT NULL AND id > CAST(:after AS uuid)
+            ORDER BY id LIMIT {BATCH_SIZE}
+        """)
+        after = NIL_UUID
+        while rows := bind.execute(batch, {"after": after}).all():
+            values = {}
+            for _, tenant_id, content in rows:
+                raw = content.encode("utf-8")
+                digest = hashlib.sha256(raw).hexdigest()
+                data = zlib.compress(raw, 6)
+                values[(tenant_id, digest)] = dict(
+                    tenant_id=tenant_id, content_hash=digest, encoding="zlib", chain_depth=0,
+                    data=data, size_bytes=len(raw), stored_bytes=len(data),
+                )
+            bind.execute(insert_blobs, list(values.values()))
+            after = str(rows[-1].id)
+
+    for table in VERSION_TABLES:
+        op.drop_column(table, "content")
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    for table in VERSION_TABLES:
+        op.add_column(table, sa.Column("content", sa.Text(), nullable=True))
+        batch = sa.text(f"""
+            SELECT id, tenant_id, content_hash FROM {table}
+            WHERE content_hash IS NOT NULL AND id > CAST(:after AS uuid)
+            ORDER BY id LIMIT {BATCH_SIZE}
+        """)
+        update = sa.text(f"UPDATE {table} SET content = :content WHERE id = :id")
+        after = NIL_UUID
+        while versions := bind.execute(batch, {"after": after}).all():
+            by_tenant: dict = {}
+            for v in versions:
+                by_tenant.setdefault(v.tenant_id, set()).add(v.content_hash)
+            texts = {
+                (tenant_id, digest): text
+                for tenant_id, digests in by_tenant.items()
+                for digest, text in _load_texts(bind, tenant_id, digests).items()
+            }
+            bind.execute(update, [
+                {"content": texts[(v.tenant_id, v.content_hash)], "id": v.id} for v in versions
+            ])
+            after = str(versions[-1].id)
+        op.drop_column(table, "content_hash")
+    op.drop_table("doc_content_blobs")
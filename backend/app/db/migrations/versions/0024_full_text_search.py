@@ -0,0 +1,129 @@
+"""Full-text search vectors (norwegian + simple) with GIN indexes
+
+Revision ID: 0024_full_text_search
+Revises: 0023_doc_content_blobs
+Create Date: 2025-01-01 00:00:23
+"""
+import json
+import zlib
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = "0024_full_text_search"
+down_revision: Union[str, None] = "0023_doc_content_blobs"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+CONFIGS = ("norwegian", "simple")
+MAX_INDEXED_CHARS = 100_000
+BATCH_SIZE = 500
+NIL_UUID = "00000000-0000-0000-0000-000000000000"
+
+# table → [(column, weight)]
+SEARCHABLE = {
+    "project_docs": [("doc_no", "A"), ("title", "A"), ("doc_type", "C"), ("category", "C")],
+    "incidents": [("incident_no", "A"), ("title", "A"), ("description", "B"), ("location", "C")],
+    "nonconformances": [("nc_no", "A"), ("title", "A"), ("description", "B"), ("root_cause", "C")],
+    "message_threads": [("subject", "A")],
+    "incoming_messages": [("subject_raw", "A"), ("sender_name", "C"), ("sender_email", "C"), ("body_text", "B")],
+    "drawings": [("drawing_no", "A"), ("title", "A"), ("discipline", "C")],
+    "tasks": [("title", "A"), ("description", "B")],
+}
+
+
+def _vector(value: str, weight: str) -> str:
+    return " || ".join(
+        f"setweight(to_tsvector('{config}', left(coalesce({value}, ''), {MAX_INDEXED_CHARS})), '{weight}')"
+        for config in CONFIGS
+    )
+
+
+# Blob codec as of this revision, kept here (see 0023_doc_content_blobs)
+
+def _decompress(data: bytes) -> str:
+    return zlib.decompress(data).decode("utf-8")
+
+
+def _apply_delta(base: str, delta: bytes) -> str:
+    base_lines = base.splitlines(keepends=True)
+    parts = []
+    for op_ in json.loads(zlib.decompress(delta)):
+        if op_[0] == "c":
+            parts.extend(base_lines[op_[1]:op_[2]])
+        else:
+            parts.append(op_[1])
+    return "".join(parts)
+
+
+_FETCH_BLOBS = sa.text(
+    "SELECT content_hash, encoding, base_hash, data FROM doc_content_blobs "
+    "WHERE tenant_id = CAST(:tenant_id AS uuid) AND content_hash IN :hashes"
+).bindparams(sa.bindparam("hashes", expanding=True))
+
+
+def _load_texts(bind, tenant_id, blobs: dict) -> dict[str, str]:
+    """hash → text for the given blob rows of one tenant, fetching delta bases as needed."""
+    digests = list(blobs)
+    blobs = dict(blobs)
+    wanted = {b.base_hash for b in blobs.values() if b.encoding == "delta"} - blobs.keys()
+    while wanted:
+        rows = bind.execute(_FETCH_BLOBS, {"tenant_id": str(tenant_id), "hashes": sorted(wanted)}).all()
+        blobs.update((r.content_hash, r) for r in rows)
+        wanted = {r.base_hash for r in rows if r.encoding == "delta"} - blobs.keys()
+    texts: dict[str, str] = {}
+
+    def text_of(digest: str) -> str:
+        if digest not in texts:
+            blob = blobs[digest]
+            if blob.encoding == "delta":
+                texts[digest] = _apply_delta(text_of(blob.base_hash), blob.data)
+            else:
+                texts[digest] = _decompress(blob.data)
+        return texts[digest]
+
+    return {d: text_of(d) for d in digests}
+
+
+def upgrade() -> None:
+    for table, weighted in SEARCHABLE.items():
+        expression = " || ".join(_vector(column, weight) for column, weight in weighted)
+        op.add_column(table, sa.Column(
+            "search_vector", postgresql.TSVECTOR(), sa.Computed(expression, persisted=True), nullable=True,
+        ))
+        op.execute(f"CREATE INDEX ix_{table}_search ON {table} USING gin (search_vector)")
+
+    # Document text is compressed, so blob vectors are computed here (in
+    # batches, per tenant) and on insert
+    op.add_column("doc_content_blobs", sa.Column("search_vector", postgresql.TSVECTOR(), nullable=True))
+    bind = op.get_bind()
+    batch = sa.text(f"""
+        SELECT tenant_id, content_hash, encoding, base_hash, data FROM doc_content_blobs
+        WHERE (tenant_id, content_hash) > (CAST(:after_tenant AS uuid), :after_hash)
+        ORDER BY tenant_id, content_hash LIMIT {BATCH_SIZE}
+    """)
+    update = sa.text(f"""
+        UPDATE doc_content_blobs SET search_vector = {_vector(":content", "B")}
+        WHERE tenant_id = CAST(:tenant_id AS uuid) AND content_hash = :content_hash
+    """)
+    after = {"after_tenant": NIL_UUID, "after_hash": ""}
+    while rows := bind.execute(batch, after).all():
+        by_tenant: dict = {}
+        for r in rows:
+            by_tenant.setdefault(r.tenant_id, {})[r.content_hash] = r
+        bind.execute(update, [
+            {"content": text, "tenant_id": str(tenant_id), "content_hash": digest}
+            for tenant_id, blobs in by_tenant.items()
+            for digest, text in _load_texts(bind, tenant_id, blobs).items()
+        ])
+        after = {"after_tenant": str(rows[-1].tenant_id), "after_hash": rows[-1].content_hash}
+    op.execute("CREATE INDEX ix_doc_content_blobs_search ON doc_content_blobs USING gin (search_vector)")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_doc_content_blobs_search")
+    op.drop_column("doc_content_blobs", "search_vector")
+    for table in SEARCHABLE:
+        op.execute(f"DROP INDEX IF EXISTS ix_{table}_search")
+        op.drop_column(table, "search_vector")
@@ -0,0 +1,35 @@
+"""Version counters for optimistic concurrency
+
+Revision ID: 0025_row_versions
+Revises: 0024_full_text_search
+Create Date: 2025-01-01 00:00:24
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0025_row_versions"
+down_revision: Union[str, None] = "0024_full_text_search"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+VERSIONED_TABLES = (
+    "nonconformances",
+    "capa_actions",
+    "tasks",
+    "project_doc_versions",
+    "checklist_runs",
+    "timesheets",
+    "time_entries",
+)
+
+
+def upgrade() -> None:
+    # Constant default: no table rewrite (Postgres 11+)
+    for table in VERSIONED_TABLES:
+        op.add_column(table, sa.Column("version", sa.Integer(), nullable=False, server_default=sa.text("1")))
+
+
+def downgrade() -> None:
+    for table in VERSIONED_TABLES:
+        op.drop_column(table, "version")
@@ -0,0 +1,33 @@
+"""pg_trgm indexes for drawing register search; index for revision chains
+
+Revision ID: 0026_drawing_trigram_search
+Revises: 0025_row_versions
+Create Date: 2025-01-01 00:00:25
+"""
+from typing import Sequence, Union
+from alembic import op
+
+revision: str = "0026_drawing_trigram_search"
+down_revision: Union[str, None] = "0025_row_versions"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRIGRAM_COLUMNS = ("drawing_no", "discipline")
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for column in TRIGRAM_COLUMNS:
+        op.create_index(
+            f"ix_drawings_{column}_trgm", "drawings", [column],
+            postgresql_using="gin", postgresql_ops={column: "gin_trgm_ops"},
+        )
+    # Walking a revision chain towards newer revisions
+    op.create_index("ix_drawings_supersedes_drawing_id", "drawings", ["supersedes_drawing_id"])
+
+
+def downgrade() -> None:
+    # pg_trgm is left installed; other database objects may use it
+    op.drop_index("ix_drawings_supersedes_drawing_id", table_name="drawings")
+    for column in TRIGRAM_COLUMNS:
+        op.drop_index(f"ix_drawings_{column}_trgm", table_name="drawings")
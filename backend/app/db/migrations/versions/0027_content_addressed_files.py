@@ -0,0 +1,36 @@
+"""Content-addressed file storage: files.sha256, 64-bit sizes, storage_path
+limited to the tenant's own content keys
+
+Revision ID: 0027_content_addressed_files
+Revises: 0026_drawing_trigram_search
+Create Date: 2025-01-01 00:00:26
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0027_content_addressed_files"
+down_revision: Union[str, None] = "0026_drawing_trigram_search"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("files", sa.Column("sha256", sa.String(64), nullable=True))
+    op.create_index("ix_files_tenant_sha256", "files", ["tenant_id", "sha256"])
+    op.alter_column("files", "size_bytes", type_=sa.BigInteger(), existing_nullable=True)
+
+    # storage_path used to be client-supplied; anything that is not exactly
+    # <tenant_id>/<sha256[:2]>/<sha256> has no bytes the tenant may read.
+    # Not reverted on downgrade.
+    op.execute(r"""
+        UPDATE files SET storage_path = NULL
+        WHERE storage_path IS NOT NULL
+          AND storage_path !~ ('^' || tenant_id::text || '/([0-9a-f]{2})/\1[0-9a-f]{62}$')
+    """)
+
+
+def downgrade() -> None:
+    op.alter_column("files", "size_bytes", type_=sa.Integer(), existing_nullable=True)
+    op.drop_index("ix_files_tenant_sha256", table_name="files")
+    op.drop_column("files", "sha256")
@@ -243,3 +243,49 @@ DROP POLICY IF EXISTS tenant_isolation ON payroll_export_lines;
 CREATE POLICY tenant_isolation ON payroll_export_lines
     USING (tenant_id = current_setting('app.tenant_id', true)::uuid)
     WITH CHECK (tenant_id = current_setting('app.tenant_id', true)::uuid);
+
+-- Time entry import RLS
+ALTER TABLE time_entry_imports ENABLE ROW LEVEL SECURITY;
+ALTER TABLE time_entry_import_rejects ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS tenant_isolation ON time_entry_imports;
+CREATE POLICY tenant_isolation ON time_entry_imports
+    USING (tenant_id = current_setting('app.tenant_id', true)::uuid)
+    WITH CHECK (tenant_id = current_setting('app.tenant_id', true)::uuid);
+
+DROP POLICY IF EXISTS tenant_isolation ON time_entry_import_rejects;
+CREATE POLICY tenant_isolation ON time_entry_import_rejects
+    USING (tenant_id = current_setting('app.tenant_id', true)::uuid)
+    WITH CHECK (tenant_id = current_setting('app.tenant_id', true)::uuid);
+
+-- Overtime policy RLS
+ALTER TABLE overtime_policies ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS tenant_isolation ON overtime_policies;
+CREATE POLICY tenant_isolation ON overtime_policies
+    USING (tenant_id = current_setting('app.tenant_id', true)::uuid)
+    WITH CHECK (tenant_id = current_setting('app.tenant_id', true)::uuid);
+
+-- Payroll export line entries RLS
+ALTER TABLE payroll_export_line_entries ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS tenant_isolation ON payroll_export_line_entries;
+CREATE POLICY tenant_isolation ON payroll_export_line_entries
+    USING (tenant_id = current_setting('app.tenant_id', true)::uuid)
+    WITH CHECK (tenant_id = current_setting('app.tenant_id', true)::uuid);
+
+-- Checklist run answers RLS
+ALTER TABLE checklist_run_answers ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS tenant_isolation ON checklist_run_answers;
+CREATE POLICY tenant_isolation ON checklist_run_answers
+    USING (tenant_id = current_setting('app.tenant_id', true)::uuid)
+    WITH CHECK (tenant_id = current_setting('app.tenant_id', true)::uuid);
+
+-- Document content blobs RLS
+ALTER TABLE doc_content_blobs ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS tenant_isolation ON doc_content_blobs;
+CREATE POLICY tenant_isolation ON doc_content_blobs
+    USING (tenant_id = current_setting('app.tenant_id', true)::uuid)
+    WITH CHECK (tenant_id = current_setting('app.tenant_id', true)::uuid);
@@ -0,0 +1,82 @@
+"""
+Full-text search columns.
+
+Searchable tables carry search_vector, a stored generated tsvector kept up to
+date by Postgres on every write (ORM, bulk INSERT ... SELECT and raw SQL
+alike), with a GIN index. Each text is indexed twice:
+
+  - 'norwegian' stems words, so "avviket" finds "avvik"
+  - 'simple' keeps tokens as written, so numbers and codes (RUH-0042,
+    A-101, names) match exactly
+
+Queries OR the two parses of the search string (see search_query).
+
+Substring filters on short code-like columns (drawing numbers, disciplines)
+use pg_trgm GIN indexes instead: ILIKE '%...%' is answered from the index
+when the pattern has at least three characters (see trigram_index, contains).
+"""
+from sqlalchemy import Computed, Index, cast, func, literal
+from sqlalchemy.dialects.postgresql import REGCONFIG, TSVECTOR
+from sqlalchemy.orm import mapped_column
+
+SEARCH_CONFIGS = ("norwegian", "simple")
+# tsvector is capped at 1 MB; long mail bodies and documents are indexed up to here
+MAX_INDEXED_CHARS = 100_000
+
+
+def search_vector_sql(*weighted: tuple[str, str]) -> str:
+    """[(column, weight), ...] → generated column expression."""
+    parts = [
+        f"setweight(to_tsvector('{config}', left(coalesce({column}, ''), {MAX_INDEXED_CHARS})), '{weight}')"
+        for column, weight in weighted
+        for config in SEARCH_CONFIGS
+    ]
+    return " || ".join(parts)
+
+
+def search_vector_column(*weighted: tuple[str, str]):
+    """
+    Generated search_vector over the given (column, weight) pairs.
+    Deferred: it is only used in WHERE/ORDER BY, never loaded into objects.
+    """
+    return mapped_column(
+        TSVECTOR, Computed(search_vector_sql(*weighted), persisted=True),
+        nullable=True, deferred=True,
+    )
+
+
+def search_index(table: str) -> Index:
+    return Index(f"ix_{table}_search", "search_vector", postgresql_using="gin")
+
+
+def trigram_index(table: str, column: str) -> Index:
+    """GIN pg_trgm index serving contains() on column."""
+    return Index(
+        f"ix_{table}_{column}_trgm", column,
+        postgresql_using="gin", postgresql_ops={column: "gin_trgm_ops"},
+    )
+
+
+def contains(column, text: str):
+    """Case-insensitive substring match; % and _ in text are matched literally."""
+    escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return column.ilike(f"%{escaped}%", escape="\\")
+
+
+def search_vector(text: str, weight: str = "B"):
+    """tsvector expression for a text value computed on write (document content)."""
+    value = text[:MAX_INDEXED_CHARS]
+    vector = None
+    for config in SEARCH_CONFIGS:
+        part = func.setweight(func.to_tsvector(cast(literal(config), REGCONFIG), value), weight)
+        vector = part if vector is None else vector.op("||")(part)
+    return vector
+
+
+def search_query(q: str):
+    """User input → tsquery (websearch syntax: "quoted phrase", -exclude, or)."""
+    query = None
+    for config in SEARCH_CONFIGS:
+        part = func.websearch_to_tsquery(cast(literal(config), REGCONFIG), q)
+        query = part if query is None else query.op("||")(part)
+    return query
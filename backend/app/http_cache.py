@@ -0,0 +1,286 @@
+"""
+HTTP caching for API responses.
+
+Mutable rows (timesheets, incidents, NCs, runs, project docs) get an ETag
+from a single column: the version counter of versioned rows (VersionedMixin,
+strong ETag "<id>-v<version>"), otherwise updated_at (weak ETag). A GET with a
+matching If-None-Match is answered with a 304 after a single-column
+primary-key SELECT, before the row is loaded or serialised.
+
+Edits of versioned rows accept If-Match with that ETag and answer 412 when
+the row has moved on (check_if_match). The flush itself is conditional on
+the version that was read, so a concurrent writer also gets 412 instead of
+silently overwriting.
+
+Immutable resources (published library versions, active project checklist
+versions) are serialised once and kept in-process, keyed by tenant, kind and
+id. Every fetch first runs one narrow query for the version's status, which
+also checks that it still exists and belongs to the path; the version itself
+is not loaded or serialised again.
+  - a single version is served without its status (the only part that still
+    changes, published → superseded) with a strong ETag and
+    Cache-Control: immutable, or a 304 when the client already holds it;
+  - the version lists the apps fetch on launch are assembled from the cached
+    versions plus the current statuses (drafts are loaded as usual) and
+    served with a strong ETag of the list body, revalidated on every fetch.
+"""
+import hashlib
+import json
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from threading import Lock
+from functools import lru_cache
+from typing import Awaitable, Callable, Iterable
+
+from fastapi import HTTPException, Request, Response
+from pydantic import BaseModel, create_model
+from sqlalchemy import inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.fieldsets import sparse_model
+
+IMMUTABLE_CACHE_CONTROL = "private, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "private, no-cache"
+
+
+def strong_etag(body: bytes) -> str:
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """If-None-Match check (weak comparison, as RFC 9110 prescribes for GET)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    bare = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == bare for tag in header.split(","))
+
+
+def not_modified(etag: str, cache_control: str | None = None) -> Response:
+    headers = {"ETag": etag}
+    if cache_control:
+        headers["Cache-Control"] = cache_control
+    return Response(status_code=304, headers=headers)
+
+
+# ── Immutable representations ─────────────────────────────────────────────────
+
+def _json_bytes(value) -> bytes:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+@dataclass(frozen=True)
+class CachedVersion:
+    fields: dict    # JSON-ready read schema; status as cached, overridden on use
+    body: bytes     # fields without status
+    etag: str
+
+
+class ImmutableCache:
+    def __init__(self, maxsize: int = 2048) -> None:
+        self.maxsize = maxsize
+        self._items: OrderedDict[tuple[uuid.UUID, str, uuid.UUID], CachedVersion] = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, tenant_id: uuid.UUID, kind: str, resource_id: uuid.UUID) -> CachedVersion | None:
+        key = (tenant_id, kind, resource_id)
+        with self._lock:
+            cached = self._items.get(key)
+            if cached is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return cached
+
+    def put(self, tenant_id: uuid.UUID, kind: str, resource_id: uuid.UUID, fields: dict) -> CachedVersion:
+        body = _json_bytes({k: v for k, v in fields.items() if k != "status"})
+        cached = CachedVersion(fields=fields, body=body, etag=strong_etag(body))
+        key = (tenant_id, kind, resource_id)
+        with self._lock:
+            self._items[key] = cached
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+        return cached
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self.hits = self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+immutable_bodies = ImmutableCache()
+
+
+@lru_cache
+def immutable_model(schema: type[BaseModel]) -> type[BaseModel]:
+    """schema without status: the body of a single immutable version."""
+    fields = {name: (info.annotation, info) for name, info in schema.model_fields.items() if name != "status"}
+    return create_model(
+        f"{schema.__name__}Immutable",
+        __doc__=f"{schema.__name__} without status, which is read from the version list.",
+        **fields,
+    )
+
+
+async def serve_immutable(
+    request: Request,
+    tenant_id: uuid.UUID,
+    kind: str,
+    resource_id: uuid.UUID,
+    schema: type[BaseModel],
+    load: Callable[[], Awaitable[object | None]],
+) -> Response:
+    """
+    Serve an immutable version from the cache. The caller has already checked
+    (one narrow query) that it exists, belongs to the path and is immutable;
+    load() returns the row and only runs on a miss.
+    """
+    cached = immutable_bodies.get(tenant_id, kind, resource_id)
+    if cached is None:
+        row = await load()
+        if row is None:
+            raise HTTPException(404, "Version not found or not published")
+        fields = schema.model_validate(row).model_dump(mode="json")
+        cached = immutable_bodies.put(tenant_id, kind, resource_id, fields)
+    if etag_matches(request, cached.etag):
+        return not_modified(cached.etag, IMMUTABLE_CACHE_CONTROL)
+    return Response(
+        content=cached.body,
+        media_type="application/json",
+        headers={"ETag": cached.etag, "Cache-Control": IMMUTABLE_CACHE_CONTROL},
+    )
+
+
+async def serve_version_list(
+    request: Request,
+    tenant_id: uuid.UUID,
+    kind: str,
+    schema: type[BaseModel],
+    versions: Iterable[tuple[uuid.UUID, str]],
+    immutable_statuses: set[str],
+    selected: list[str],
+    load: Callable[[list[uuid.UUID], list[str] | None], Awaitable[list]],
+) -> Response:
+    """
+    A version list from (id, status) in list order. Immutable versions come
+    from the cache; load(ids, None) loads full rows for the ones not cached
+    yet, load(ids, selected) the selected columns of mutable versions.
+    """
+    versions = list(versions)
+    items: dict[uuid.UUID, dict] = {}
+    missing, mutable = [], []
+    for version_id, status in versions:
+        if status not in immutable_statuses:
+            mutable.append(version_id)
+        elif cached := immutable_bodies.get(tenant_id, kind, version_id):
+            items[version_id] = cached.fields
+        else:
+            missing.append(version_id)
+    if missing:
+        for row in await load(missing, None):
+            items[row.id] = immutable_bodies.put(
+                tenant_id, kind, row.id, schema.model_validate(row).model_dump(mode="json")
+            ).fields
+    if mutable:
+        sparse = sparse_model(schema)
+        for row in await load(mutable, selected):
+            items[row.id] = sparse.model_validate(
+                {n: getattr(row, n) for n in selected}
+            ).model_dump(mode="json", exclude_unset=True)
+    body = _json_bytes([
+        {n: status if n == "status" else items[version_id][n] for n in selected}
+        for version_id, status in versions
+        if version_id in items
+    ])
+    etag = strong_etag(body)
+    if etag_matches(request, etag):
+        return not_modified(etag, REVALIDATE_CACHE_CONTROL)
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={"ETag": etag, "Cache-Control": REVALIDATE_CACHE_CONTROL},
+    )
+
+
+# ── Conditional GET on mutable rows ───────────────────────────────────────────
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def weak_etag(resource_id: uuid.UUID, updated_at: datetime) -> str:
+    """W/"<id>-<updated_at in µs>": changes on every ORM update (TimestampMixin.onupdate)."""
+    micros = (updated_at - _EPOCH) // timedelta(microseconds=1)
+    return f'W/"{resource_id.hex}-{micros:x}"'
+
+
+def version_etag(resource_id: uuid.UUID, version: int) -> str:
+    """"<id>-v<version>": strong, so it can be sent back in If-Match."""
+    return f'"{resource_id.hex}-v{version}"'
+
+
+def _is_versioned(model) -> bool:
+    mapper = inspect(model, raiseerr=False)
+    return mapper is not None and mapper.version_id_col is not None
+
+
+def row_etag(row) -> str:
+    if _is_versioned(type(row)):
+        return version_etag(row.id, row.version)
+    return weak_etag(row.id, row.updated_at)
+
+
+async def not_modified_since(
+    request: Request, db: AsyncSession, model, resource_id: uuid.UUID
+) -> Response | None:
+    """
+    304 if the client's If-None-Match still matches the row, checked with a
+    primary-key SELECT of version (or updated_at) only. None means: load and
+    serve as usual.
+    """
+    if not request.headers.get("if-none-match"):
+        return None
+    versioned = _is_versioned(model)
+    result = await db.execute(
+        select(model.version if versioned else model.updated_at)
+        .where(model.id == resource_id, model.is_deleted == False)
+    )
+    value = result.scalar_one_or_none()
+    if value is None:
+        return None
+    etag = version_etag(resource_id, value) if versioned else weak_etag(resource_id, value)
+    if etag_matches(request, etag):
+        return not_modified(etag, REVALIDATE_CACHE_CONTROL)
+    return None
+
+
+def set_etag(response: Response, row) -> None:
+    response.headers["ETag"] = row_etag(row)
+    response.headers["Cache-Control"] = REVALIDATE_CACHE_CONTROL
+
+
+# ── Preconditions on versioned rows ───────────────────────────────────────────
+
+def check_if_match(if_match: str | None, row) -> None:
+    """
+    412 unless If-Match names the row's current version (strong comparison,
+    so weak tags never match). Without the header there is no precondition;
+    the conditional flush still rejects a write that raced another one.
+    """
+    if if_match is None or if_match.strip() == "*":
+        return
+    current = version_etag(row.id, row.version)
+    if not any(tag.strip() == current for tag in if_match.split(",")):
+        raise HTTPException(
+            412, "Precondition failed: the resource has been modified", headers={"ETag": current}
+        )
@@ -1,5 +1,9 @@
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager, suppress
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from sqlalchemy.orm.exc import StaleDataError
 from app.core.audit.service import AuditMiddleware
 from app.core.auth.router import router as auth_router
 from app.core.tenants.router import router as tenants_router
@@ -13,17 +17,37 @@ from app.core.documents.router import router as documents_router
 from app.core.checklists.router import router as checklists_router
 from app.core.drawings.router import router as drawings_router
 from app.core.timesheets.router import router as timesheets_router
+from app.core.search.router import router as search_router
+from app.core.files.router import router as files_router
+from app.core.timesheets import presence
+from app.core.checklists import scheduler as checklist_scheduler
 from app.settings import get_settings
 
 settings = get_settings()
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await presence.rebuild_on_startup()
+    scheduler_task = None
+    if settings.CHECKLIST_SCHEDULER_ENABLED:
+        scheduler_task = asyncio.create_task(
+            checklist_scheduler.run_forever(settings.CHECKLIST_SCHEDULER_INTERVAL_SECONDS)
+        )
+    yield
+    if scheduler_task is not None:
+        scheduler_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await scheduler_task
+
+
 def create_app() -> FastAPI:
     app = FastAPI(
         title="HMSK Platform API",
         version="0.7.0",
         docs_url="/docs" if settings.APP_DEBUG else None,
         redoc_url="/redoc" if settings.APP_DEBUG else None,
+        lifespan=lifespan,
     )
     app.add_middleware(AuditMiddleware)
     app.add_middleware(
@@ -45,6 +69,16 @@ def create_app() -> FastAPI:
     app.include_router(checklists_router)
     app.include_router(drawings_router)
     app.include_router(timesheets_router)
+    app.include_router(search_router)
+    app.include_router(files_router)
+
+    @app.exception_handler(StaleDataError)
+    async def version_conflict(request: Request, exc: StaleDataError):
+        # A versioned row (VersionedMixin) was changed by someone else between read and write
+        return JSONResponse(
+            status_code=412,
+            content={"detail": "Precondition failed: the resource has been modified"},
+        )
 
     @app.get("/health")
     async def health():
@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from functools import lru_cache
+from zoneinfo import ZoneInfo
 
 
 class Settings(BaseSettings):
@@ -15,8 +16,26 @@ class Settings(BaseSettings):
 
     APP_ENV: str = "development"
     APP_DEBUG: bool = True
+    LOCAL_TIMEZONE: str = "Europe/Oslo"  # wall clock for days, weeks and night windows
+
+    CHECKLIST_SCHEDULER_ENABLED: bool = True
+    CHECKLIST_SCHEDULER_INTERVAL_SECONDS: int = 60
+
+    FILE_STORAGE_BACKEND: str = "local"  # local | s3
+    FILE_STORAGE_ROOT: str = "./var/files"  # local objects; upload spool for both backends
+    FILE_MAX_UPLOAD_BYTES: int = 2 * 1024 * 1024 * 1024
+    S3_ENDPOINT_URL: str = "http://localhost:9000"
+    S3_BUCKET: str = "hmsk-files"
+    S3_ACCESS_KEY: str = ""
+    S3_SECRET_KEY: str = ""
+    S3_REGION: str = "us-east-1"
 
 
 @lru_cache
 def get_settings() -> Settings:
     return Settings()
+
+
+def local_tz() -> ZoneInfo:
+    """Wall clock for local days, weeks, schedules and printed dates."""
+    return ZoneInfo(get_settings().LOCAL_TIMEZONE)
@@ -0,0 +1,71 @@
+"""
+Benchmark: validating a 200-field checklist on submit.
+
+Compares the per-submit path before the compiled-schema cache (json.loads +
+schema walk + validation on every submit) with the cached compiled validator.
+
+    python -m benchmarks.checklist_validation
+"""
+import json
+import timeit
+import uuid
+
+from app.core.checklists.service import _parse_schema
+from app.core.checklists.validation import CompiledSchemaCache, compile_schema
+
+FIELD_COUNT = 200
+ROUNDS = 2000
+
+_TYPES = ("yes_no", "text", "number", "date", "photo")
+
+
+def build_schema(n: int = FIELD_COUNT) -> list[dict]:
+    fields = []
+    for i in range(n):
+        field_type = _TYPES[i % len(_TYPES)]
+        fields.append({
+            "id": f"f{i}",
+            "label": f"Kontrollpunkt {i}",
+            "field_type": field_type,
+            "required": i % 2 == 0,
+            "requires_image": field_type == "photo",
+            "creates_nc_on_no": field_type == "yes_no",
+        })
+    return fields
+
+
+def build_answers(fields: list[dict]) -> dict:
+    sample = {"yes_no": "Yes", "text": "OK", "number": 12.5, "date": "2026-02-02", "photo": None}
+    return {
+        f["id"]: {
+            "value": sample[f["field_type"]],
+            "file_ids": [str(uuid.uuid4())] if f["field_type"] == "photo" else [],
+        }
+        for f in fields
+    }
+
+
+def main() -> None:
+    fields = build_schema()
+    schema_json = json.dumps(fields)
+    answers = build_answers(fields)
+    version_id = uuid.uuid4()
+    cache = CompiledSchemaCache()
+
+    def uncached():
+        return compile_schema(_parse_schema(schema_json)).validate(answers)
+
+    def cached():
+        return cache.get_or_compile(version_id, "active", schema_json, _parse_schema).validate(answers)
+
+    assert uncached() == [] and cached() == []
+    t_uncached = min(timeit.repeat(uncached, number=ROUNDS, repeat=3)) / ROUNDS
+    t_cached = min(timeit.repeat(cached, number=ROUNDS, repeat=3)) / ROUNDS
+    print(f"{FIELD_COUNT}-field checklist, per submit:")
+    print(f"  parse + compile + validate : {t_uncached * 1e6:8.1f} µs")
+    print(f"  cached compiled validate   : {t_cached * 1e6:8.1f} µs")
+    print(f"  speedup                    : {t_uncached / t_cached:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
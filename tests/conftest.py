@@ -1,8 +1,15 @@
+import os
+import uuid
+from types import SimpleNamespace
+
 import pytest
 import pytest_asyncio
 from httpx import AsyncClient, ASGITransport
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
 
 from app.main import app
+from app.settings import get_settings
 
 
 @pytest.fixture(scope="session")
@@ -14,3 +21,48 @@ def anyio_backend():
 async def client():
     async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as c:
         yield c
+
+
+@pytest_asyncio.fixture
+async def db():
+    """
+    Session on the migrated test database (`make migrate`), rolled back after
+    the test. Service code may commit; commits land in a savepoint.
+    Skips when no database is reachable.
+    """
+    url = os.environ.get("TEST_DATABASE_URL") or get_settings().DATABASE_URL
+    engine = create_async_engine(url, poolclass=NullPool)
+    try:
+        conn = await engine.connect()
+    except Exception as exc:
+        await engine.dispose()
+        pytest.skip(f"database not reachable: {exc}")
+    trans = await conn.begin()
+    session = AsyncSession(
+        bind=conn, expire_on_commit=False, autoflush=False,
+        join_transaction_mode="create_savepoint",
+    )
+    try:
+        yield session
+    finally:
+        await session.close()
+        await trans.rollback()
+        await conn.close()
+        await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def tenant(db):
+    """A fresh tenant with one user and one project."""
+    from app.core.projects.models import Project
+    from app.core.rbac.models import User
+    from app.core.tenants.models import Tenant
+
+    t = Tenant(name="Test AS", slug=f"test-{uuid.uuid4().hex[:12]}")
+    db.add(t)
+    await db.flush()
+    user = User(tenant_id=t.id, email="worker@test.no", full_name="Worker")
+    project = Project(tenant_id=t.id, project_no="P-001", name="Test")
+    db.add_all([user, project])
+    await db.flush()
+    return SimpleNamespace(id=t.id, user=user, project=project)
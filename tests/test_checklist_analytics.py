@@ -0,0 +1,16 @@
+from app.core.checklists.analytics import shred_answers
+
+
+def test_shred_answers_normalises_values():
+    rows = {r["field_id"]: r for r in shred_answers({
+        "f1": {"value": " No "},
+        "f2": {"value": 12.5},
+        "f3": {"value": ""},
+        "f4": {"value": None, "file_ids": ["a", "b"]},
+        "f5": "Yes",
+    })}
+    assert rows["f1"]["value_text"] == " No " and rows["f1"]["value_norm"] == "no"
+    assert rows["f2"]["value_text"] == "12.5"
+    assert rows["f3"]["value_norm"] is None
+    assert rows["f4"]["value_norm"] is None and rows["f4"]["file_count"] == 2
+    assert rows["f5"]["value_norm"] == "yes" and rows["f5"]["file_count"] == 0
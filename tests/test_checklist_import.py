@@ -0,0 +1,84 @@
+import json
+import uuid
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+
+from app.core.checklists.models import (
+    ChecklistTemplate, ChecklistTemplateVersion,
+    ProjectChecklistTemplate, ProjectChecklistTemplateVersion,
+)
+from app.core.checklists.schemas import ChecklistBulkImportRequest
+from app.core.checklists.service import import_checklist_to_projects
+from app.core.projects.models import Project
+from app.core.tenants.models import Tenant
+
+SCHEMA_JSON = json.dumps([{"id": "f1", "label": "Sikret?", "field_type": "yes_no"}])
+
+
+async def _published_version(db, tenant_id, checklist_no="CL-001"):
+    template = ChecklistTemplate(tenant_id=tenant_id, checklist_no=checklist_no, title="Stillas", category="HMS")
+    db.add(template)
+    await db.flush()
+    version = ChecklistTemplateVersion(
+        tenant_id=tenant_id, template_id=template.id, version_no=1,
+        schema_json=SCHEMA_JSON, status="published",
+    )
+    db.add(version)
+    await db.flush()
+    return version
+
+
+@pytest.mark.asyncio
+async def test_fan_out_skips_existing_reports_missing_and_numbers_per_project(db, tenant):
+    version = await _published_version(db, tenant.id)
+    other_version = await _published_version(db, tenant.id, "CL-002")
+    fresh = Project(tenant_id=tenant.id, project_no="P-002", name="Fresh")
+    holder = Project(tenant_id=tenant.id, project_no="P-003", name="Holder")
+    db.add_all([fresh, holder])
+    await db.flush()
+    db.add_all([
+        # tenant.project already holds another checklist → next is PCL-002
+        ProjectChecklistTemplate(
+            tenant_id=tenant.id, project_id=tenant.project.id, checklist_no="PCL-001", title="Annen",
+            source_checklist_template_version_id=other_version.id,
+        ),
+        ProjectChecklistTemplate(
+            tenant_id=tenant.id, project_id=holder.id, checklist_no="PCL-001", title="Stillas",
+            source_checklist_template_version_id=version.id,
+        ),
+    ])
+    await db.flush()
+    unknown = uuid.uuid4()
+
+    result = await import_checklist_to_projects(db, tenant.id, ChecklistBulkImportRequest(
+        checklist_template_version_id=version.id,
+        project_ids=[tenant.project.id, fresh.id, holder.id, unknown],
+    ), tenant.user.id)
+
+    numbers = {i["project_id"]: i["checklist_no"] for i in result["imported"]}
+    assert numbers == {tenant.project.id: "PCL-002", fresh.id: "PCL-001"}
+    assert result["skipped_project_ids"] == [holder.id]
+    assert result["missing_project_ids"] == [unknown]
+
+    copies = await db.execute(
+        select(ProjectChecklistTemplateVersion.schema_json).where(
+            ProjectChecklistTemplateVersion.checklist_id.in_([i["checklist_id"] for i in result["imported"]])
+        )
+    )
+    assert copies.scalars().all() == [SCHEMA_JSON, SCHEMA_JSON]
+
+
+@pytest.mark.asyncio
+async def test_fan_out_rejects_another_tenants_version(db, tenant):
+    other = Tenant(name="Other AS", slug=f"other-{uuid.uuid4().hex[:12]}")
+    db.add(other)
+    await db.flush()
+    foreign = await _published_version(db, other.id)
+
+    with pytest.raises(HTTPException) as exc:
+        await import_checklist_to_projects(db, tenant.id, ChecklistBulkImportRequest(
+            checklist_template_version_id=foreign.id,
+        ), tenant.user.id)
+    assert exc.value.status_code == 404
@@ -0,0 +1,90 @@
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+import pytest
+from sqlalchemy import select
+
+from app.core.checklists.models import (
+    ChecklistRun, ChecklistTemplate, ChecklistTemplateVersion,
+    ProjectChecklistTemplate, ProjectChecklistTemplateVersion,
+)
+from app.core.checklists.scheduler import next_slot, tick
+
+T0 = datetime(2026, 3, 2, 6, 0, tzinfo=timezone.utc)
+
+
+def test_future_slot_is_kept():
+    assert next_slot(T0, "daily", 1, T0 - timedelta(hours=1)) == T0
+
+
+def test_due_slot_advances_one_step():
+    assert next_slot(T0, "daily", 1, T0) == T0 + timedelta(days=1)
+    assert next_slot(T0, "weekly", 2, T0 + timedelta(minutes=5)) == T0 + timedelta(days=14)
+
+
+def test_missed_slots_are_skipped_not_replayed():
+    # Scheduler down for three and a half days: jump straight to the next future slot
+    now = T0 + timedelta(days=3, hours=12)
+    assert next_slot(T0, "daily", 1, now) == T0 + timedelta(days=4)
+
+
+OSLO = ZoneInfo("Europe/Oslo")
+
+
+def test_daily_slot_keeps_local_time_across_dst():
+    # 07:00 in Oslo is 06:00 UTC in winter, 05:00 UTC from 29 March 2026
+    slot = datetime(2026, 3, 28, 6, 0, tzinfo=timezone.utc)
+    assert next_slot(slot, "daily", 1, slot, OSLO) == datetime(2026, 3, 29, 5, 0, tzinfo=timezone.utc)
+    # Woken at 07:30 local on the switch day: the 07:00 slot has passed as well
+    now = datetime(2026, 3, 29, 5, 30, tzinfo=timezone.utc)
+    assert next_slot(slot, "daily", 1, now, OSLO) == datetime(2026, 3, 30, 5, 0, tzinfo=timezone.utc)
+
+
+# ── tick against the database ────────────────────────────────────────────────
+
+async def _recurring_checklist(db, tenant, next_run_at):
+    template = ChecklistTemplate(tenant_id=tenant.id, checklist_no="CL-001", title="Daglig stillas")
+    db.add(template)
+    await db.flush()
+    source = ChecklistTemplateVersion(tenant_id=tenant.id, template_id=template.id, status="published")
+    db.add(source)
+    await db.flush()
+    checklist = ProjectChecklistTemplate(
+        tenant_id=tenant.id, project_id=tenant.project.id, checklist_no="PCL-001",
+        title="Daglig stillas", source_checklist_template_version_id=source.id,
+        recurrence="daily", recurrence_interval=1, next_run_at=next_run_at,
+    )
+    db.add(checklist)
+    await db.flush()
+    db.add(ProjectChecklistTemplateVersion(
+        tenant_id=tenant.id, checklist_id=checklist.id, version_no=1, schema_json="[]",
+    ))
+    await db.flush()
+    return checklist
+
+
+async def _runs(db, checklist):
+    result = await db.execute(
+        select(ChecklistRun.scheduled_for).where(ChecklistRun.checklist_id == checklist.id)
+    )
+    return sorted(result.scalars().all())
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("now", [
+    datetime(2026, 3, 28, 6, 0, 30, tzinfo=timezone.utc),
+    datetime(2026, 3, 29, 5, 30, tzinfo=timezone.utc),
+    datetime(2026, 4, 1, 10, 0, tzinfo=timezone.utc),
+])
+async def test_tick_claims_due_slot_and_advances_like_next_slot(db, tenant, now):
+    slot = datetime(2026, 3, 28, 6, 0, tzinfo=timezone.utc)  # 07:00 Oslo, day before DST
+    checklist = await _recurring_checklist(db, tenant, slot)
+
+    await tick(db, now)
+    await db.refresh(checklist)
+    assert await _runs(db, checklist) == [slot]  # only the oldest missed slot
+    assert checklist.next_run_at == next_slot(slot, "daily", 1, now, OSLO)
+    assert checklist.next_run_at.astimezone(OSLO).hour == 7
+
+    await tick(db, now)  # same instant again: nothing due
+    assert await _runs(db, checklist) == [slot]
@@ -0,0 +1,108 @@
+import json
+import uuid
+
+from app.core.checklists.service import _parse_schema, _validate_answers
+from app.core.checklists.validation import CompiledSchemaCache, compile_schema
+
+SCHEMA = [
+    {"id": "f1", "label": "Sikret?", "field_type": "yes_no", "required": True, "creates_nc_on_no": True},
+    {"id": "f2", "label": "Antall", "field_type": "number"},
+    {"id": "f3", "label": "Dato", "field_type": "date"},
+    {"id": "f4", "label": "Bilde", "field_type": "photo", "required": True, "requires_image": True},
+]
+SCHEMA_JSON = json.dumps(SCHEMA)
+
+
+def test_compiled_schema_precomputes_image_and_nc_fields():
+    compiled = compile_schema(SCHEMA)
+    assert [f["id"] for f in compiled.image_fields] == ["f4"]
+    assert [f["id"] for f in compiled.nc_fields] == ["f1"]
+
+
+def test_compiled_type_checks():
+    answers = {
+        "f1": {"value": "Kanskje"},
+        "f2": {"value": "tolv"},
+        "f3": {"value": "02.02.2026"},
+        "f4": {"value": None, "file_ids": ["x"]},
+    }
+    errors = _validate_answers(compile_schema(SCHEMA), answers, {})
+    assert len(errors) == 3
+    assert _validate_answers(SCHEMA, {
+        "f1": {"value": "no"}, "f2": {"value": "3,5"}, "f3": {"value": "2026-02-02"},
+        "f4": {"file_ids": ["x"]},
+    }, {}) == []
+
+
+def test_cache_hits_per_version_and_skips_drafts():
+    cache = CompiledSchemaCache()
+    vid = uuid.uuid4()
+    first = cache.get_or_compile(vid, "active", SCHEMA_JSON, _parse_schema)
+    assert cache.get_or_compile(vid, "active", SCHEMA_JSON, _parse_schema) is first
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    cache.get_or_compile(uuid.uuid4(), "draft", SCHEMA_JSON, _parse_schema)
+    assert len(cache) == 1
+
+    cache.evict(vid)
+    assert cache.get_or_compile(vid, "active", SCHEMA_JSON, _parse_schema) is not first
+
+
+def test_cache_is_bounded_lru():
+    cache = CompiledSchemaCache(maxsize=2)
+    a, b, c = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    cache.get_or_compile(a, "active", SCHEMA_JSON, _parse_schema)
+    cache.get_or_compile(b, "active", SCHEMA_JSON, _parse_schema)
+    cache.get_or_compile(a, "active", SCHEMA_JSON, _parse_schema)  # a most recent
+    cache.get_or_compile(c, "active", SCHEMA_JSON, _parse_schema)  # evicts b
+    assert len(cache) == 2
+    misses = cache.misses
+    cache.get_or_compile(a, "active", SCHEMA_JSON, _parse_schema)
+    assert cache.misses == misses
+    cache.get_or_compile(b, "active", SCHEMA_JSON, _parse_schema)
+    assert cache.misses == misses + 1
+
+
+def test_image_links_checked_per_referenced_file():
+    from app.core.checklists.service import _check_image_links
+    image_fields = compile_schema(SCHEMA).image_fields
+    linked_id = uuid.uuid4()
+
+    assert "file_id missing" in _check_image_links(image_fields, {"f4": {"file_ids": []}}, set())
+    assert _check_image_links(
+        image_fields, {"f4": {"file_ids": [str(linked_id).upper()]}}, {str(linked_id)}
+    ) is None
+    problem = _check_image_links(
+        image_fields, {"f4": {"file_ids": [str(linked_id), "not-linked"]}}, {str(linked_id)}
+    )
+    assert "not-linked" in problem and str(linked_id) not in problem
+
+
+def test_image_links_checked_on_optional_photo_fields():
+    from app.core.checklists.service import _check_image_links
+    schema = SCHEMA + [{"id": "f5", "label": "Ekstra bilde", "field_type": "photo"}]
+    image_fields = compile_schema(schema).image_fields
+    assert [f["id"] for f in image_fields] == ["f4", "f5"]
+    linked_id = str(uuid.uuid4())
+
+    answers = {"f4": {"file_ids": [linked_id]}}
+    assert _check_image_links(image_fields, answers, {linked_id}) is None
+    answers["f5"] = {"file_ids": ["not-linked"]}
+    problem = _check_image_links(image_fields, answers, {linked_id})
+    assert "Ekstra bilde" in problem and "not-linked" in problem
+
+
+def test_sync_file_refs_rewritten_to_created_files():
+    from app.core.checklists.service import _resolve_file_refs
+    new_id, existing_id = uuid.uuid4(), uuid.uuid4()
+    answers = {
+        "f1": {"value": "yes"},
+        "f4": {"file_ids": ["photo-1", str(existing_id).upper(), "photo-1"]},
+    }
+    linked, errors = _resolve_file_refs(answers, {"photo-1": new_id}, {str(existing_id)})
+    assert errors == []
+    assert linked == [new_id, existing_id]
+    assert answers["f4"]["file_ids"] == [str(new_id), str(existing_id), str(new_id)]
+
+    _, errors = _resolve_file_refs({"f4": {"file_ids": ["photo-2"]}}, {}, set())
+    assert errors == ["Field 'f4' references unknown file 'photo-2'"]
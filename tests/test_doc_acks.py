@@ -0,0 +1,82 @@
+import uuid
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.core.documents.service import ack_summary, get_ack_report, get_ack_summary
+
+
+def test_ack_summary_from_counters():
+    vid = uuid.uuid4()
+    assert ack_summary(vid, pending=150, acknowledged=450) == {
+        "doc_version_id": vid, "requested": 600, "acknowledged": 450,
+        "pending": 150, "completion_rate": 0.75,
+    }
+    assert ack_summary(vid, 0, 0)["completion_rate"] == 0.0
+
+
+@pytest.mark.asyncio
+async def test_ack_report_is_a_single_query():
+    class Result:
+        def all(self):
+            return []
+
+    class DB:
+        statements = []
+
+        async def execute(self, stmt):
+            self.statements.append(stmt)
+            return Result()
+
+    db = DB()
+    assert await get_ack_report(db, uuid.uuid4(), uuid.uuid4()) == []
+    assert len(db.statements) == 1
+    assert "LEFT OUTER JOIN ack_responses" in str(db.statements[0])
+
+
+@pytest.mark.asyncio
+async def test_ack_summary_is_scoped_to_tenant():
+    class Result:
+        def one_or_none(self):
+            return None
+
+    class DB:
+        statements = []
+
+        async def execute(self, stmt):
+            self.statements.append(stmt)
+            return Result()
+
+    db = DB()
+    tenant_id = uuid.uuid4()
+    assert await get_ack_summary(db, tenant_id, uuid.uuid4()) is None
+    compiled = db.statements[0].compile(dialect=postgresql.dialect())
+    assert "project_doc_versions.tenant_id = " in str(compiled)
+    assert tenant_id in compiled.params.values()
+
+
+@pytest.mark.asyncio
+async def test_ack_fan_out_is_one_idempotent_insert():
+    from app.core.documents.models import ProjectDocVersion
+    from app.core.documents.schemas import AckAudience
+    from app.core.documents.service import fan_out_ack_requests
+
+    class Result:
+        def all(self):
+            return []
+
+    class DB:
+        statements = []
+
+        async def execute(self, stmt):
+            self.statements.append(stmt)
+            return Result()
+
+    db = DB()
+    version = ProjectDocVersion(id=uuid.uuid4())
+    audience = AckAudience(ack_user_ids=[uuid.uuid4()], ack_role_ids=[uuid.uuid4()], ack_project_workers=True)
+    assert await fan_out_ack_requests(db, uuid.uuid4(), version, uuid.uuid4(), audience) == 0
+    assert len(db.statements) == 1
+    sql = str(db.statements[0].compile(dialect=postgresql.dialect()))
+    assert sql.startswith("INSERT INTO ack_requests")
+    assert "UNION" in sql and "ON CONFLICT (doc_version_id, user_id) DO NOTHING" in sql
@@ -0,0 +1,43 @@
+import uuid
+
+from app.core.documents.content_store import (
+    ContentCache, apply_delta, compress, content_hash, decompress, make_delta,
+)
+
+DOC = "".join(f"Punkt {i}: Bruk hjelm og vernesko på byggeplassen.\n" for i in range(200))
+
+
+def test_content_hash_is_stable_sha256():
+    assert content_hash("æøå") == content_hash("æøå")
+    assert content_hash("a") != content_hash("a ")
+    assert len(content_hash(DOC)) == 64
+
+
+def test_compress_round_trip():
+    assert decompress(compress(DOC)) == DOC
+
+
+def test_delta_round_trip():
+    edited = DOC.replace("Punkt 17:", "Punkt 17 (revidert):").replace("Punkt 150: ", "") + "Ny linje uten linjeskift"
+    assert apply_delta(DOC, make_delta(DOC, edited)) == edited
+    assert apply_delta(edited, make_delta(edited, DOC)) == DOC
+    assert apply_delta("", make_delta("", DOC)) == DOC
+    assert apply_delta(DOC, make_delta(DOC, "")) == ""
+
+
+def test_small_edit_delta_is_much_smaller_than_full_blob():
+    edited = DOC.replace("Punkt 42:", "Punkt 42 (endret):")
+    assert len(make_delta(DOC, edited)) * 4 < len(compress(edited))
+
+
+def test_content_cache_is_lru():
+    cache = ContentCache(maxsize=2)
+    tenant = uuid.uuid4()
+    cache.put(tenant, "a", "A")
+    cache.put(tenant, "b", "B")
+    assert cache.get(tenant, "a") == "A"  # a is now most recent
+    cache.put(tenant, "c", "C")
+    assert cache.get(tenant, "b") is None
+    assert cache.get(tenant, "a") == "A"
+    assert cache.get(uuid.uuid4(), "a") is None  # keyed per tenant
+    assert (cache.hits, cache.misses, len(cache)) == (2, 2, 2)
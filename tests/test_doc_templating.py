@@ -0,0 +1,38 @@
+from app.core.documents.templating import compile_template, compiled, role_key
+
+TEXT = (
+    "Prosjekt {{ project.no }} – {{project.name}}\n"
+    "Ansvarlig: {{ role.HMS-leder }}\n"
+    "Dokument {{ doc.no }}, {{ ukjent.felt }}\n"
+)
+
+
+def test_render_fills_placeholders_and_keeps_unknown_ones():
+    template = compile_template(TEXT)
+    assert template.keys == ("project.no", "project.name", "role.hms_leder", "doc.no", "ukjent.felt")
+    out = template.render({
+        "project.no": "P-26-0007", "project.name": "Nye Bjørvika",
+        "role.hms_leder": "Kari Nordmann", "doc.no": "",
+    })
+    assert out == (
+        "Prosjekt P-26-0007 – Nye Bjørvika\n"
+        "Ansvarlig: Kari Nordmann\n"
+        "Dokument {{ doc.no }}, {{ ukjent.felt }}\n"
+    )
+
+
+def test_static_template_renders_to_itself():
+    template = compile_template("Ingen plassholdere { her }")
+    assert template.is_static
+    assert template.render({"project.no": "x"}) == "Ingen plassholdere { her }"
+
+
+def test_role_key_slug():
+    assert role_key("HMS-leder") == "role.hms_leder"
+    assert role_key("Verneombud (bygg)") == "role.verneombud_bygg"
+    assert role_key("Anleggsleder Øst") == "role.anleggsleder_øst"
+
+
+def test_compiled_once_per_content_hash():
+    first = compiled("hash-a", TEXT)
+    assert compiled("hash-a", "not compiled again") is first
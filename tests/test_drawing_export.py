@@ -0,0 +1,73 @@
+import csv
+import hashlib
+import io
+import os
+import uuid
+import zipfile
+from datetime import datetime, timezone
+
+import pytest
+
+from app.core.drawings.export import SetMember, member_names, stream_set_zip
+from app.core.files import storage
+from app.settings import get_settings
+
+
+def _member(no: str, rev: str, path: str | None, filename: str = "plan.pdf", size: int | None = None) -> SetMember:
+    return SetMember(
+        drawing_no=no, revision=rev, title=f"Plan {no}", discipline="ARK",
+        registered_at=datetime(2026, 5, 4, 12, 0, tzinfo=timezone.utc),
+        filename=filename, storage_path=path, size_bytes=size,
+    )
+
+
+def test_member_names_are_safe_and_unique():
+    names = member_names([
+        _member("A-101", "B", None),
+        _member("A/101", "B", None, "x.PDF"),
+        _member("A:101", "B", None, "x.pdf"),
+        _member("A-102", "A", None, "noext"),
+    ])
+    assert names == ["ARK/A-101 rev B.pdf", "ARK/A_101 rev B.PDF", "ARK/A_101 rev B (2).pdf", "ARK/A-102 rev A"]
+
+
+def _store(root, tenant_id, data: bytes) -> str:
+    key = storage.content_key(tenant_id, hashlib.sha256(data).hexdigest())
+    (root / key).parent.mkdir(parents=True, exist_ok=True)
+    (root / key).write_bytes(data)
+    return key
+
+
+@pytest.mark.asyncio
+async def test_current_set_zip_is_streamed_in_chunks_with_manifest(tmp_path, monkeypatch):
+    monkeypatch.setattr(get_settings(), "FILE_STORAGE_ROOT", str(tmp_path))
+    tenant_id, other_tenant = uuid.uuid4(), uuid.uuid4()
+    big = os.urandom(3 * storage.CHUNK_SIZE + 17)
+    gone = storage.content_key(tenant_id, hashlib.sha256(b"never stored").hexdigest())
+    members = [
+        _member("A-101", "C", _store(tmp_path, tenant_id, big), size=len(big)),
+        _member("A-102", "A", _store(tmp_path, tenant_id, b"%PDF small")),  # size unknown: ZIP64 descriptor
+        _member("A-103", "A", gone),
+        _member("A-104", "A", _store(tmp_path, other_tenant, b"%PDF not yours")),  # another tenant's object
+        _member("A-105", "A", f"{tenant_id}/../" + _store(tmp_path, other_tenant, b"%PDF via ..")),
+    ]
+    pieces = [piece async for piece in stream_set_zip(tenant_id, members)]
+    assert max(len(p) for p in pieces) < storage.CHUNK_SIZE + 1024
+
+    archive = zipfile.ZipFile(io.BytesIO(b"".join(pieces)))
+    assert archive.testzip() is None
+    assert archive.namelist() == ["ARK/A-101 rev C.pdf", "ARK/A-102 rev A.pdf", "manifest.csv"]
+    assert archive.read("ARK/A-101 rev C.pdf") == big
+
+    manifest = list(csv.DictReader(io.StringIO(archive.read("manifest.csv").decode("utf-8-sig"))))
+    assert [(r["drawing_no"], r["status"]) for r in manifest] == [
+        ("A-101", "included"), ("A-102", "included"), ("A-103", "missing"), ("A-104", "missing"),
+        ("A-105", "missing"),
+    ]
+    assert manifest[0]["size_bytes"] == str(len(big))
+    assert manifest[0]["registered_at"] == "2026-05-04T14:00:00+02:00"
+
+
+def test_storage_paths_cannot_escape_the_root(tmp_path):
+    with pytest.raises(ValueError):
+        storage.LocalStorage(tmp_path).path("../etc/passwd")
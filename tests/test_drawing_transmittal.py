@@ -0,0 +1,87 @@
+import uuid
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+import app.main  # noqa: F401  (configures all mappers)
+from app.core.drawings.schemas import DrawingCreate, DrawingTransmittalCreate
+from app.core.drawings.service import register_transmittal
+
+
+class _Result:
+    def __init__(self, rows=()):
+        self.rows = list(rows)
+
+    def all(self):
+        return self.rows
+
+    def scalars(self):
+        return self
+
+
+class _DB:
+    """Records statements; answers the two lookups with canned rows."""
+
+    def __init__(self, revisions, files):
+        self.answers = [revisions, files]
+        self.statements = []
+        self.params = []
+
+    async def execute(self, stmt, params=None):
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        self.statements.append(sql)
+        self.params.append(params)
+        if sql.startswith("SELECT drawings.id, drawings.drawing_no") or sql.startswith("SELECT files.id"):
+            return _Result(self.answers.pop(0))
+        return _Result()
+
+
+def _drawing(no: str, rev: str, file_id: uuid.UUID, status: str = "active") -> DrawingCreate:
+    return DrawingCreate(drawing_no=no, title=f"Plan {no}", discipline="ARK", revision=rev, status=status, file_id=file_id)
+
+
+@pytest.mark.asyncio
+async def test_transmittal_registers_set_in_fixed_statements_and_reports_conflicts():
+    tenant_id, project_id, user_id = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    file_id, missing_file = uuid.uuid4(), uuid.uuid4()
+    a101_b, a102_a = uuid.uuid4(), uuid.uuid4()
+    db = _DB(
+        revisions=[
+            (a101_b, "A-101", "B", "active", False),
+            (a102_a, "A-102", "A", "active", False),
+            (uuid.uuid4(), "A-103", "A", "void", True),
+        ],
+        files=[file_id],
+    )
+    data = DrawingTransmittalCreate(transmittal_no="T-007", drawings=[
+        _drawing("A-101", "C", file_id),                # supersedes A-101 rev B
+        _drawing("A-102", "A", file_id),                # already registered
+        _drawing("A-103", "A", file_id),                # registered before (deleted): constraint still applies
+        _drawing("A-104", "A", file_id),                # new drawing
+        _drawing("A-104", "A", file_id),                # duplicate in set
+        _drawing("A-105", "A", file_id),
+        _drawing("A-105", "B", file_id),                # two active revisions in one set
+        _drawing("A-106", "A", missing_file),
+        _drawing("A-102", "B", file_id, "received"),    # not active: does not supersede
+    ])
+
+    out = await register_transmittal(db, tenant_id, project_id, data, user_id)
+
+    assert [(c["drawing_no"], c["revision"]) for c in out["conflicts"]] == [
+        ("A-102", "A"), ("A-103", "A"), ("A-104", "A"), ("A-105", "A"), ("A-105", "B"), ("A-106", "A"),
+    ]
+    assert out["superseded_drawing_ids"] == [a101_b]
+
+    kinds = [s.split(" ", 2)[:2] for s in db.statements]
+    assert kinds == [
+        ["SELECT", "pg_advisory_xact_lock(hashtext(%(hashtext_1)s))"],
+        ["SELECT", "drawings.id,"], ["SELECT", "files.id"],
+        ["UPDATE", "drawings"], ["INSERT", "INTO"], ["INSERT", "INTO"], ["SELECT", "drawings.id,"],
+    ]
+    rows = db.params[4]
+    assert [(r["drawing_no"], r["revision"], r["supersedes_drawing_id"]) for r in rows] == [
+        ("A-101", "C", a101_b), ("A-104", "A", None), ("A-102", "B", None),
+    ]
+    actions = [e["action"] for e in db.params[5]]
+    assert actions == ["drawing.superseded", "drawing.registered", "drawing.registered", "drawing.registered"]
+    assert all(e["detail"]["transmittal_no"] == "T-007" for e in db.params[5])
@@ -0,0 +1,46 @@
+import json
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from app.core.checklists.models import ChecklistRun
+from app.core.checklists.schemas import ChecklistRunRead
+from app.db.fieldsets import load_only_fields, parse_fields, sparse_model, sparse_rows
+
+
+def test_default_drops_heavy_fields():
+    selected = parse_fields(ChecklistRunRead, None, heavy={"answers_json"})
+    assert "answers_json" not in selected
+    assert selected[0] == "id" and "status" in selected
+
+
+def test_requested_fields_keep_schema_order_and_id():
+    assert parse_fields(ChecklistRunRead, "status, answers_json") == ["id", "status", "answers_json"]
+    with pytest.raises(HTTPException) as exc:
+        parse_fields(ChecklistRunRead, "status,password")
+    assert exc.value.status_code == 400
+
+
+def test_only_selected_columns_are_queried_and_serialised():
+    selected = ["id", "status"]
+    sql = str(select(ChecklistRun).options(load_only_fields(ChecklistRun, selected)).compile(
+        dialect=postgresql.dialect()
+    ))
+    assert "answers_json" not in sql and "checklist_runs.status" in sql
+
+    run = ChecklistRun(id=uuid.uuid4(), status="open", answers_json="{}" * 1000,
+                       created_at=datetime.now(timezone.utc))
+    assert sparse_rows([run], selected) == [{"id": run.id, "status": "open"}]
+
+
+def test_sparse_model_only_requires_id_and_keeps_rows_sparse():
+    model = sparse_model(ChecklistRunRead)
+    assert model is sparse_model(ChecklistRunRead)
+    assert model.model_json_schema()["required"] == ["id"]
+    run_id = uuid.uuid4()
+    item = model.model_validate({"id": run_id, "status": "open"})
+    assert json.loads(item.model_dump_json(exclude_unset=True)) == {"id": str(run_id), "status": "open"}
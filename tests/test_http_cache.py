@@ -0,0 +1,209 @@
+import json
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from pydantic import BaseModel
+from starlette.requests import Request
+
+from app.http_cache import (
+    etag_matches, immutable_bodies, immutable_model, serve_immutable, serve_version_list, strong_etag,
+)
+
+
+def _request(if_none_match: str | None = None) -> Request:
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+def test_etag_matching():
+    etag = strong_etag(b'{"id": 1}')
+    assert etag.startswith('"') and etag == strong_etag(b'{"id": 1}')
+    assert etag_matches(_request(etag), etag)
+    assert etag_matches(_request(f'"other", W/{etag}'), etag)
+    assert etag_matches(_request("*"), etag)
+    assert not etag_matches(_request('"other"'), etag)
+    assert not etag_matches(_request(), etag)
+
+
+class _VersionRead(BaseModel):
+    id: uuid.UUID
+    version_no: int
+    status: str
+    content: str | None = None
+    model_config = {"from_attributes": True}
+
+
+def _version(version_no: int, status: str, content: str = "text") -> SimpleNamespace:
+    return SimpleNamespace(id=uuid.uuid4(), version_no=version_no, status=status, content=content)
+
+
+@pytest.mark.asyncio
+async def test_immutable_version_is_loaded_once_then_served_from_memory():
+    immutable_bodies.clear()
+    tenant_id, row = uuid.uuid4(), _version(3, "published")
+    loads = []
+
+    async def load():
+        loads.append(1)
+        return row
+
+    first = await serve_immutable(_request(), tenant_id, "v", row.id, _VersionRead, load)
+    assert first.status_code == 200
+    assert json.loads(first.body) == {"id": str(row.id), "version_no": 3, "content": "text"}
+    assert "immutable" in first.headers["cache-control"]
+
+    again = await serve_immutable(_request(first.headers["etag"]), tenant_id, "v", row.id, _VersionRead, load)
+    assert again.status_code == 304 and again.headers["etag"] == first.headers["etag"]
+    assert len(loads) == 1
+    # another tenant never sees this tenant's entry
+    await serve_immutable(_request(), uuid.uuid4(), "v", row.id, _VersionRead, load)
+    assert len(loads) == 2
+    assert "status" not in immutable_model(_VersionRead).model_fields
+
+
+@pytest.mark.asyncio
+async def test_missing_versions_are_not_cached():
+    immutable_bodies.clear()
+
+    async def load():
+        return None
+
+    with pytest.raises(HTTPException) as exc:
+        await serve_immutable(_request(), uuid.uuid4(), "v", uuid.uuid4(), _VersionRead, load)
+    assert exc.value.status_code == 404
+    assert len(immutable_bodies) == 0
+
+
+@pytest.mark.asyncio
+async def test_version_list_reuses_cached_versions_with_current_status():
+    immutable_bodies.clear()
+    tenant_id = uuid.uuid4()
+    draft, published = _version(2, "draft", "wip"), _version(1, "published")
+    rows = {draft.id: draft, published.id: published}
+    loads = []
+
+    async def load(ids, fields):
+        loads.append((set(ids), fields))
+        return [rows[i] for i in ids]
+
+    def listing(statuses, if_none_match=None):
+        return serve_version_list(
+            _request(if_none_match), tenant_id, "v", _VersionRead,
+            [(draft.id, statuses[0]), (published.id, statuses[1])], {"published", "superseded"},
+            ["id", "version_no", "status"], load,
+        )
+
+    first = await listing(["draft", "published"])
+    assert json.loads(first.body) == [
+        {"id": str(draft.id), "version_no": 2, "status": "draft"},
+        {"id": str(published.id), "version_no": 1, "status": "published"},
+    ]
+    assert loads == [({published.id}, None), ({draft.id}, ["id", "version_no", "status"])]
+    assert first.headers["cache-control"] == "private, no-cache"
+
+    loads.clear()
+    same = await listing(["draft", "published"], first.headers["etag"])
+    assert same.status_code == 304 and loads == [({draft.id}, ["id", "version_no", "status"])]
+
+    # The status comes from the list query, not from the cached version
+    published.status = "superseded"
+    moved = await listing(["published", "superseded"], first.headers["etag"])
+    assert moved.status_code == 200
+    assert [item["status"] for item in json.loads(moved.body)] == ["published", "superseded"]
+    assert len(immutable_bodies) == 2
+
+
+@pytest.mark.asyncio
+async def test_conditional_get_answers_304_from_updated_at_only():
+    from datetime import datetime, timezone
+    from fastapi import Response
+    from sqlalchemy.dialects import postgresql
+    from app.core.incidents.models import Incident
+    from app.http_cache import not_modified_since, set_etag, weak_etag
+
+    incident_id = uuid.uuid4()
+    updated_at = datetime(2026, 3, 2, 7, 30, 0, 123456, tzinfo=timezone.utc)
+
+    class Result:
+        def scalar_one_or_none(self):
+            return updated_at
+
+    class DB:
+        statements = []
+
+        async def execute(self, stmt):
+            self.statements.append(str(stmt.compile(dialect=postgresql.dialect())))
+            return Result()
+
+    db = DB()
+    assert await not_modified_since(_request(), db, Incident, incident_id) is None
+    assert db.statements == []  # no If-None-Match: no extra query
+
+    etag = weak_etag(incident_id, updated_at)
+    assert etag.startswith('W/"') and etag != weak_etag(incident_id, updated_at.replace(microsecond=123457))
+    resp = await not_modified_since(_request(etag), db, Incident, incident_id)
+    assert resp.status_code == 304 and resp.headers["etag"] == etag
+    assert db.statements[0].startswith("SELECT incidents.updated_at \nFROM incidents")
+
+    assert await not_modified_since(_request('W/"stale"'), db, Incident, incident_id) is None
+
+    class Row:
+        id = incident_id
+
+    Row.updated_at = updated_at
+    response = Response()
+    set_etag(response, Row)
+    assert response.headers["etag"] == etag
+
+
+def test_versioned_rows_take_if_match_and_reject_stale_writes():
+    from sqlalchemy import String, create_engine
+    from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column
+    from sqlalchemy.orm.exc import StaleDataError
+    from sqlalchemy.pool import StaticPool
+    from app.core.checklists.models import ChecklistRun
+    from app.core.documents.models import ProjectDocVersion
+    from app.core.nonconformance.models import CapaAction, Nonconformance
+    from app.core.tasks.models import Task
+    from app.core.timesheets.models import TimeEntry, Timesheet
+    from app.db.base import VersionedMixin
+    from app.http_cache import check_if_match, row_etag, version_etag
+
+    for model in (Nonconformance, CapaAction, Task, ProjectDocVersion, ChecklistRun, Timesheet, TimeEntry):
+        assert model.__mapper__.version_id_col is model.__table__.c.version
+
+    class Base(DeclarativeBase):
+        pass
+
+    class Row(Base, VersionedMixin):
+        __tablename__ = "rows"
+        id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
+        title: Mapped[str] = mapped_column(String(50))
+
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    with Session(engine) as s:
+        row = Row(title="a")
+        s.add(row)
+        s.commit()
+        row_id = row.id
+        assert row.version == 1 and row_etag(row) == version_etag(row_id, 1) == f'"{row_id.hex}-v1"'
+
+    with Session(engine) as first, Session(engine) as second:
+        a, b = first.get(Row, row_id), second.get(Row, row_id)
+        check_if_match(version_etag(row_id, 1), a)
+        check_if_match(None, a)
+        check_if_match("*", a)
+        a.title = "b"
+        first.commit()
+        assert a.version == 2
+
+        with pytest.raises(HTTPException) as exc:
+            check_if_match(f'W/"{row_id.hex}-v2", "{row_id.hex}-v1"', a)  # weak or stale
+        assert exc.value.status_code == 412 and exc.value.headers["ETag"] == version_etag(row_id, 2)
+
+        b.title = "c"  # read at version 1: the conditional UPDATE matches nothing
+        with pytest.raises(StaleDataError):
+            second.commit()
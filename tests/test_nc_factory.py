@@ -0,0 +1,26 @@
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+
+from app.core.nonconformance.models import Nonconformance
+from app.core.nonconformance.service import _format_nc_no, create_ncs_from_sources
+
+
+def test_source_key_unique_index_covers_all_source_types():
+    ix = next(i for i in Nonconformance.__table__.indexes if i.name == "uq_nc_source_key")
+    assert ix.unique
+    assert list(ix.columns.keys()) == ["tenant_id", "source_type", "source_id", "source_key"]
+    assert "source_type" not in str(ix.dialect_options["postgresql"]["where"])
+
+
+def test_nc_no_block_format():
+    yy = str(datetime.now(timezone.utc).year)[-2:]
+    assert [_format_nc_no(n) for n in (1, 2, 10000)] == [
+        f"NC-{yy}-0001", f"NC-{yy}-0002", f"NC-{yy}-10000",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_factory_without_sources_does_not_touch_db():
+    assert await create_ncs_from_sources(None, uuid.uuid4(), uuid.uuid4(), []) == []
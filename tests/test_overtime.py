@@ -0,0 +1,131 @@
+import json
+from datetime import date, datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+import pytest
+from pydantic import ValidationError
+
+from app.core.timesheets.models import OvertimePolicy, Timesheet, TimeEntry
+from app.core.timesheets.overtime import (
+    DEFAULT_POLICY, _BANDS_SQL, _policy_params, compute_bands, policy_snapshot,
+)
+from app.core.timesheets.schemas import OvertimePolicyUpdate
+
+
+def test_default_policy_matches_update_defaults():
+    data = OvertimePolicyUpdate()
+    assert data.daily_limit_minutes == DEFAULT_POLICY["daily_limit_minutes"]
+    assert data.weekly_limit_minutes == DEFAULT_POLICY["weekly_limit_minutes"]
+    assert data.night_start == DEFAULT_POLICY["night_start"]
+    assert data.night_end == DEFAULT_POLICY["night_end"]
+    assert data.weekend_days == json.loads(DEFAULT_POLICY["weekend_days_json"])
+
+
+def test_policy_update_rejects_invalid_weekday():
+    with pytest.raises(ValidationError):
+        OvertimePolicyUpdate(weekend_days=[0, 7])
+
+
+def test_policy_params_and_snapshot():
+    policy = OvertimePolicy(**{**DEFAULT_POLICY, "night_start": time(22, 30)})
+    params = _policy_params(policy, ZoneInfo("Europe/Oslo"))
+    assert params["tz"] == "Europe/Oslo"
+    assert params["night_start"] == timedelta(hours=22, minutes=30)
+    assert params["night_end"] == timedelta(hours=6)
+    assert params["weekend_days"] == [6, 7]
+
+    snap = json.loads(policy_snapshot(policy))
+    assert snap["night_start"] == "22:30"
+    assert snap["daily_limit_minutes"] == 540
+
+
+def test_bands_sql_binds_every_param():
+    binds = set(_BANDS_SQL._bindparams)
+    policy = OvertimePolicy(**DEFAULT_POLICY)
+    expected = set(_policy_params(policy, ZoneInfo("UTC"))) | {"tenant_id", "sheet_ids"}
+    assert binds == expected
+
+
+# ── compute_bands against the database ───────────────────────────────────────
+
+OSLO = ZoneInfo("Europe/Oslo")
+WEEK = date(2026, 2, 2)  # Monday
+
+
+async def _sheet(db, tenant, week_start, *spans):
+    """One sheet with an entry per (start, end) pair of naive Oslo datetimes."""
+    sheet = Timesheet(
+        tenant_id=tenant.id, project_id=tenant.project.id, user_id=tenant.user.id,
+        week_start=week_start, week_end=week_start + timedelta(days=6),
+    )
+    db.add(sheet)
+    await db.flush()
+    for start, end in spans:
+        start, end = start.replace(tzinfo=OSLO), end.replace(tzinfo=OSLO)
+        db.add(TimeEntry(
+            tenant_id=tenant.id, timesheet_id=sheet.id, user_id=tenant.user.id,
+            project_id=tenant.project.id, work_date=start.date(),
+            start_time=start, end_time=end,
+            net_minutes=int((end - start).total_seconds() // 60),
+        ))
+    await db.flush()
+    return sheet
+
+
+async def _bands(db, tenant, sheet, **policy):
+    p = OvertimePolicy(tenant_id=tenant.id, **{**DEFAULT_POLICY, **policy})
+    return (await compute_bands(db, tenant.id, [sheet.id], p, OSLO))[sheet.id]
+
+
+def _day(offset, hour):
+    return datetime.combine(WEEK + timedelta(days=offset), time(hour))
+
+
+@pytest.mark.asyncio
+async def test_night_window_crosses_midnight(db, tenant):
+    # Wed 14:00 → Thu 02:00: 10 h on Wednesday (1 h over the daily limit, in
+    # the night window), 2 h on Thursday.
+    sheet = await _sheet(db, tenant, WEEK, (_day(2, 14), _day(3, 2)))
+    bands = await _bands(db, tenant, sheet)
+    assert bands.night_minutes == 300
+    assert bands.overtime_100_minutes == 60
+    assert bands.overtime_50_minutes == 0
+    assert bands.weekend_minutes == 0
+
+
+@pytest.mark.asyncio
+async def test_weekly_overtime_excludes_daily_overtime(db, tenant):
+    # Mon 10 h, Tue–Fri 9 h: 60 min daily overtime on Monday; the ordinary
+    # minutes reach 45 h, so Friday's last 5 h are weekly overtime.
+    spans = [(_day(0, 7), _day(0, 17))] + [(_day(d, 7), _day(d, 16)) for d in range(1, 5)]
+    sheet = await _sheet(db, tenant, WEEK, *spans)
+    bands = await _bands(db, tenant, sheet)
+    assert bands.overtime_50_minutes == 60 + 300
+    assert bands.overtime_100_minutes == 0
+
+
+@pytest.mark.asyncio
+async def test_weekend_overtime_band(db, tenant):
+    spans = [(_day(d, 8), _day(d, 16)) for d in range(5)] + [(_day(5, 8), _day(5, 12))]
+    sheet = await _sheet(db, tenant, WEEK, *spans)
+
+    bands = await _bands(db, tenant, sheet)
+    assert bands.weekend_minutes == 240
+    assert bands.overtime_100_minutes == 240
+    assert bands.overtime_50_minutes == 0
+
+    bands = await _bands(db, tenant, sheet, overtime_100_on_weekend=False)
+    assert bands.overtime_100_minutes == 0
+    assert bands.overtime_50_minutes == 240
+
+
+@pytest.mark.asyncio
+async def test_dst_night_counts_real_minutes(db, tenant):
+    # Sunday 29 March 2026, 01:00 → 04:00 local: clocks skip 02:00 → 03:00.
+    sheet = await _sheet(
+        db, tenant, date(2026, 3, 23),
+        (datetime(2026, 3, 29, 1), datetime(2026, 3, 29, 4)),
+    )
+    bands = await _bands(db, tenant, sheet)
+    assert bands.night_minutes == 120
+    assert bands.weekend_minutes == 120
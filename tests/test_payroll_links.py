@@ -0,0 +1,114 @@
+import json
+import uuid
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+
+from app.core.timesheets import service
+from app.core.timesheets.models import (
+    PayrollExport, PayrollExportLine, PayrollExportLineEntry, Timesheet, TimeEntry,
+)
+from app.core.timesheets.schemas import PayrollExportCreate, PayrollInclusionRead
+
+
+def test_link_table_is_keyed_by_line_and_entry_with_entry_index():
+    table = PayrollExportLineEntry.__table__
+    assert [c.name for c in table.primary_key.columns] == ["line_id", "entry_id"]
+    assert any(list(ix.columns.keys()) == ["entry_id"] for ix in table.indexes)
+
+
+def test_inclusion_read_from_orm_rows():
+    now = datetime(2026, 3, 1, tzinfo=timezone.utc)
+    export = PayrollExport(
+        id=uuid.uuid4(), tenant_id=uuid.uuid4(), period_start=date(2026, 2, 1),
+        period_end=date(2026, 2, 28), status="sent", mode="full", generated_by=uuid.uuid4(),
+        generated_at=now, created_at=now,
+    )
+    line = PayrollExportLine(
+        id=uuid.uuid4(), export_id=export.id, timesheet_id=uuid.uuid4(),
+        user_id=uuid.uuid4(), project_id=uuid.uuid4(), net_minutes=450,
+        ordinary_minutes=420, overtime_50_minutes=30, overtime_100_minutes=0,
+        night_minutes=0, weekend_minutes=0,
+    )
+    read = PayrollInclusionRead(export=export, line=line)
+    assert read.export.status == "sent"
+    assert read.line.overtime_50_minutes == 30
+
+
+async def _approved_sheet(db, tenant, week_start):
+    sheet = Timesheet(
+        tenant_id=tenant.id, project_id=tenant.project.id, user_id=tenant.user.id,
+        week_start=week_start, week_end=week_start + timedelta(days=6), status="approved",
+    )
+    db.add(sheet)
+    await db.flush()
+    start = datetime.combine(week_start, datetime.min.time(), timezone.utc) + timedelta(hours=7)
+    db.add(TimeEntry(
+        tenant_id=tenant.id, timesheet_id=sheet.id, user_id=tenant.user.id,
+        project_id=tenant.project.id, work_date=week_start,
+        start_time=start, end_time=start + timedelta(hours=7), net_minutes=420,
+    ))
+    await db.flush()
+    return sheet
+
+
+async def _adjustment(db, tenant, sheet, delta, created_at=None):
+    entry = TimeEntry(
+        tenant_id=tenant.id, timesheet_id=sheet.id, user_id=tenant.user.id,
+        project_id=tenant.project.id, work_date=sheet.week_start,
+        start_time=datetime.combine(sheet.week_start, datetime.min.time(), timezone.utc),
+        end_time=datetime.combine(sheet.week_start, datetime.min.time(), timezone.utc),
+        is_adjustment=True, delta_minutes=delta,
+    )
+    if created_at:
+        entry.created_at = created_at
+    db.add(entry)
+    await db.flush()
+    return entry
+
+
+async def _lines(db, export):
+    result = await db.execute(
+        select(PayrollExportLine).where(PayrollExportLine.export_id == export.id)
+    )
+    return {line.timesheet_id: line for line in result.scalars().all()}
+
+
+async def _delta(db, tenant):
+    data = PayrollExportCreate(period_start=date(2026, 2, 1), period_end=date(2026, 3, 1), mode="delta")
+    return await service.generate_export(db, tenant.id, data, tenant.user.id)
+
+
+@pytest.mark.asyncio
+async def test_delta_export_selects_new_sheets_and_unexported_adjustments(db, tenant):
+    first = await _approved_sheet(db, tenant, date(2026, 2, 2))
+    exported_adj = await _adjustment(db, tenant, first, 30)
+
+    d1 = await _delta(db, tenant)
+    assert set(await _lines(db, d1)) == {first.id}
+    with pytest.raises(HTTPException) as exc:
+        await _delta(db, tenant)
+    assert exc.value.status_code == 409
+    d1 = await service.mark_export_sent(db, d1.id, tenant.user.id, tenant.id)
+
+    second = await _approved_sheet(db, tenant, date(2026, 2, 9))
+    new_adj = await _adjustment(db, tenant, first, 15)
+    # Stamped before the mark but committed after the first delta's snapshot
+    late_adj = await _adjustment(db, tenant, first, 5, d1.high_water_mark - timedelta(minutes=5))
+
+    d2 = await _delta(db, tenant)
+    lines = await _lines(db, d2)
+    assert set(lines) == {first.id, second.id}
+    assert lines[second.id].net_minutes == 420
+    assert lines[first.id].net_minutes == 20
+
+    linked = await db.execute(
+        select(PayrollExportLineEntry.entry_id).where(
+            PayrollExportLineEntry.line_id == lines[first.id].id
+        )
+    )
+    linked = set(linked.scalars().all())
+    assert linked == {new_adj.id, late_adj.id}
+    assert exported_adj.id not in linked
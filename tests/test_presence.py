@@ -0,0 +1,63 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from sqlalchemy.orm import Session
+
+from app.core.timesheets.presence import (
+    Presence, PresenceRegistry, registry, stage_clock_in, stage_clock_out,
+)
+
+T0 = datetime(2026, 2, 2, 6, 0, tzinfo=timezone.utc)
+
+
+def _presence(minutes: int = 0) -> Presence:
+    return Presence(
+        user_id=uuid.uuid4(), entry_id=uuid.uuid4(),
+        since=T0 + timedelta(minutes=minutes), full_name=None, email=None,
+    )
+
+
+def test_roll_call_sorted_by_clock_in_and_scoped_per_project():
+    reg = PresenceRegistry()
+    tenant, project, other = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    late, early = _presence(30), _presence(5)
+    reg.clock_in(tenant, project, late)
+    reg.clock_in(tenant, project, early)
+    reg.clock_in(tenant, other, _presence())
+    assert reg.roll_call(tenant, project) == [early, late]
+    assert reg.roll_call(uuid.uuid4(), project) == []
+
+    reg.clock_out(tenant, project, early.user_id)
+    reg.clock_out(tenant, project, uuid.uuid4())  # unknown user is a no-op
+    assert reg.roll_call(tenant, project) == [late]
+
+
+def test_replace_project_empty_clears_it():
+    reg = PresenceRegistry()
+    tenant, project = uuid.uuid4(), uuid.uuid4()
+    reg.clock_in(tenant, project, _presence())
+    reg.replace_project(tenant, project, [])
+    assert reg.roll_call(tenant, project) == []
+
+
+def test_staged_ops_apply_on_commit_and_drop_on_rollback():
+    tenant, project = uuid.uuid4(), uuid.uuid4()
+    kept, dropped = _presence(), _presence()
+
+    session = Session()
+    db = SimpleNamespace(sync_session=session)
+    with session.begin():
+        stage_clock_in(db, tenant, project, kept)
+        assert registry.roll_call(tenant, project) == []
+    assert registry.roll_call(tenant, project) == [kept]
+
+    session.begin()
+    stage_clock_in(db, tenant, project, dropped)
+    session.rollback()
+    assert registry.roll_call(tenant, project) == [kept]
+
+    with session.begin():
+        stage_clock_out(db, tenant, project, kept.user_id)
+    assert registry.roll_call(tenant, project) == []
+    session.close()
@@ -0,0 +1,90 @@
+import uuid
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+import app.main  # noqa: F401  (configures all mappers)
+from app.core.search.service import SEARCH_KINDS, build_search, search
+from app.db.search import search_vector_sql
+
+
+def _sql(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+def test_search_vector_indexes_each_column_in_both_configs():
+    sql = search_vector_sql(("title", "A"), ("description", "B"))
+    assert sql.count("to_tsvector('norwegian'") == 2
+    assert sql.count("to_tsvector('simple'") == 2
+    assert "setweight(to_tsvector('simple', left(coalesce(description, ''), 100000)), 'B')" in sql
+
+
+def test_search_is_one_ranked_union_scoped_to_tenant_and_project():
+    tenant_id, project_id = uuid.uuid4(), uuid.uuid4()
+    sql = _sql(build_search("stillas avvik", tenant_id, project_id, list(SEARCH_KINDS), limit=20, offset=40))
+    for table in ("project_docs", "doc_content_blobs", "incidents", "nonconformances",
+                  "message_threads", "incoming_messages", "drawings", "tasks"):
+        assert f"{table}.search_vector @@" in sql
+        assert f"{table}.tenant_id = '{tenant_id}'" in sql
+    assert sql.count("UNION ALL") == len(SEARCH_KINDS)  # 7 sources + doc fields/content
+    assert sql.count(f"project_id = '{project_id}'") == len(SEARCH_KINDS)
+    assert sql.count("LIMIT 61") == len(SEARCH_KINDS)  # each source cut to offset + limit + 1
+    assert sql.rstrip().endswith("LIMIT 21 OFFSET 40")
+
+
+def test_search_kinds_filter():
+    sql = _sql(build_search("A-101", uuid.uuid4(), None, ["drawing"], limit=10, offset=0))
+    assert "drawings.search_vector" in sql
+    assert "incidents" not in sql and "UNION ALL" not in sql
+
+
+@pytest.mark.asyncio
+async def test_search_pages_with_next_offset():
+    class Result:
+        def __init__(self, rows):
+            self.rows = rows
+
+        def mappings(self):
+            return self
+
+        def all(self):
+            return self.rows
+
+    class DB:
+        def __init__(self, n):
+            self.n = n
+
+        async def execute(self, stmt):
+            return Result([{"id": i} for i in range(self.n)])
+
+    page = await search(DB(3), uuid.uuid4(), "hjelm", limit=2)
+    assert page["items"] == [{"id": 0}, {"id": 1}] and page["next_offset"] == 2
+    page = await search(DB(2), uuid.uuid4(), "hjelm", limit=2, offset=4)
+    assert page["next_offset"] is None
+
+
+def test_drawing_substring_filters_use_trigram_indexes_and_escape_wildcards():
+    from sqlalchemy.schema import CreateIndex
+    from app.core.drawings.models import Drawing
+    from app.db.search import contains
+
+    ddl = {ix.name: str(CreateIndex(ix).compile(dialect=postgresql.dialect())) for ix in Drawing.__table__.indexes}
+    assert "USING gin (drawing_no gin_trgm_ops)" in ddl["ix_drawings_drawing_no_trgm"]
+    assert "USING gin (discipline gin_trgm_ops)" in ddl["ix_drawings_discipline_trgm"]
+
+    sql = str(contains(Drawing.drawing_no, "A_10%").compile(dialect=postgresql.dialect()))
+    assert "drawings.drawing_no ILIKE" in sql and "ESCAPE" in sql
+    assert contains(Drawing.drawing_no, "A_10%").right.value == "%A\\_10\\%%"
+
+
+def test_revision_history_walks_the_chain_both_ways_in_one_query():
+    from app.core.drawings.service import revision_history_query
+
+    drawing_id = uuid.uuid4()
+    sql = _sql(revision_history_query(drawing_id))
+    assert sql.startswith("WITH RECURSIVE older(id, supersedes_drawing_id)")
+    assert "JOIN older ON drawings.id = older.supersedes_drawing_id" in sql
+    assert "JOIN newer ON drawings.supersedes_drawing_id = newer.id" in sql
+    assert sql.count(f"drawings.id = '{drawing_id}'") == 2
+    assert "UNION ALL" not in sql  # UNION: a cyclic chain cannot loop forever
+    assert sql.endswith("ORDER BY drawings.registered_at DESC")
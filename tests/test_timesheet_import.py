@@ -0,0 +1,71 @@
+import uuid
+import pytest
+from datetime import date, datetime, timezone
+from zoneinfo import ZoneInfo
+
+from app.core.timesheets.importer import (
+    parse_import_row, _iter_lines, _iter_staging_records,
+    REJECT_INVALID_INTERVAL, REJECT_MISSING_FIELD, REJECT_PARSE_ERROR,
+)
+
+OSLO = ZoneInfo("Europe/Oslo")
+
+
+def test_parse_row_local_time_is_converted_to_utc():
+    uid = uuid.uuid4()
+    row = {"user_id": str(uid), "start_time": "2026-02-02T07:00", "end_time": "2026-02-02T15:30",
+           "break_minutes": "30"}
+    rec = parse_import_row(row, 1, "raw", OSLO)
+    assert rec[2] == uid
+    assert rec[4] == date(2026, 2, 2)
+    assert rec[5] == datetime(2026, 2, 2, 6, 0, tzinfo=timezone.utc)
+    assert rec[7] == 30
+    assert rec[9] is None
+
+
+def test_parse_row_rejects_reversed_interval():
+    row = {"user_email": "A@B.no", "start_time": "2026-02-02T15:00", "end_time": "2026-02-02T07:00"}
+    assert parse_import_row(row, 2, "raw", OSLO)[9] == REJECT_INVALID_INTERVAL
+
+
+def test_parse_row_rejects_missing_and_garbage():
+    assert parse_import_row({"start_time": "x"}, 3, "raw", OSLO)[9] == REJECT_MISSING_FIELD
+    bad = {"user_id": "not-a-uuid", "start_time": "2026-02-02T07:00", "end_time": "2026-02-02T08:00"}
+    assert parse_import_row(bad, 4, "raw", OSLO)[9] == REJECT_PARSE_ERROR
+
+
+async def _chunks(*parts: bytes):
+    for p in parts:
+        yield p
+
+
+@pytest.mark.asyncio
+async def test_iter_lines_across_chunk_boundaries():
+    lines = [l async for l in _iter_lines(_chunks(b"\xef\xbb\xbfa,b\r\nc", b",d\n", b"e,f"))]
+    assert lines == ["a,b", "c,d", "e,f"]
+
+
+@pytest.mark.asyncio
+async def test_csv_records_keep_row_numbers_and_raw_line():
+    body = (b"user_email,start_time,end_time\n"
+            b"a@b.no,2026-02-02T07:00,2026-02-02T15:00\n"
+            b"a@b.no,oops,2026-02-02T15:00\n")
+    recs = [r async for r in _iter_staging_records(_chunks(body), "csv", OSLO)]
+    assert [r[0] for r in recs] == [1, 2]
+    assert recs[0][3] == "a@b.no" and recs[0][9] is None
+    assert recs[1][9] == REJECT_PARSE_ERROR
+    assert recs[1][1] == "a@b.no,oops,2026-02-02T15:00"
+
+
+@pytest.mark.asyncio
+async def test_csv_quoted_field_may_span_lines():
+    body = (b'user_email,start_time,end_time,description\r\n'
+            b'a@b.no,2026-02-02T07:00,2026-02-02T15:00,"Forskaling\r\nakse ""B"", 3"\r\n'
+            b'a@b.no,2026-02-03T07:00,2026-02-03T15:00,ok\r\n'
+            b'a@b.no,2026-02-04T07:00,2026-02-04T15:00,"never closed\n')
+    recs = [r async for r in _iter_staging_records(_chunks(body), "csv", OSLO)]
+    assert [r[0] for r in recs] == [1, 2, 3]
+    assert recs[0][8] == 'Forskaling\nakse "B", 3' and recs[0][9] is None
+    assert recs[0][1] == 'a@b.no,2026-02-02T07:00,2026-02-02T15:00,"Forskaling\nakse ""B"", 3"'
+    assert recs[1][8] == "ok"
+    assert recs[2][9] == REJECT_PARSE_ERROR